@@ -24,10 +24,13 @@ from __future__ import annotations
 import argparse
 import datetime
 import hashlib
+import json
 import os
 from pathlib import Path
 import re
 import subprocess
+import time
+from typing import Final
 from typing import TYPE_CHECKING
 
 import cffsubr
@@ -48,11 +51,15 @@ import uharfbuzz
 import charsets
 import copy_metrics
 import duployan
+import snapshots
 import utils
 
 
 if TYPE_CHECKING:
     from collections.abc import Collection
+    from collections.abc import MutableMapping
+    from collections.abc import Sequence
+    from collections.abc import Set as AbstractSet
 
 
 TIMESTAMP_FORMAT = '%Y%m%dT%H%M%SZ'
@@ -61,6 +68,11 @@ TIMESTAMP_FORMAT = '%Y%m%dT%H%M%SZ'
 VERSION_PREFIX = 'Version '
 
 
+#: The number of times to load a font when timing how long loading its
+#: glyph names takes. The minimum time is reported.
+LOAD_TIMING_REPETITIONS = 5
+
+
 def _prepare_environment_variables(dirty: bool) -> None:
     """Sets or unsets environment variables needed to build the font.
 
@@ -106,11 +118,23 @@ def _save_font(
     font.generate(output_path, flags=('no-hints', 'omit-instructions', 'opentype'))
 
 
-def _set_style_attributes(
+#: The weight class of a regular font and of the regular master of a
+#: variable font.
+REGULAR_WEIGHT: Final = 400
+
+
+#: The weight class of a bold font and of the bold master of a variable
+#: font.
+BOLD_WEIGHT: Final = 700
+
+
+def set_style_attributes(
         tt_font: fontTools.ttLib.ttFont.TTFont,
         noto: bool,
         unjoined: str | None,
         bold: bool,
+        *,
+        variable: bool = False,
     ) -> None:
     """Sets style attributes in the OS/2, STAT, and 'head' tables.
 
@@ -120,13 +144,16 @@ def _set_style_attributes(
             (Noto does not include the unjoined variant.)
         unjoined: The name of the CURS axis value if cursive joining is
             disabled in this font, or else ``None``.
-        bold: Whether the font is bold.
+        bold: Whether the font is bold. For a variable font, this refers
+            to the default instance.
+        variable: Whether the font is a variable font whose weight axis
+            spans regular and bold.
     """
     os2_table = tt_font['OS/2']
     assert isinstance(os2_table, fontTools.ttLib.tables.O_S_2f_2.table_O_S_2f_2)
     head_table = tt_font['head']
     assert isinstance(head_table, fontTools.ttLib.tables._h_e_a_d.table__h_e_a_d)
-    os2_table.usWeightClass = 700 if bold else 400
+    os2_table.usWeightClass = BOLD_WEIGHT if bold else REGULAR_WEIGHT
     os2_table.usWidthClass = 5
     os2_table.fsSelection &= ~(1 << 0 | 1 << (6 if bold else 5) | 1 << 9)
     os2_table.fsSelection |= 1 << (5 if bold else 6)
@@ -134,15 +161,23 @@ def _set_style_attributes(
         head_table.macStyle |= 1 << 0
     else:
         head_table.macStyle &= ~(1 << 0)
+    weight_values: list[dict[str, int | str]]
+    if variable:
+        weight_values = [
+            {'value': REGULAR_WEIGHT, 'name': 'Regular', 'flags': 0x2, 'linkedValue': BOLD_WEIGHT},
+            {'value': BOLD_WEIGHT, 'name': 'Bold', 'flags': 0x0},
+        ]
+    else:
+        weight_values = [{'value': os2_table.usWeightClass, 'name': 2, 'flags': 0x0 if bold else 0x2}]
+        if not bold:
+            weight_values[0]['linkedValue'] = BOLD_WEIGHT
     axes = [
         {
             'tag': 'wght',
             'name': 'Weight',
-            'values': [{'value': os2_table.usWeightClass, 'name': 2, 'flags': 0x0 if bold else 0x2}],
+            'values': weight_values,
         },
     ]
-    if not bold:
-        axes[0]['values'][0]['linkedValue'] = 700  # type: ignore[index]
     if not noto:
         axes.insert(0, {
             'tag': 'CURS',
@@ -336,6 +371,8 @@ def tweak_font(
     release: bool,
     dirty: bool,
     fea: str,
+    fast: bool,
+    compact_language_systems: bool,
 ) -> None:
     """Loads a font and modifies it with fontTools.
 
@@ -352,6 +389,11 @@ def tweak_font(
         release: Whether this is a release build.
         dirty: Whether the font is being built with uncommitted changes.
         fea: The path of a feature file to add to the font.
+        fast: Whether to skip the steps that only matter for a
+            distributable font and do not affect shaping, like
+            subroutinization.
+        compact_language_systems: Whether to remove redundant language
+            systems from GPOS and GSUB.
     """
     with fontTools.ttLib.ttFont.TTFont(font_path, recalcBBoxes=False) as tt_font:
         # Remove the FontForge timestamp table.
@@ -371,7 +413,7 @@ def tweak_font(
                         delattr(cff_table.cff[0], name)
 
         # Complete the OpenType Layout tables.
-        builder.complete_layout(tt_font)
+        builder.complete_layout(tt_font, compact=compact_language_systems)
 
         fontTools.feaLib.builder.addOpenTypeFeatures(
             tt_font,
@@ -415,7 +457,8 @@ def tweak_font(
         hhea_table.lineGap = os2_table.sTypoLineGap
         _set_family_names(name_table, os2_table, typographic_family_name, noto, unjoined, bold)
         _set_version(tt_font, noto, version, release, dirty)
-        _set_unique_id(name_table, os2_table.achVendID)
+        if not fast:
+            _set_unique_id(name_table, os2_table.achVendID)
         if 'CFF ' in tt_font:
             _set_cff_data(name_table.names, post_table.underlineThickness, cff_table.cff)
         copy_metrics.update_metrics(
@@ -424,19 +467,82 @@ def tweak_font(
             max(os2_table.usWinDescent, -head_table.yMin),
         )
 
-        _set_style_attributes(tt_font, noto, unjoined, bold)
+        set_style_attributes(tt_font, noto, unjoined, bold)
 
         _add_meta(tt_font)
 
         if 'CFF ' in tt_font:
-            uharfbuzz.serialize_with_tag = uharfbuzz.repack_with_tag  # Work around https://github.com/fonttools/fonttools/pull/3973
-            cffsubr.subroutinize(tt_font)
-            cff_table.cff[0].decompileAllCharStrings()
+            if not fast:
+                uharfbuzz.serialize_with_tag = uharfbuzz.repack_with_tag  # Work around https://github.com/fonttools/fonttools/pull/3973
+                cffsubr.subroutinize(tt_font)
+                cff_table.cff[0].decompileAllCharStrings()
             cff_table.cff[0].Encoding = 0
 
         tt_font.save(font_path)
 
 
+def _time_loading_glyph_names(font_path: str) -> int:
+    """Returns how long it takes fontTools to load a font’s glyph names.
+
+    Args:
+        font_path: The path of the font.
+
+    Returns:
+        The minimum time in microseconds of `LOAD_TIMING_REPETITIONS`
+        attempts to open the font and get its glyph order.
+    """
+    seconds = []
+    for _ in range(LOAD_TIMING_REPETITIONS):
+        start = time.perf_counter()
+        with fontTools.ttLib.ttFont.TTFont(font_path) as tt_font:
+            tt_font.getGlyphOrder()
+        seconds.append(time.perf_counter() - start)
+    return round(min(seconds) * 1e6)
+
+
+def _strip_glyph_names(font_path: str, report: MutableMapping[str, int]) -> None:
+    """Replaces a font’s glyph names with placeholders.
+
+    The original glyph names are written, one per line in glyph ID
+    order, to the path of the font plus `utils.GLYPH_NAMES_SUFFIX`. The
+    'post' table is changed to format 3, which has no glyph names. CFF
+    requires glyph names, so its glyph names are replaced with ``g``
+    followed by the glyph ID, except for the first glyph’s.
+
+    The font’s size and how long it takes to load its glyph names, both
+    before and after, are added to the build report.
+
+    Args:
+        font_path: The file to load the font from and save it back to.
+        report: The build report.
+    """
+    report['font_bytes_with_glyph_names'] = Path(font_path).stat().st_size
+    report['glyph_name_load_microseconds_with_glyph_names'] = _time_loading_glyph_names(font_path)
+    with fontTools.ttLib.ttFont.TTFont(font_path, recalcBBoxes=False) as tt_font:
+        glyph_order = tt_font.getGlyphOrder()
+        Path(f'{font_path}{utils.GLYPH_NAMES_SUFFIX}').write_text(''.join(f'{glyph_name}\n' for glyph_name in glyph_order), encoding='utf-8')
+        new_glyph_order = [glyph_order[0], *(f'g{glyph_id}' for glyph_id in range(1, len(glyph_order)))]
+        new_glyph_names = dict(zip(glyph_order, new_glyph_order, strict=True))
+        if 'CFF ' in tt_font:
+            cff_table = tt_font['CFF ']
+            assert isinstance(cff_table, fontTools.ttLib.tables.C_F_F_.table_C_F_F_)
+            top_dict = cff_table.cff[0]
+            assert top_dict.charset is not None
+            assert top_dict.CharStrings is not None
+            top_dict.charset = [new_glyph_names[glyph_name] for glyph_name in top_dict.charset]
+            top_dict.CharStrings.charStrings = {
+                new_glyph_names[glyph_name]: char_string
+                for glyph_name, char_string in top_dict.CharStrings.charStrings.items()
+            }
+        post_table = tt_font['post']
+        assert isinstance(post_table, fontTools.ttLib.tables._p_o_s_t.table__p_o_s_t)
+        post_table.formatType = 3
+        tt_font.setGlyphOrder(new_glyph_order)
+        tt_font.save(font_path)
+    report['font_bytes'] = Path(font_path).stat().st_size
+    report['glyph_name_load_microseconds'] = _time_loading_glyph_names(font_path)
+
+
 def _is_dirty() -> bool:
     """Returns whether the font is being built with uncommitted changes.
 
@@ -450,6 +556,30 @@ def _is_dirty() -> bool:
         return False
 
 
+def _get_partial_code_points(code_points: Sequence[str], test_paths: Sequence[str]) -> AbstractSet[int] | None:
+    """Returns the code points to include in a partial build.
+
+    Args:
+        code_points: Hexadecimal code points.
+        test_paths: The paths of test files. Every code point in the
+            input of any test is included.
+
+    Returns:
+        The union of `code_points` and the code points in the tests, or
+        ``None`` if both are empty, meaning the build should not be
+        partial.
+    """
+    if not code_points and not test_paths:
+        return None
+    result = {int(cp, 16) for cp in code_points}
+    for test_path in test_paths:
+        with Path(test_path).open(encoding='utf-8') as f:
+            for line in f:
+                if (line := line.rstrip()) and line[0] != '#':
+                    result.update(int(cp, 16) for cp in line.split(':', 1)[0].split())
+    return result
+
+
 def _make_font(options: argparse.Namespace) -> None:
     """Makes a Duployan font.
 
@@ -461,18 +591,70 @@ def _make_font(options: argparse.Namespace) -> None:
     assert isinstance(options.bold, bool)  # type: ignore[misc]
     assert isinstance(options.charset, charsets.Charset)  # type: ignore[misc]
     assert options.unjoined is None or isinstance(options.unjoined, str)  # type: ignore[misc]
-    builder = duployan.Builder(font, options.bold, options.charset, options.unjoined is not None)
-    builder.build()
+    code_points: Sequence[str] = options.code_points or []  # type: ignore[misc]
+    tests: Sequence[str] = options.tests or []  # type: ignore[misc]
+    assert isinstance(options.skip_phases, bool)  # type: ignore[misc]
+    assert isinstance(options.regular_layout, bool)  # type: ignore[misc]
+    builder = duployan.Builder(
+        font,
+        options.bold,
+        options.charset,
+        options.unjoined is not None,
+        _get_partial_code_points(code_points, tests),
+        skip_phases=options.skip_phases,
+        regular_layout=options.regular_layout,
+    )
+    assert isinstance(options.fast, bool)  # type: ignore[misc]
+    assert options.snapshot is None or isinstance(options.snapshot, str)  # type: ignore[misc]
+    assert options.snapshot_after is None or isinstance(options.snapshot_after, str)  # type: ignore[misc]
+    assert options.resume_from is None or isinstance(options.resume_from, str)  # type: ignore[misc]
+    snapshot = None
+    if options.snapshot is not None:
+        checkpoint = options.snapshot_after or snapshots.PHASE_GROUPS[-1]
+        builder.validate_checkpoint(checkpoint)
+        snapshot = checkpoint, Path(options.snapshot)
+    assert isinstance(options.merge_lookups, bool)  # type: ignore[misc]
+    assert isinstance(options.noto, bool)  # type: ignore[misc]
+    builder.build(
+        options.fast,
+        snapshot,
+        None if options.resume_from is None else Path(options.resume_from),
+        merge=options.merge_lookups,
+        options={'noto': options.noto, 'unjoined_name': options.unjoined},
+    )
     dirty = _is_dirty()
     _prepare_environment_variables(dirty)
     assert isinstance(options.output, str)  # type: ignore[misc]
     _save_font(builder.font, options.output)
     assert isinstance(options.name, str)  # type: ignore[misc]
-    assert isinstance(options.noto, bool)  # type: ignore[misc]
     assert isinstance(options.version, float)  # type: ignore[misc]
     assert isinstance(options.release, bool)  # type: ignore[misc]
     assert isinstance(options.fea, str)  # type: ignore[misc]
-    tweak_font(options.output, builder, options.name, options.noto, options.unjoined, options.bold, options.version, options.release, dirty, options.fea)
+    assert isinstance(options.compact_language_systems, bool)  # type: ignore[misc]
+    tweak_font(
+        options.output,
+        builder,
+        options.name,
+        options.noto,
+        options.unjoined,
+        options.bold,
+        options.version,
+        options.release,
+        dirty,
+        options.fea,
+        options.fast,
+        options.compact_language_systems,
+    )
+    assert isinstance(options.strip_glyph_names, bool)  # type: ignore[misc]
+    if options.strip_glyph_names:
+        _strip_glyph_names(options.output, builder.report)
+    else:
+        Path(f'{options.output}{utils.GLYPH_NAMES_SUFFIX}').unlink(missing_ok=True)
+    assert options.report is None or isinstance(options.report, str)  # type: ignore[misc]
+    if options.report is not None:
+        with Path(options.report).open('w', encoding='utf-8') as f:
+            json.dump(builder.report, f, indent=2, sort_keys=True)
+            f.write('\n')
 
 
 if __name__ == '__main__':
@@ -482,11 +664,56 @@ if __name__ == '__main__':
         '--charset', default=charsets.Charset.STANDARD, type=charsets.Charset,
         help=f'The character set, one of {{{", ".join(c.value for c in charsets.Charset)}}} (default: %(default)s).',
     )
+    parser.add_argument(
+        '--code-points', action='extend', metavar='CP', nargs='+',
+        help='Make a partial font with only these hexadecimal code points, plus any from --tests. The font is only suitable for testing.',
+    )
+    parser.add_argument(
+        '--compact-language-systems', action=argparse.BooleanOptionalAction, default=True,
+        help="Remove the language systems that are equivalent to their scripts' default language systems (default: %(default)s).",
+    )
+    parser.add_argument(
+        '--fast', action='store_true',
+        help='Skip the steps that do not affect shaping, like outline cleanup and subroutinization. The font is only suitable for testing.',
+    )
     parser.add_argument('--fea', metavar='FILE', required=True, help='feature file to add')
+    parser.add_argument(
+        '--merge-lookups', action=argparse.BooleanOptionalAction, default=True,
+        help='Merge adjacent lookups that cannot interact, so that shaping is faster (default: %(default)s).',
+    )
     parser.add_argument('--name', required=True, help='The name of the font family (name ID 16).')
     parser.add_argument('--noto', action='store_true', help="Use Noto conventions in the 'name' table.")
     parser.add_argument('--output', metavar='FILE', required=True, help='output font')
+    parser.add_argument(
+        '--regular-layout', action='store_true',
+        help='With --bold, lay out the font as if it were regular, so that it can be the bold master of a variable font.',
+    )
     parser.add_argument('--release', action='store_true', help='Set the version number as appropriate for a stable release, as opposed to an alpha.')
+    parser.add_argument('--report', metavar='FILE', help='Write statistics about the build, like how many lookups were merged, to this JSON file.')
+    parser.add_argument(
+        '--resume-from', metavar='FILE',
+        help='Resume the build from a snapshot saved by --snapshot with the same options and source files.',
+    )
+    parser.add_argument(
+        '--skip-phases', action=argparse.BooleanOptionalAction, default=True,
+        help='When making an unjoined font, skip the phases whose lookups it would not include (default: %(default)s).',
+    )
+    parser.add_argument('--snapshot', metavar='FILE', help='Save a snapshot of the build to this file when the build reaches the --snapshot-after checkpoint.')
+    parser.add_argument(
+        '--snapshot-after', metavar='CHECKPOINT',
+        help=(
+            f'The checkpoint for --snapshot: a phase group, one of {{{", ".join(snapshots.PHASE_GROUPS)}}}, or the name of a phase'
+            f' (default: {snapshots.PHASE_GROUPS[-1]}).'
+        ),
+    )
+    parser.add_argument(
+        '--strip-glyph-names', action='store_true',
+        help=f'Replace the glyph names with placeholders and write the original glyph names to the output path plus {utils.GLYPH_NAMES_SUFFIX}.',
+    )
+    parser.add_argument(
+        '--tests', action='extend', metavar='FILE', nargs='+',
+        help='Make a partial font with only the code points used in these test files, plus any from --code-points.',
+    )
     parser.add_argument('--unjoined', default=None, help='If set, the name of the axis value for disabled cursive joining. If not set, cursive joining is enabled.')
     parser.add_argument('--version', type=float, required=True, help='The base version number.')
     args = parser.parse_args()
@@ -190,7 +190,47 @@ def _include_in_standard_charset(schema: Schema) -> bool:
     )
 
 
-def initialize_schemas(charset: Charset, light_line: float, stroke_gap: float) -> Collection[Schema]:
+#: The types of paths whose schemas must be included in a partial build.
+#: These are the shorthand format controls, which phases look up by path
+#: type and which interact with every other Duployan character.
+_PARTIAL_INCLUSION_PATH_TYPES: Final = (InvalidDTLS, InvalidOverlap, InvalidStep)
+
+
+#: The code points which must be included in a partial build but which
+#: are not covered by `_PARTIAL_INCLUSION_PATH_TYPES` or
+#: ``override_ignored``. Phases look up U+25CC and U+1BC9E by code point,
+#: and HarfBuzz inserts U+25CC and uses U+0020 when shaping any text.
+_PARTIAL_INCLUSIONS: Final[AbstractSet[int]] = {0x0020, 0x25CC, 0x1BC9E}
+
+
+def _include_in_partial_build(schema: Schema, code_points: AbstractSet[int]) -> bool:
+    """Returns whether a schema should be included in a partial build.
+
+    Besides the requested code points, a partial build includes every
+    unmapped schema and every mapped schema that phases depend on even
+    for text without its character: the schemas whose characters are
+    not ignored despite being default ignorable, the schemas whose paths
+    are instances of `_PARTIAL_INCLUSION_PATH_TYPES`, and the schemas in
+    `_PARTIAL_INCLUSIONS`.
+
+    Args:
+        schema: A schema.
+        code_points: The code points requested for the partial build.
+    """
+    return (schema.cmap is None
+        or schema.cmap in code_points
+        or schema.override_ignored
+        or isinstance(schema.path, _PARTIAL_INCLUSION_PATH_TYPES)
+        or schema.cmap in _PARTIAL_INCLUSIONS
+    )
+
+
+def initialize_schemas(
+    charset: Charset,
+    light_line: float,
+    stroke_gap: float,
+    code_points: AbstractSet[int] | None = None,
+) -> Collection[Schema]:
     """Returns a collection of schemas to include in a font.
 
     Args:
@@ -198,6 +238,10 @@ def initialize_schemas(charset: Charset, light_line: float, stroke_gap: float) -
             returned out of all possible schemas.
         light_line: The width of a light line.
         stroke_gap: The minimum distance between two different strokes.
+        code_points: The code points to include for a partial build, or
+            ``None`` to include the whole character set. A partial build
+            is only useful for testing. It also includes a few code
+            points that phases depend on.
     """
     notdef = Notdef()
     space = Space(0, margins=True)
@@ -785,4 +829,6 @@ def initialize_schemas(charset: Charset, light_line: float, stroke_gap: float) -
             pass
         case _:
             assert_never(charset)
+    if code_points is not None:
+        schemas = [s for s in schemas if _include_in_partial_build(s, code_points)]
     return schemas
@@ -0,0 +1,254 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Class-based chaining contextual substitution subtables.
+
+feaLib only emits a chaining contextual lookup as a class-based (format
+2) subtable if, at each of the backtrack, input, and lookahead
+positions, the glyph classes its rules use are pairwise equal or
+disjoint. Otherwise, it emits one coverage-based (format 3) subtable per
+rule. This module refines the glyph classes of such a lookup into a
+partition, splits each rule into one rule per combination of the
+partition’s classes, and replaces the lookup’s subtables with a single
+class-based subtable if that is smaller.
+"""
+
+from __future__ import annotations
+
+import collections
+import copy
+import itertools
+import math
+from typing import Final
+from typing import TYPE_CHECKING
+
+import fontTools.ttLib.tables.G_S_U_B_
+import fontTools.ttLib.tables.otBase
+import fontTools.ttLib.tables.otTables
+import fontTools.ttLib.ttFont
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+
+#: The lookup type of chaining contextual substitution lookups.
+CHAINING_CONTEXTUAL_SUBSTITUTION: Final = 6
+
+
+#: The maximum number of rules to put in a class-based subtable. A
+#: subtable with more rules than this would be too slow to build and
+#: almost certainly bigger than the coverage-based subtables.
+MAX_RULES: Final = 0xFFFF
+
+
+def _partition(
+    tt_font: fontTools.ttLib.ttFont.TTFont,
+    glyph_sets: Iterable[Sequence[str]],
+) -> Mapping[str, int]:
+    """Partitions the union of some glyph sets into classes.
+
+    Two glyphs are in the same class if and only if each glyph set
+    contains either both or neither of them.
+
+    Args:
+        tt_font: The font containing the glyphs.
+        glyph_sets: The glyph sets.
+
+    Returns:
+        A map from each glyph in any of the glyph sets to its class. The
+        classes are numbered from 1 in order of their first glyphs’ IDs.
+    """
+    memberships: collections.defaultdict[str, list[int]] = collections.defaultdict(list)
+    for i, glyphs in enumerate({frozenset(glyphs): None for glyphs in glyph_sets}):
+        for glyph in glyphs:
+            memberships[glyph].append(i)
+    classes: dict[tuple[int, ...], int] = {}
+    return {
+        glyph: classes.setdefault((*memberships[glyph],), len(classes) + 1)
+        for glyph in sorted(memberships, key=tt_font.getGlyphID)
+    }
+
+
+def _get_classes(
+    glyphs: Iterable[str],
+    partition: Mapping[str, int],
+) -> Sequence[int]:
+    """Returns the classes of a partition that make up a glyph set.
+
+    Args:
+        glyphs: The glyph set. It must be a union of classes of
+            `partition`.
+        partition: A map from glyphs to classes.
+
+    Returns:
+        The sorted classes whose union is `glyphs`.
+    """
+    return sorted({partition[glyph] for glyph in glyphs})
+
+
+def _make_class_def(partition: Mapping[str, int]) -> fontTools.ttLib.tables.otTables.ClassDef:
+    """Makes a class definition table.
+
+    Args:
+        partition: A map from glyphs to classes.
+
+    Returns:
+        A class definition table for `partition`.
+    """
+    class_def = fontTools.ttLib.tables.otTables.ClassDef()
+    class_def.classDefs = {**partition}
+    return class_def
+
+
+def _to_class_based(
+    tt_font: fontTools.ttLib.ttFont.TTFont,
+    lookup: fontTools.ttLib.tables.otTables.Lookup,
+) -> fontTools.ttLib.tables.otTables.ChainContextSubst | None:
+    """Converts the coverage-based subtables of a lookup to a
+    class-based subtable.
+
+    The class-based subtable matches the same glyph sequences, and
+    applies the same nested lookups to them, as the original subtables.
+    For each first glyph, its rules are in the same order as the
+    subtables they come from.
+
+    Args:
+        tt_font: The font containing the lookup.
+        lookup: A chaining contextual substitution lookup.
+
+    Returns:
+        A class-based subtable equivalent to all of `lookup`’s
+        subtables, or ``None`` if `lookup` does not have multiple
+        subtables, if any of its subtables is not coverage-based, or if
+        the class-based subtable would have more than `MAX_RULES`
+        rules.
+    """
+    subtables = []
+    for subtable in lookup.SubTable:
+        if not isinstance(subtable, fontTools.ttLib.tables.otTables.ChainContextSubst) or subtable.Format != 3:
+            return None
+        subtables.append(subtable)
+    if len(subtables) < 2:
+        return None
+    backtrack_partition = _partition(tt_font, (coverage.glyphs for subtable in subtables for coverage in subtable.BacktrackCoverage))
+    input_partition = _partition(tt_font, (coverage.glyphs for subtable in subtables for coverage in subtable.InputCoverage))
+    lookahead_partition = _partition(tt_font, (coverage.glyphs for subtable in subtables for coverage in subtable.LookAheadCoverage))
+    rules_classes = [
+        (
+            subtable,
+            [_get_classes(coverage.glyphs, backtrack_partition) for coverage in subtable.BacktrackCoverage],
+            [_get_classes(coverage.glyphs, input_partition) for coverage in subtable.InputCoverage],
+            [_get_classes(coverage.glyphs, lookahead_partition) for coverage in subtable.LookAheadCoverage],
+        )
+        for subtable in subtables
+    ]
+    if sum(
+        math.prod(len(classes) for classes in itertools.chain(backtrack, inputs, lookahead))
+        for _, backtrack, inputs, lookahead in rules_classes
+    ) > MAX_RULES:
+        return None
+    class_sets: list[fontTools.ttLib.tables.otTables.ChainSubClassSet | None] = [None] * (max(input_partition.values()) + 1)
+    for subtable, backtrack, inputs, lookahead in rules_classes:
+        input_start = len(backtrack)
+        lookahead_start = input_start + len(inputs)
+        for rule_classes in itertools.product(*backtrack, *inputs, *lookahead):
+            rule = fontTools.ttLib.tables.otTables.ChainSubClassRule()
+            rule.BacktrackGlyphCount = len(backtrack)
+            rule.Backtrack = [*rule_classes[:input_start]]
+            rule.InputGlyphCount = len(inputs)
+            rule.Input = [*rule_classes[input_start + 1:lookahead_start]]
+            rule.LookAheadGlyphCount = len(lookahead)
+            rule.LookAhead = [*rule_classes[lookahead_start:]]
+            rule.SubstCount = subtable.SubstCount
+            rule.SubstLookupRecord = subtable.SubstLookupRecord
+            class_set = class_sets[rule_classes[input_start]]
+            if class_set is None:
+                class_set = class_sets[rule_classes[input_start]] = fontTools.ttLib.tables.otTables.ChainSubClassSet()
+                class_set.ChainSubClassRule = []
+            class_set.ChainSubClassRule.append(rule)
+    for class_set in class_sets:
+        if class_set is not None:
+            class_set.ChainSubClassRuleCount = len(class_set.ChainSubClassRule)
+    coverage = fontTools.ttLib.tables.otTables.Coverage()
+    coverage.glyphs = sorted(
+        {glyph for subtable in subtables for glyph in subtable.InputCoverage[0].glyphs},
+        key=tt_font.getGlyphID,
+    )
+    class_based_subtable = fontTools.ttLib.tables.otTables.ChainContextSubst()
+    class_based_subtable.Format = 2
+    class_based_subtable.Coverage = coverage
+    class_based_subtable.BacktrackClassDef = _make_class_def(backtrack_partition)
+    class_based_subtable.InputClassDef = _make_class_def(input_partition)
+    class_based_subtable.LookAheadClassDef = _make_class_def(lookahead_partition)
+    class_based_subtable.ChainSubClassSetCount = len(class_sets)
+    class_based_subtable.ChainSubClassSet = class_sets
+    return class_based_subtable
+
+
+def _get_compiled_size(
+    tt_font: fontTools.ttLib.ttFont.TTFont,
+    lookup: fontTools.ttLib.tables.otTables.Lookup,
+) -> int | None:
+    """Returns the size of a compiled lookup.
+
+    Args:
+        tt_font: The font containing the lookup.
+        lookup: The lookup.
+
+    Returns:
+        The size of `lookup` in bytes, or ``None`` if it does not fit in
+        a lookup without extension subtables.
+    """
+    writer = fontTools.ttLib.tables.otBase.OTTableWriter()
+    try:
+        copy.deepcopy(lookup).compile(writer, tt_font)
+        return len(writer.getAllData())
+    except fontTools.ttLib.tables.otBase.OTLOffsetOverflowError:
+        return None
+
+
+def use_class_based_subtables(tt_font: fontTools.ttLib.ttFont.TTFont) -> int:
+    """Replaces coverage-based chaining contextual substitution
+    subtables with class-based subtables where that makes a lookup
+    smaller.
+
+    Args:
+        tt_font: The font to modify.
+
+    Returns:
+        The number of lookups whose subtables were replaced.
+    """
+    if 'GSUB' not in tt_font:
+        return 0
+    gsub = tt_font['GSUB']
+    assert isinstance(gsub, fontTools.ttLib.tables.G_S_U_B_.table_G_S_U_B_)
+    converted_lookups = 0
+    for lookup in gsub.table.LookupList.Lookup:
+        if lookup.LookupType != CHAINING_CONTEXTUAL_SUBSTITUTION or (subtable := _to_class_based(tt_font, lookup)) is None:
+            continue
+        class_based_lookup = copy.copy(lookup)
+        class_based_lookup.SubTable = [subtable]
+        class_based_lookup.SubTableCount = 1
+        class_based_size = _get_compiled_size(tt_font, class_based_lookup)
+        if class_based_size is None:
+            continue
+        size = _get_compiled_size(tt_font, lookup)
+        if size is None or class_based_size < size:
+            lookup.SubTable = class_based_lookup.SubTable
+            lookup.SubTableCount = class_based_lookup.SubTableCount
+            converted_lookups += 1
+    return converted_lookups
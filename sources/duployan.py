@@ -16,6 +16,8 @@
 from __future__ import annotations
 
 import collections
+import functools
+import itertools
 import math
 from typing import Final
 from typing import TYPE_CHECKING
@@ -29,9 +31,14 @@ import fontTools.ttLib.ttFont
 import anchors
 import charsets
 import charsets.data
+import contexts
+import language_systems
+from phases import FreezableList
+from phases import merge_lookups
 import phases.main
 import phases.marker
 import phases.middle
+from schema import GlyphNameRegistry
 from schema import Ignorability
 from schema import NO_PHASE_INDEX
 from schema import Schema
@@ -40,6 +47,7 @@ from shapes import HubPriority
 from shapes import Line
 from shapes import Notdef
 import sifting
+import snapshots
 from utils import BOLD_LIGHT_LINE
 from utils import BRACKET_HEIGHT
 from utils import CAP_HEIGHT
@@ -51,6 +59,7 @@ from utils import MAX_TREE_DEPTH
 from utils import MAX_TREE_WIDTH
 from utils import MINIMUM_STROKE_GAP
 from utils import NO_CONTEXT
+from utils import OrderedSet
 from utils import PrefixView
 from utils import REGULAR_LIGHT_LINE
 from utils import SHADING_FACTOR
@@ -60,18 +69,78 @@ from utils import mkmk
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from collections.abc import Collection
+    from collections.abc import Iterable
     from collections.abc import Mapping
     from collections.abc import MutableMapping
     from collections.abc import MutableSequence
     from collections.abc import Sequence
     from collections.abc import Set as AbstractSet
+    from pathlib import Path
 
     import fontforge
 
-    from phases import FreezableList
     from phases import Lookup
     from phases import Phase
+    from phases import PhaseProgress
+
+
+class _BuildState:
+    """The state of `Builder.build` between phases.
+
+    This is what a snapshot contains.
+
+    Attributes:
+        options: The options of the build that affect the font, by
+            name. A snapshot can only be resumed from by a build with
+            the same options.
+        completed_groups: The number of phase groups that have been run
+            to completion.
+        progress: The progress through the next phase group, or
+            ``None`` if it has not started.
+        schemas: All the schemas of the last completed phase group.
+        output_schemas: The output schemas of the main phases.
+        more_output_schemas: The output schemas of the middle phases.
+        lookups_with_phases: A list of 2-tuples of each lookup along
+            with the phase that generated it.
+        classes: The font’s global mapping to classes from their names.
+        class_asts: The font’s mapping to class ASTs from their names.
+        named_lookup_asts: The font’s mapping to named lookup ASTs from
+            their names.
+        cmapped_anchors: The anchors of the marks in 'cmap'.
+        canonical_names: The builder’s canonical names, as of the last
+            snapshot.
+        fea_statements: The builder’s top-level feature file
+            statements, as of the last snapshot.
+        glyphs: The builder’s glyphs, as of the last snapshot.
+        glyph_links: The schemas whose ``glyph`` attributes were set,
+            with the names of those glyphs, as of the last snapshot.
+        drawings: The builder’s drawings, as of the last snapshot.
+    """
+
+    def __init__(self, options: Mapping[str, object]) -> None:
+        """Initializes this `_BuildState`.
+
+        Args:
+            options: The ``options`` attribute.
+        """
+        self.options: Final = options
+        self.completed_groups = 0
+        self.progress: PhaseProgress | None = None
+        self.schemas: OrderedSet[Schema] = OrderedSet()
+        self.output_schemas: Iterable[Schema] = ()
+        self.more_output_schemas: Iterable[Schema] = ()
+        self.lookups_with_phases: MutableSequence[tuple[Lookup, Phase]] = []
+        self.classes: collections.defaultdict[str, FreezableList[Schema]] = collections.defaultdict(FreezableList)
+        self.class_asts: dict[str, fontTools.feaLib.ast.GlyphClassDefinition] = {}
+        self.named_lookup_asts: dict[str, fontTools.feaLib.ast.LookupBlock] = {}
+        self.cmapped_anchors: AbstractSet[str] = set()
+        self.canonical_names = GlyphNameRegistry()
+        self.fea_statements: MutableSequence[fontTools.feaLib.ast.Statement] = []
+        self.glyphs: Sequence[snapshots.GlyphData] = []
+        self.glyph_links: Sequence[tuple[Schema, str]] = []
+        self.drawings: Mapping[str, tuple[Schema, AbstractSet[str]]] = {}
 
 
 class Builder:
@@ -82,9 +151,17 @@ class Builder:
             built using FontForge. Most things that can use OpenType
             feature file are built using fontTools and don’t use this
             attribute.
-        light_line: The width of a light (unshaded) line.
-        shaded_line: The width of a shaded line.
+        light_line: The width of a light (unshaded) line. If the
+            builder lays out a bold font as if it were regular, this is
+            the regular width until the phases are done and the bold
+            width after.
+        report: Statistics about the build, by name.
+        shaded_line: The width of a shaded line. It changes when
+            ``light_line`` does.
+        skip_phases: Whether to skip the phases that cannot contribute
+            to an unjoined font. See `phases.run_phases`.
         stroke_gap: The minimum distance between non-touching strokes.
+            It changes when ``light_line`` does.
         unjoined: Whether to build an unjoined font.
     """
     def __init__(
@@ -93,6 +170,10 @@ class Builder:
         bold: bool,
         charset: charsets.Charset,
         unjoined: bool,
+        code_points: AbstractSet[int] | None = None,
+        *,
+        skip_phases: bool = True,
+        regular_layout: bool = False,
     ) -> None:
         """Initializes this `Builder`.
 
@@ -102,23 +183,46 @@ class Builder:
                 ``light_line`` and ``shaded_line`` attributes.
             charset: The set of characters to include in the font.
             unjoined: The ``unjoined`` attribute.
+            code_points: The code points to restrict `charset` to for a
+                partial build, or ``None`` to build the whole character
+                set.
+            skip_phases: The ``skip_phases`` attribute.
+            regular_layout: Whether to lay out a bold font as if it were
+                regular. The schemas and the phases use the regular
+                geometry, so the glyph order, GSUB, and GDEF are the
+                same as in the regular font; only the outlines, advance
+                widths, and anchors are bold. This is for the bold
+                master of a variable font. It has no effect on a regular
+                font.
         """
         self.font: Final = font
         self._fea: Final = fontTools.feaLib.ast.FeatureFile()
         self._anchors: Final[MutableMapping[str, fontTools.feaLib.ast.LookupBlock]] = {}
-        self._canonical_names: Final[MutableMapping[str, MutableSequence[Schema]]] = {}
+        self._canonical_names: Final = GlyphNameRegistry()
+        self._configuration: Final[Mapping[str, object]] = {
+            'bold': bold,
+            'charset': charset,
+            'unjoined': unjoined,
+            'code_points': None if code_points is None else frozenset(code_points),
+            'skip_phases': skip_phases,
+            'regular_layout': regular_layout,
+        }
         self._initialize_phases()
-        self.light_line: Final = BOLD_LIGHT_LINE if bold else REGULAR_LIGHT_LINE
-        self.shaded_line: Final = SHADING_FACTOR * self.light_line
-        self.stroke_gap: Final = max(MINIMUM_STROKE_GAP, self.light_line)
-        self._schemas = charsets.data.initialize_schemas(charset, self.light_line, self.stroke_gap)
+        self.report: Final[MutableMapping[str, int]] = {}
+        self._outline_light_line: Final = BOLD_LIGHT_LINE if bold else REGULAR_LIGHT_LINE
+        self.light_line = REGULAR_LIGHT_LINE if regular_layout else self._outline_light_line
+        self.shaded_line = SHADING_FACTOR * self.light_line
+        self.stroke_gap = max(MINIMUM_STROKE_GAP, self.light_line)
+        self._drawings: Final[MutableMapping[str, tuple[Schema, AbstractSet[str]]]] = {}
+        self._schemas = charsets.data.initialize_schemas(charset, self.light_line, self.stroke_gap, code_points)
         self.unjoined = unjoined
+        self.skip_phases: Final = skip_phases
         if __debug__:
-            code_points: Final[collections.defaultdict[int, int]] = collections.defaultdict(int)
+            code_point_counts: Final[collections.defaultdict[int, int]] = collections.defaultdict(int)
             for schema in self._schemas:
                 if schema.cmap is not None:
-                    code_points[schema.cmap] += 1
-            duplicate_code_points = {cp: count for cp, count in code_points.items() if count > 1}
+                    code_point_counts[schema.cmap] += 1
+            duplicate_code_points = {cp: count for cp, count in code_point_counts.items() if count > 1}
             assert not duplicate_code_points, ('Duplicate code points:\n    '
                 + '\n    '.join(map(hex, sorted(duplicate_code_points.keys()))))
 
@@ -126,6 +230,7 @@ class Builder:
         self._phases = phases.main.PHASE_LIST
         self._middle_phases = phases.middle.PHASE_LIST
         self._marker_phases = phases.marker.PHASE_LIST
+        self._phase_indices = {phase: i for i, phase in enumerate([*self._phases, *self._middle_phases, *self._marker_phases])}
 
     def _add_lookup(
         self,
@@ -134,6 +239,7 @@ class Builder:
         *,
         flags: int,
         mark_filtering_set: fontTools.feaLib.ast.GlyphClassDefinition | None = None,
+        merged_anchor_class_names: Iterable[str] = (),
     ) -> None:
         assert flags & fontTools.otlLib.builder.LOOKUP_FLAG_USE_MARK_FILTERING_SET == 0, 'UseMarkFilteringSet is added automatically'
         assert mark_filtering_set is None or flags & fontTools.otlLib.builder.LOOKUP_FLAG_IGNORE_MARKS == 0, 'UseMarkFilteringSet is not useful with IgnoreMarks'
@@ -149,6 +255,8 @@ class Builder:
                 ))
         self._fea.statements.append(lookup)
         self._anchors[anchor_class_name] = lookup
+        for merged_anchor_class_name in merged_anchor_class_names:
+            self._anchors[merged_anchor_class_name] = lookup
         feature = fontTools.feaLib.ast.FeatureBlock(feature_tag)
         for script in KNOWN_SCRIPTS:
             feature.statements.append(fontTools.feaLib.ast.ScriptStatement(script))
@@ -157,7 +265,43 @@ class Builder:
                 feature.statements.append(fontTools.feaLib.ast.LookupReferenceStatement(lookup))
         self._fea.statements.append(feature)
 
-    def _add_lookups(self, class_asts: Mapping[str, fontTools.feaLib.ast.GlyphClassDefinition]) -> None:
+    def _group_independent_mark_anchors(self, anchor_class_names: Iterable[str]) -> Sequence[Sequence[str]]:
+        """Groups consecutive mark anchors whose mark-to-base lookups can
+        be merged.
+
+        Mark-to-base lookups with the same flags and mark filtering set
+        cannot interact if no glyph is a mark in more than one of them:
+        each mark is positioned relative to its base by at most one of
+        them, and positioning one mark does not change which base
+        another mark attaches to. Such lookups can be merged into one
+        lookup with one mark class per anchor.
+
+        Args:
+            anchor_class_names: The names of the anchors of some
+                consecutive mark-to-base lookups with the same flags and
+                mark filtering set.
+
+        Returns:
+            A partition of `anchor_class_names` into runs whose lookups
+            can be merged.
+        """
+        marks: collections.defaultdict[str, set[str]] = collections.defaultdict(set)
+        for glyph in self.font.glyphs():
+            for anchor_class_name, anchor_type, *_ in glyph.anchorPoints:
+                if anchor_type == 'mark':
+                    marks[anchor_class_name].add(glyph.glyphname)
+        groups: list[list[str]] = []
+        group_marks: set[str] = set()
+        for anchor_class_name in anchor_class_names:
+            if groups and group_marks.isdisjoint(marks[anchor_class_name]):
+                groups[-1].append(anchor_class_name)
+            else:
+                groups.append([anchor_class_name])
+                group_marks = set()
+            group_marks |= marks[anchor_class_name]
+        return groups
+
+    def _add_lookups(self, class_asts: Mapping[str, fontTools.feaLib.ast.GlyphClassDefinition], *, merge: bool) -> None:
         if not self.unjoined:
             self._add_lookup(
                     'abvm',
@@ -217,11 +361,14 @@ class Builder:
                 flags=fontTools.otlLib.builder.LOOKUP_FLAG_RIGHT_TO_LEFT,
                 mark_filtering_set=class_asts[phases.CONTINUING_OVERLAP_OR_HUB_CLASS],
             )
-        for anchor in anchors.ALL_MARK:
+        mark_anchor_groups = self._group_independent_mark_anchors(anchors.ALL_MARK) if merge else [[anchor] for anchor in anchors.ALL_MARK]
+        self.report['merged_gpos_lookups'] = len(anchors.ALL_MARK) - len(mark_anchor_groups)
+        for anchor, *merged_anchors in mark_anchor_groups:
             self._add_lookup(
                 'mark',
                 anchor,
                 flags=0,
+                merged_anchor_class_names=merged_anchors,
             )
         for anchor in anchors.ALL_MKMK:
             self._add_lookup(
@@ -440,6 +587,7 @@ class Builder:
         glyph.temporary = schema
         if drawing:
             self._draw_glyph(glyph, schema, cmapped_anchors)
+            self._drawings[glyph_name] = schema, cmapped_anchors
         else:
             glyph.width = glyph.width
         return glyph
@@ -455,6 +603,29 @@ class Builder:
         if not feature_suffix or schema.cps == (0x2044,):
             glyph.width = 0
 
+    def _redraw_glyphs(self) -> None:
+        """Redraws the drawn glyphs with the outline geometry.
+
+        This only does anything if the builder lays out a bold font as
+        if it were regular. It must be called after the phases, which
+        see the regular geometry, and before the anchors are converted
+        to GPOS. A glyph whose advance width was set to 0 keeps that
+        width.
+        """
+        if self.light_line == self._outline_light_line:
+            return
+        self.light_line = self._outline_light_line
+        self.shaded_line = SHADING_FACTOR * self.light_line
+        self.stroke_gap = max(MINIMUM_STROKE_GAP, self.light_line)
+        for glyph_name, (schema, cmapped_anchors) in self._drawings.items():
+            glyph = self.font[glyph_name]
+            zero_width = glyph.width == 0
+            glyph.clear()
+            glyph.anchorPoints = []
+            self._draw_glyph(glyph, schema, cmapped_anchors)
+            if zero_width:
+                glyph.width = 0
+
     def _complete_gpos(self) -> None:
         mark_positions: collections.defaultdict[str, collections.defaultdict[tuple[float, float], fontTools.feaLib.ast.GlyphClass]] = (
             collections.defaultdict(lambda: collections.defaultdict(fontTools.feaLib.ast.GlyphClass)))
@@ -609,7 +780,9 @@ class Builder:
         Raises:
             ValueError: If `phase` is not one of this builder’s phases.
         """
-        return [*self._phases, *self._middle_phases, *self._marker_phases].index(phase)
+        if (phase_index := self._phase_indices.get(phase)) is None:
+            raise ValueError(f"{phase.__name__} is not one of this builder's phases")
+        return phase_index
 
     @staticmethod
     def _rename_schemas(grouper: sifting.Grouper[Schema], phase_index: int) -> None:
@@ -626,74 +799,274 @@ class Builder:
                     if grouper.group_of(schema):
                         grouper.remove_item(group, schema)
 
-    def build(self) -> None:
+    def _run_phase_group(
+        self,
+        state: _BuildState,
+        get_input_schemas: Callable[[], Iterable[Schema]],
+        phase_group: Sequence[Phase],
+        all_classes: collections.defaultdict[str, FreezableList[Schema]] | None,
+        snapshot: tuple[str, Path] | None,
+    ) -> tuple[
+        OrderedSet[Schema],
+        Iterable[Schema],
+        MutableSequence[tuple[Lookup, Phase]],
+        collections.defaultdict[str, FreezableList[Schema]],
+        MutableMapping[str, tuple[Lookup, Phase]],
+    ]:
+        """Runs a group of phases, resuming from a snapshot if possible.
+
+        Args:
+            state: The state of the build.
+            get_input_schemas: A function returning the input schemas
+                for the first phase. It is not called if the group is
+                resumed partway through.
+            phase_group: The phases to run.
+            all_classes: The font’s global mapping to classes from their
+                names, or ``None`` to start with a new empty mapping.
+            snapshot: The checkpoint and path for `_take_phase_snapshot`.
+
+        Returns:
+            The return value of `phases.run_phases`.
+        """
+        progress = state.progress
+        state.progress = None
+        return phases.run_phases(
+            self,
+            () if progress else get_input_schemas(),
+            phase_group,
+            all_classes,
+            progress=progress,
+            on_phase_end=None if snapshot is None else functools.partial(self._take_phase_snapshot, state, snapshot),
+        )
+
+    def _take_phase_snapshot(
+        self,
+        state: _BuildState,
+        snapshot: tuple[str, Path],
+        phase: Phase,
+        progress: PhaseProgress,
+    ) -> None:
+        """Saves a snapshot if a phase is the checkpoint.
+
+        Args:
+            state: The state of the build.
+            snapshot: The name of the checkpoint and the path to save
+                the snapshot to.
+            phase: The phase that just finished.
+            progress: The progress through the current phase group.
+        """
+        checkpoint, path = snapshot
+        if phase.__name__ == checkpoint:
+            state.progress = progress
+            self._save_snapshot(state, path)
+            state.progress = None
+
+    def _finish_phase_group(
+        self,
+        state: _BuildState,
+        snapshot: tuple[str, Path] | None,
+    ) -> None:
+        """Marks a phase group as complete and saves a snapshot if the
+        phase group is the checkpoint.
+
+        Args:
+            state: The state of the build.
+            snapshot: The name of the checkpoint and the path to save
+                the snapshot to, or ``None``.
+        """
+        state.completed_groups += 1
+        if snapshot is not None and snapshot[0] == snapshots.PHASE_GROUPS[state.completed_groups - 1]:
+            self._save_snapshot(state, snapshot[1])
+
+    def _save_snapshot(self, state: _BuildState, path: Path) -> None:
+        """Saves a snapshot of the build.
+
+        Args:
+            state: The state of the build.
+            path: The path to save the snapshot to.
+        """
+        state.canonical_names = self._canonical_names
+        state.fea_statements = self._fea.statements
+        state.glyphs = [snapshots.GlyphData(glyph) for glyph in self.font.glyphs()]
+        state.glyph_links = [
+            (schema, schema.glyph.glyphname)
+            for schema in itertools.chain(state.schemas, () if state.progress is None else state.progress.all_schemas)
+            if schema.glyph is not None
+        ]
+        state.drawings = self._drawings
+        snapshots.save(path, state.options, state)
+        state.glyphs = []
+        state.glyph_links = []
+
+    def _load_snapshot(self, path: Path, options: Mapping[str, object]) -> _BuildState:
+        """Loads a snapshot of a build into this builder.
+
+        Args:
+            path: The path of the snapshot.
+            options: The options of the current build. See
+                `_BuildState`.
+
+        Returns:
+            The state of the build when the snapshot was saved.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a build with
+                the same options as this builder.
+        """
+        state = snapshots.load(path, options)
+        if not isinstance(state, _BuildState):
+            raise ValueError(f'{path} is not a snapshot of a build')  # ruff: ignore[type-check-without-type-error]
+        self._canonical_names.update(state.canonical_names)
+        self._fea.statements[:] = state.fea_statements
+        for glyph_data in state.glyphs:
+            glyph_data.restore(self.font)
+        for schema, glyph_name in state.glyph_links:
+            schema.glyph = self.font[glyph_name]
+        self._drawings.update(state.drawings)
+        state.glyphs = []
+        state.glyph_links = []
+        return state
+
+    def validate_checkpoint(self, checkpoint: str) -> None:
+        """Checks whether a string names a checkpoint.
+
+        A checkpoint is a point in the build where a snapshot can be
+        taken. It can be the name of a phase group or of a phase.
+
+        Args:
+            checkpoint: The name of a phase group or phase.
+
+        Raises:
+            ValueError: If `checkpoint` is not the name of any phase
+                group or phase.
+        """
+        if checkpoint not in snapshots.PHASE_GROUPS and all(phase.__name__ != checkpoint for phase in self._phase_indices):
+            raise ValueError(f'Unknown checkpoint: {checkpoint}')
+
+    def build(
+        self,
+        fast: bool = False,
+        snapshot: tuple[str, Path] | None = None,
+        resume_from: Path | None = None,
+        *,
+        merge: bool = True,
+        options: Mapping[str, object] | None = None,
+    ) -> None:
         """Does most of the work of building the font.
 
         When this method returns, the FontForge font is ready to
         generate. GDEF, GPOS, and GSUB are almost ready but are not in
         the font; see `complete_layout`.
+
+        Args:
+            fast: Whether to skip outline cleanup. Outline cleanup
+                does not affect shaping, so it is unnecessary when
+                building a font just to run shaping tests.
+            snapshot: A checkpoint (see `validate_checkpoint`) and a
+                path to save a snapshot to when the build reaches that
+                checkpoint, or ``None`` to not save a snapshot.
+            resume_from: The path of a snapshot to resume the build
+                from, or ``None`` to build from scratch. The snapshot
+                must have been saved by a build with the same options
+                from the same source files.
+            merge: Whether to merge adjacent lookups that cannot
+                interact. See `phases.merge_lookups` and
+                `_group_independent_mark_anchors`.
+            options: Other options that affect the font but not this
+                method, by name, or ``None`` if there are none. They
+                are stored in snapshots along with the arguments this
+                builder was initialized with, `fast`, and `merge`.
         """
-        (
-            schemas,
-            output_schemas,
-            lookups_with_phases,
-            classes,
-            named_lookups_with_phases,
-        ) = phases.run_phases(self, self._schemas, self._phases)
-        self._merge_schemas(schemas, lookups_with_phases, classes, named_lookups_with_phases)
-        class_asts: dict[str, fontTools.feaLib.ast.GlyphClassDefinition] = {}
-        self._convert_classes(classes, class_asts)
-        named_lookup_asts = self._convert_named_lookups(named_lookups_with_phases, class_asts)
-        (
-            _,
-            more_output_schemas,
-            more_lookups_with_phases,
-            more_classes,
-            more_named_lookups_with_phases,
-        ) = phases.run_phases(self, [schema for schema in output_schemas if schema.canonical_schema is schema], self._middle_phases, classes)
-        lookups_with_phases += more_lookups_with_phases
-        classes |= more_classes
-        self._convert_classes(more_classes, class_asts)
-        named_lookup_asts |= self._convert_named_lookups(more_named_lookups_with_phases, class_asts)
-        cmapped_anchors = {schema.anchor for schema in schemas if schema.anchor is not None and schema.cmap is not None}
-        for schema in schemas.sorted(key=lambda schema: (
-            schema.canonical_schema is not schema,
-            schema.cmap is None and schema.glyph_class == GlyphClass.MARK
-                or schema.glyph_name(self._canonical_names).startswith('_')
-                or not (not schema.ignored_for_topography and schema in output_schemas and schema in more_output_schemas),
-        )):
-            if schema.canonical_schema is schema or schema.cmap is not None:
-                self._create_glyph(
-                    schema,
-                    cmapped_anchors,
-                    drawing=not schema.ignored_for_topography and schema in output_schemas and schema in more_output_schemas,
-                )
-        (
-            schemas,
-            _,
-            more_lookups_with_phases,
-            more_classes,
-            more_named_lookups_with_phases,
-        ) = phases.run_phases(self, [*map(self._glyph_to_schema, self.font.glyphs())], self._marker_phases, classes)
-        lookups_with_phases += more_lookups_with_phases
-        classes |= more_classes
-        for schema in schemas.sorted(key=Schema.glyph_id_sort_key):
-            if schema.glyph is None:
-                self._create_marker(schema, cmapped_anchors)
-        self._convert_classes(more_classes, class_asts)
-        named_lookup_asts |= self._convert_named_lookups(more_named_lookups_with_phases, class_asts)
+        build_options = {**self._configuration, 'fast': fast, 'merge': merge, **(options or {})}
+        state = _BuildState(build_options) if resume_from is None else self._load_snapshot(resume_from, build_options)
+        if state.completed_groups == 0:
+            (
+                state.schemas,
+                state.output_schemas,
+                state.lookups_with_phases,
+                state.classes,
+                named_lookups_with_phases,
+            ) = self._run_phase_group(state, lambda: self._schemas, self._phases, None, snapshot)
+            self._merge_schemas(state.schemas, state.lookups_with_phases, state.classes, named_lookups_with_phases)
+            self._convert_classes(state.classes, state.class_asts)
+            state.named_lookup_asts = self._convert_named_lookups(named_lookups_with_phases, state.class_asts)
+            self._finish_phase_group(state, snapshot)
+        if state.completed_groups == 1:
+            (
+                _,
+                state.more_output_schemas,
+                more_lookups_with_phases,
+                more_classes,
+                more_named_lookups_with_phases,
+            ) = self._run_phase_group(
+                state,
+                lambda: [schema for schema in state.output_schemas if schema.canonical_schema is schema],
+                self._middle_phases,
+                state.classes,
+                snapshot,
+            )
+            state.lookups_with_phases += more_lookups_with_phases
+            state.classes |= more_classes
+            self._convert_classes(more_classes, state.class_asts)
+            state.named_lookup_asts |= self._convert_named_lookups(more_named_lookups_with_phases, state.class_asts)
+            state.cmapped_anchors = {schema.anchor for schema in state.schemas if schema.anchor is not None and schema.cmap is not None}
+            output_schemas = state.output_schemas
+            more_output_schemas = state.more_output_schemas
+            for schema in state.schemas.sorted(key=lambda schema: (
+                schema.canonical_schema is not schema,
+                schema.cmap is None and schema.glyph_class == GlyphClass.MARK
+                    or schema.glyph_name(self._canonical_names).startswith('_')
+                    or not (not schema.ignored_for_topography and schema in output_schemas and schema in more_output_schemas),
+            )):
+                if schema.canonical_schema is schema or schema.cmap is not None:
+                    self._create_glyph(
+                        schema,
+                        state.cmapped_anchors,
+                        drawing=not schema.ignored_for_topography and schema in output_schemas and schema in more_output_schemas,
+                    )
+            self._finish_phase_group(state, snapshot)
+        if state.completed_groups == 2:
+            (
+                state.schemas,
+                _,
+                more_lookups_with_phases,
+                more_classes,
+                more_named_lookups_with_phases,
+            ) = self._run_phase_group(state, lambda: [*map(self._glyph_to_schema, self.font.glyphs())], self._marker_phases, state.classes, snapshot)
+            state.lookups_with_phases += more_lookups_with_phases
+            state.classes |= more_classes
+            for schema in state.schemas.sorted(key=Schema.glyph_id_sort_key):
+                if schema.glyph is None:
+                    self._create_marker(schema, state.cmapped_anchors)
+            self._convert_classes(more_classes, state.class_asts)
+            state.named_lookup_asts |= self._convert_named_lookups(more_named_lookups_with_phases, state.class_asts)
+            self._finish_phase_group(state, snapshot)
+        self._redraw_glyphs()
+        lookups_with_phases = merge_lookups(state.lookups_with_phases, state.classes) if merge else state.lookups_with_phases
+        self.report['lookups'] = len(lookups_with_phases)
+        self.report['merged_lookups'] = len(state.lookups_with_phases) - len(lookups_with_phases)
         features_to_scripts: collections.defaultdict[str, set[str]] = collections.defaultdict(set)
         for lp in lookups_with_phases:
             if lp[0].feature:
-                prefix_classes = PrefixView(lp[1], classes)
+                prefix_classes = PrefixView(lp[1], state.classes)
                 features_to_scripts[lp[0].feature] |= lp[0].get_scripts(prefix_classes)
         for i, lp in enumerate(lookups_with_phases):
             self._fea.statements.extend(
-                lp[0].to_asts(features_to_scripts, PrefixView(lp[1], class_asts), PrefixView(lp[1], named_lookup_asts), self._canonical_names, i),
+                lp[0].to_asts(
+                    features_to_scripts,
+                    PrefixView(lp[1], state.class_asts),
+                    PrefixView(lp[1], state.named_lookup_asts),
+                    self._canonical_names,
+                    i,
+                ),
             )
-        self._add_lookups(class_asts)
+        if __debug__:
+            self._canonical_names.check()
+        self._add_lookups(state.class_asts, merge=merge)
         self.font.selection.all()
         self.font.round()
+        if fast:
+            return
         self.font.simplify(3, (
             'setstarttoextremum',
             'smoothcurves',
@@ -704,11 +1077,15 @@ class Builder:
     def complete_layout(
         self,
         tt_font: fontTools.ttLib.ttFont.TTFont,
+        *,
+        compact: bool = True,
     ) -> None:
         """Adds GDEF, GPOS, and GSUB to a font.
 
         Args:
             tt_font: The font to modify.
+            compact: Whether to remove redundant language systems. See
+                `language_systems.compact_language_systems`.
         """
         self._complete_gpos()
         self._recreate_gdef()
@@ -716,3 +1093,6 @@ class Builder:
                 tt_font,
                 self._fea,
                 ['GDEF', 'GPOS', 'GSUB'])
+        self.report['class_based_lookups'] = contexts.use_class_based_subtables(tt_font)
+        if compact:
+            self.report['language_system_bytes_saved'] = language_systems.compact_language_systems(tt_font)
@@ -0,0 +1,123 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compaction of the script and language system lists.
+
+Every anonymous lookup is registered under each of its language systems
+in each script it is relevant to. Most language systems therefore end
+up with exactly the same features as their scripts’ default language
+systems. A shaper uses a script’s default language system for any
+language system the script does not list, so those language systems are
+redundant. feaLib already shares features with identical lookups, and
+fontTools already shares identical language system tables when it
+serializes a table, so all that is left is to remove the redundant
+language systems. No feature is orphaned, because a redundant language
+system only refers to features that its script’s default language
+system also refers to.
+
+Scripts are never removed, even if they are identical to ``'DFLT'``,
+because shapers choose how to shape a run based on which script tag is
+found in the font.
+"""
+
+from __future__ import annotations
+
+import fontTools.ttLib.tables.G_P_O_S_
+import fontTools.ttLib.tables.G_S_U_B_
+import fontTools.ttLib.tables.otBase
+import fontTools.ttLib.tables.otTables
+import fontTools.ttLib.ttFont
+
+
+def _is_equivalent(
+    language_system_1: fontTools.ttLib.tables.otTables.LangSys,
+    language_system_2: fontTools.ttLib.tables.otTables.LangSys,
+) -> bool:
+    """Returns whether two language systems have the same features.
+
+    Args:
+        language_system_1: A language system.
+        language_system_2: Another language system.
+    """
+    return (language_system_1.ReqFeatureIndex == language_system_2.ReqFeatureIndex
+        and sorted(language_system_1.FeatureIndex) == sorted(language_system_2.FeatureIndex)
+    )
+
+
+def _remove_redundant_language_systems(
+    table: fontTools.ttLib.tables.otTables.GPOS | fontTools.ttLib.tables.otTables.GSUB,
+) -> None:
+    """Removes the language systems that are equivalent to their
+    scripts’ default language systems.
+
+    Args:
+        table: A GPOS or GSUB table.
+    """
+    for script_record in table.ScriptList.ScriptRecord:
+        script = script_record.Script
+        if (default_language_system := script.DefaultLangSys) is None:
+            continue
+        script.LangSysRecord = [
+            language_system_record
+            for language_system_record in script.LangSysRecord
+            if not _is_equivalent(language_system_record.LangSys, default_language_system)
+        ]
+        script.LangSysCount = len(script.LangSysRecord)
+
+
+def _get_compiled_size(
+    tt_font: fontTools.ttLib.ttFont.TTFont,
+    table: fontTools.ttLib.tables.otTables.GPOS | fontTools.ttLib.tables.otTables.GSUB,
+) -> int:
+    """Returns the size of the compiled script and feature lists of a
+    table.
+
+    Args:
+        tt_font: The font containing the table.
+        table: A GPOS or GSUB table.
+
+    Returns:
+        The total size in bytes of `table`’s script list and feature
+        list.
+    """
+    size = 0
+    for subtable in [table.ScriptList, table.FeatureList]:
+        writer = fontTools.ttLib.tables.otBase.OTTableWriter()
+        subtable.compile(writer, tt_font)
+        size += len(writer.getAllData())
+    return size
+
+
+def compact_language_systems(tt_font: fontTools.ttLib.ttFont.TTFont) -> int:
+    """Removes redundant language systems from GPOS and GSUB.
+
+    Shaping is unaffected.
+
+    Args:
+        tt_font: The font to modify.
+
+    Returns:
+        The number of bytes saved.
+    """
+    saved_bytes = 0
+    for tag in ['GPOS', 'GSUB']:
+        if tag not in tt_font:
+            continue
+        table_wrapper = tt_font[tag]
+        assert isinstance(table_wrapper, (fontTools.ttLib.tables.G_P_O_S_.table_G_P_O_S_, fontTools.ttLib.tables.G_S_U_B_.table_G_S_U_B_))
+        table = table_wrapper.table
+        size = _get_compiled_size(tt_font, table)
+        _remove_redundant_language_systems(table)
+        saved_bytes += size - _get_compiled_size(tt_font, table)
+    return saved_bytes
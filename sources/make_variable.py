@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Merges the regular and bold fonts into a variable font.
+
+A bold font’s layout depends on its geometry, so the bold master must
+be built with ``--regular-layout``. Its schemas and phases then use the
+regular geometry, so its glyph order, GSUB, and GDEF are identical to
+the regular master’s and its outlines normally have the same structure.
+Only its outlines, advance widths, and anchors are bold. The variable
+font shares one copy of GSUB and GDEF between both weights; the
+anchors in GPOS vary, along with the outlines and advance widths.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Final
+from typing import TYPE_CHECKING
+
+import cffsubr
+import fontTools.cffLib
+import fontTools.designspaceLib
+import fontTools.pens.recordingPen
+import fontTools.pens.t2CharStringPen
+import fontTools.ttLib.tables.C_F_F_
+import fontTools.ttLib.ttFont
+import fontTools.varLib
+import uharfbuzz
+
+import build
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+#: The tables that must be identical in both masters because they cannot
+#: vary. The variable font only has one copy of each.
+SHARED_TABLES: Final = ['GDEF', 'GSUB']
+
+
+def _get_structure(pen: fontTools.pens.recordingPen.RecordingPen) -> Sequence[tuple[str, int]]:
+    """Returns the structure of an outline.
+
+    Two outlines can be interpolated if and only if they have the same
+    structure.
+
+    Args:
+        pen: A pen that has recorded an outline.
+
+    Returns:
+        The operators of the outline, with the number of points of each.
+    """
+    return [(operator, len(operands)) for operator, operands in pen.value]
+
+
+def _get_top_dict(tt_font: fontTools.ttLib.ttFont.TTFont) -> fontTools.cffLib.TopDict:
+    """Returns the top dictionary of a font's CFF table.
+
+    Args:
+        tt_font: A font with a CFF table.
+    """
+    cff_table = tt_font['CFF ']
+    assert isinstance(cff_table, fontTools.ttLib.tables.C_F_F_.table_C_F_F_)
+    return cff_table.cff[0]
+
+
+def _redraw_glyph(
+    top_dict: fontTools.cffLib.TopDict,
+    glyph_name: str,
+    width: int,
+    pen: fontTools.pens.recordingPen.RecordingPen,
+) -> None:
+    """Replaces a glyph's charstring with a recorded outline.
+
+    Args:
+        top_dict: The top dictionary of the font containing the glyph.
+        glyph_name: The name of the glyph.
+        width: The advance width of the glyph.
+        pen: A pen that has recorded the new outline.
+    """
+    assert top_dict.Private is not None
+    assert top_dict.CharStrings is not None
+    charstring_pen = fontTools.pens.t2CharStringPen.T2CharStringPen(width - top_dict.Private.nominalWidthX, None)
+    pen.replay(charstring_pen)
+    top_dict.CharStrings[glyph_name] = charstring_pen.getCharString(private=top_dict.Private)
+
+
+def _redraw_glyphs(
+    regular: fontTools.ttLib.ttFont.TTFont,
+    bold: fontTools.ttLib.ttFont.TTFont,
+) -> list[str]:
+    """Redraws the glyphs of both masters so that they are compatible.
+
+    Each glyph is redrawn without hints or subroutines, which might
+    differ between the masters. A glyph whose outlines in the two
+    masters have different structures gets the regular outline in the
+    bold master too, so it does not vary by weight.
+
+    Args:
+        regular: The regular master.
+        bold: The bold master.
+
+    Returns:
+        The names of the glyphs that could not be made compatible.
+    """
+    incompatible_glyphs = []
+    regular_top_dict = _get_top_dict(regular)
+    bold_top_dict = _get_top_dict(bold)
+    regular_glyph_set = regular.getGlyphSet()
+    bold_glyph_set = bold.getGlyphSet()
+    for glyph_name in regular.getGlyphOrder():
+        regular_glyph = regular_glyph_set[glyph_name]
+        bold_glyph = bold_glyph_set[glyph_name]
+        regular_pen = fontTools.pens.recordingPen.RecordingPen()
+        regular_glyph.draw(regular_pen)
+        bold_pen = fontTools.pens.recordingPen.RecordingPen()
+        bold_glyph.draw(bold_pen)
+        if _get_structure(regular_pen) != _get_structure(bold_pen):
+            incompatible_glyphs.append(glyph_name)
+            bold_pen = regular_pen
+        _redraw_glyph(regular_top_dict, glyph_name, regular_glyph.width, regular_pen)
+        _redraw_glyph(bold_top_dict, glyph_name, bold_glyph.width, bold_pen)
+    return incompatible_glyphs
+
+
+def make_variable(
+    regular_path: str,
+    bold_path: str,
+    output_path: str,
+    noto: bool,
+    unjoined: str | None,
+) -> None:
+    """Merges a regular and a bold font into a variable font.
+
+    The variable font has a CFF2 table and a 'wght' axis from
+    `build.REGULAR_WEIGHT` to `build.BOLD_WEIGHT`, with the regular master as the
+    default. Its GPOS anchors vary between the masters’ positions. The names of any glyphs whose outlines could not be made
+    compatible are printed to stderr; those glyphs do not vary by
+    weight.
+
+    Args:
+        regular_path: The path of the regular master.
+        bold_path: The path of the bold master, built with
+            ``--regular-layout``.
+        output_path: The path to save the variable font to.
+        noto: Whether the font is a Noto font.
+        unjoined: The name of the CURS axis value if cursive joining is
+            disabled in this font, or else ``None``.
+
+    Raises:
+        ValueError: If the masters have different glyph orders or
+            different tables among `SHARED_TABLES`.
+    """
+    regular = fontTools.ttLib.ttFont.TTFont(regular_path)
+    bold = fontTools.ttLib.ttFont.TTFont(bold_path)
+    if regular.getGlyphOrder() != bold.getGlyphOrder():
+        raise ValueError(f'{regular_path} and {bold_path} have different glyph orders')
+    for tag in SHARED_TABLES:
+        if (tag in regular) != (tag in bold) or tag in regular and regular.getTableData(tag) != bold.getTableData(tag):
+            raise ValueError(f"{regular_path} and {bold_path} have different '{tag}' tables; was the bold master built with --regular-layout?")
+    if incompatible_glyphs := _redraw_glyphs(regular, bold):
+        sys.stderr.write(f'{len(incompatible_glyphs)} glyphs have incompatible outlines and will not vary by weight:\n')
+        for glyph_name in incompatible_glyphs:
+            sys.stderr.write(f'    {glyph_name}\n')
+    designspace = fontTools.designspaceLib.DesignSpaceDocument()
+    designspace.addAxis(fontTools.designspaceLib.AxisDescriptor(
+        tag='wght',
+        name='Weight',
+        minimum=build.REGULAR_WEIGHT,
+        default=build.REGULAR_WEIGHT,
+        maximum=build.BOLD_WEIGHT,
+    ))
+    for master, weight, style_name in [(regular, build.REGULAR_WEIGHT, 'Regular'), (bold, build.BOLD_WEIGHT, 'Bold')]:
+        designspace.addSource(fontTools.designspaceLib.SourceDescriptor(font=master, location={'Weight': weight}))
+        designspace.addInstance(fontTools.designspaceLib.InstanceDescriptor(location={'Weight': weight}, styleName=style_name))
+    variable_font, _, _ = fontTools.varLib.build(designspace)
+    build.set_style_attributes(variable_font, noto, unjoined, bold=False, variable=True)
+    uharfbuzz.serialize_with_tag = uharfbuzz.repack_with_tag  # Work around https://github.com/fonttools/fonttools/pull/3973
+    cffsubr.subroutinize(variable_font)
+    variable_font.save(output_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Merges the regular and bold fonts into a variable font.')
+    parser.add_argument('--noto', action='store_true', help='Use Noto conventions.')
+    parser.add_argument('--unjoined', metavar='NAME', help='The name of the CURS axis value, if cursive joining is disabled.')
+    parser.add_argument('--output', metavar='FILE', required=True, help='output font')
+    parser.add_argument('regular', help='the regular master')
+    parser.add_argument('bold', help='the bold master')
+    args = parser.parse_args()
+    assert isinstance(args.noto, bool)  # type: ignore[misc]
+    assert isinstance(args.unjoined, str | None)  # type: ignore[misc]
+    assert isinstance(args.output, str)  # type: ignore[misc]
+    assert isinstance(args.regular, str)  # type: ignore[misc]
+    assert isinstance(args.bold, str)  # type: ignore[misc]
+    make_variable(args.regular, args.bold, args.output, args.noto, args.unjoined)
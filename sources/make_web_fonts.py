@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compression of fonts into WOFF and WOFF2 web fonts.
+
+Compressing a font into WOFF2 with Brotli at its maximum quality takes
+much longer than compressing it into WOFF with zlib, so each pair of a
+font and a flavor is compressed in its own process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import itertools
+from pathlib import Path
+from typing import Final
+from typing import Literal
+from typing import TYPE_CHECKING
+
+import fontTools.ttLib.ttFont
+import fontTools.ttLib.woff2
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+type Flavor = Literal['woff', 'woff2']
+
+
+#: The web font flavors that fonts can be compressed into.
+FLAVORS: Final[list[Flavor]] = ['woff', 'woff2']
+
+
+#: The web font flavors to compress fonts into by default.
+DEFAULT_FLAVORS: Final[list[Flavor]] = ['woff2']
+
+
+#: The tables to apply WOFF2 transforms to. fontTools only transforms
+#: the tables that a given font has and whose transforms are valid for
+#: that font: 'glyf' and 'loca' only exist in TrueType fonts, and
+#: 'hmtx' is only transformed along with 'glyf', and only if its left
+#: side bearings match the glyphs' bounding boxes.
+TRANSFORMED_TABLES: Final = ['glyf', 'loca', 'hmtx']
+
+
+def get_output_path(path: Path, flavor: Flavor) -> Path:
+    """Returns the path of a web font.
+
+    Web fonts are laid out like the fonts they come from, except that
+    the directory named after the source font's format is replaced by
+    one named after the flavor. For example, the WOFF2 version of
+    ``fonts/Foo/unhinted/ttf/Foo-Regular.ttf`` is
+    ``fonts/Foo/unhinted/woff2/Foo-Regular.woff2``.
+
+    Args:
+        path: The path of the source font.
+        flavor: The flavor of the web font.
+    """
+    return path.parent.parent / flavor / path.with_suffix(f'.{flavor}').name
+
+
+def compress(path: Path, flavor: Flavor) -> Path:
+    """Compresses a font into a web font.
+
+    Args:
+        path: The path of the source font.
+        flavor: The flavor of the web font.
+
+    Returns:
+        The path of the web font.
+    """
+    output_path = get_output_path(path, flavor)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with fontTools.ttLib.ttFont.TTFont(path, recalcBBoxes=False, recalcTimestamp=False) as tt_font:
+        tt_font.flavor = flavor
+        if flavor == 'woff2':
+            tt_font.flavorData = fontTools.ttLib.woff2.WOFF2FlavorData(transformedTables=TRANSFORMED_TABLES)
+        tt_font.save(str(output_path))
+    return output_path
+
+
+def make_web_fonts(paths: Iterable[Path], flavors: Iterable[Flavor], jobs: int | None) -> None:
+    """Compresses fonts into web fonts in parallel.
+
+    Args:
+        paths: The paths of the source fonts.
+        flavors: The flavors to compress each font into.
+        jobs: The maximum number of processes to use, or ``None`` to use
+            as many as there are processors.
+    """
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        futures = [executor.submit(compress, path, flavor) for path, flavor in itertools.product(paths, flavors)]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compresses fonts into web fonts.')
+    parser.add_argument(
+        '--flavors', choices=FLAVORS, default=DEFAULT_FLAVORS, metavar='FLAVOR', nargs='+',
+        help=f'The flavors to compress each font into, from {{{", ".join(FLAVORS)}}} (default: %(default)s).',
+    )
+    parser.add_argument('--jobs', type=int, help='The maximum number of processes to use (default: the number of processors).')
+    parser.add_argument('fonts', metavar='FONT', nargs='+', type=Path, help='The paths to the fonts to compress.')
+    args = parser.parse_args()
+    assert isinstance(args.jobs, int | None)  # type: ignore[misc]
+    flavors: list[Flavor] = args.flavors
+    fonts: list[Path] = args.fonts
+    make_web_fonts(fonts, flavors, args.jobs)
@@ -396,6 +396,16 @@ class FreezableList[T: Hashable](list[T]):
             raise ValueError('Modifying a frozen list')
         super().sort(key=key, reverse=reverse)
 
+    @override
+    def __reduce__(self) -> tuple[type[Self], tuple[list[T]], dict[str, bool]]:
+        """Returns the information needed to pickle this list.
+
+        The default implementation for `list` subclasses would unpickle
+        the items by appending them to an uninitialized list, which
+        would fail.
+        """
+        return type(self), ([*self],), {'_frozen': self._frozen}
+
 
 class Rule:
     """One or more OpenType Layout rules.
@@ -559,7 +569,7 @@ class Rule:
         self,
         class_asts: Mapping[str, fontTools.feaLib.ast.GlyphClassDefinition],
         named_lookup_asts: Mapping[str, fontTools.feaLib.ast.LookupBlock],
-        canonical_names: MutableMapping[str, MutableSequence[schema.Schema]],
+        canonical_names: schema.GlyphNameRegistry,
         in_contextual_lookup: bool,
         in_multiple_lookup: bool,
         in_reverse_lookup: bool,
@@ -588,8 +598,8 @@ class Rule:
             class_asts: A map to glyph classes from their names.
             named_lookup_asts: A map to named lookup ASTs from their
                 names.
-            canonical_names: A mapping from undisambiguated glyph names
-                to the schemas that share each name.
+            canonical_names: The registry of the glyph names of
+                canonical schemas.
             in_contextual_lookup: Whether this rule is in a contextual
                 lookup.
             in_multiple_lookup: Whether this rule is in a multiple
@@ -914,7 +924,7 @@ class Lookup:
         features_to_scripts: None,
         class_asts: Mapping[str, fontTools.feaLib.ast.GlyphClassDefinition],
         named_lookup_asts: Mapping[str, fontTools.feaLib.ast.LookupBlock],
-        canonical_names: MutableMapping[str, MutableSequence[schema.Schema]],
+        canonical_names: schema.GlyphNameRegistry,
         name: str,
     ) -> fontTools.feaLib.ast.LookupBlock:
         ...
@@ -925,7 +935,7 @@ class Lookup:
         features_to_scripts: Mapping[str, AbstractSet[str]],
         class_asts: Mapping[str, fontTools.feaLib.ast.GlyphClassDefinition],
         named_lookup_asts: Mapping[str, fontTools.feaLib.ast.LookupBlock],
-        canonical_names: MutableMapping[str, MutableSequence[schema.Schema]],
+        canonical_names: schema.GlyphNameRegistry,
         name: int,
     ) -> tuple[fontTools.feaLib.ast.LookupBlock, fontTools.feaLib.ast.FeatureBlock]:
         ...
@@ -935,7 +945,7 @@ class Lookup:
         features_to_scripts: Mapping[str, AbstractSet[str]] | None,
         class_asts: Mapping[str, fontTools.feaLib.ast.GlyphClassDefinition],
         named_lookup_asts: Mapping[str, fontTools.feaLib.ast.LookupBlock],
-        canonical_names: MutableMapping[str, MutableSequence[schema.Schema]],
+        canonical_names: schema.GlyphNameRegistry,
         name: str | int,
     ) -> fontTools.feaLib.ast.LookupBlock | tuple[fontTools.feaLib.ast.LookupBlock, fontTools.feaLib.ast.FeatureBlock]:
         """Converts this lookup to fontTools feaLib ASTs.
@@ -952,8 +962,8 @@ class Lookup:
             class_asts: A map to glyph classes from their names.
             named_lookup_asts: A map to named lookup ASTs from their
                 names.
-            canonical_names: A mapping from undisambiguated glyph names
-                to the schemas that share each name.
+            canonical_names: The registry of the glyph names of
+                canonical schemas.
             name: The name of this lookup, if it is a named lookup, or
                 else an arbitrary number uniquely identifying this
                 lookup among all anonymous lookups.
@@ -1045,6 +1055,140 @@ class Lookup:
             self.append(rule)
 
 
+def _get_merge_kind(lookup: Lookup) -> tuple[bool, bool, bool] | None:
+    """Returns what kind of lookup a lookup is, for `merge_lookups`.
+
+    Args:
+        lookup: A lookup.
+
+    Returns:
+        ``None`` if `lookup` must not be merged with any other lookup.
+        Otherwise, a tuple of whether `lookup` is contextual, whether it
+        is a multiple substitution lookup, and whether it is a ligature
+        substitution lookup. Only lookups of the same kind can be
+        merged.
+    """
+    if lookup.feature is None or lookup.reverse or lookup.has_named_lookup:
+        return None
+    if any(r.lookups is not None or r.x_placements is not None or r.x_advances is not None for r in lookup.rules):
+        return None
+    return (
+        any(r.is_contextual() for r in lookup.rules),
+        any(r.is_multiple() for r in lookup.rules),
+        any(len(r.inputs) != 1 for r in lookup.rules),
+    )
+
+
+def merge_lookups(
+    lookups_with_phases: Sequence[tuple[Lookup, Phase]],
+    classes: MutableMapping[str, FreezableList[schema.Schema]],
+) -> MutableSequence[tuple[Lookup, Phase]]:
+    """Merges adjacent anonymous lookups that cannot interact.
+
+    Each lookup costs the shaper a pass over the glyph buffer, so fewer
+    lookups make shaping faster. Two adjacent lookups are merged into
+    one whose rules are the first lookup’s rules followed by the second
+    lookup’s rules. This is only done when the merged lookup is
+    guaranteed to have the same effect as the two lookups applied in
+    order, which is when:
+
+    * They come from the same phase, because class names are
+      phase-specific.
+    * They are GSUB lookups of the same type with the same feature,
+      languages, flags, and mark filtering set.
+    * Neither is a reverse lookup or uses a named lookup.
+    * Neither reads any glyph, in its inputs or contexts, that the other
+      substitutes or substitutes something with. This means that
+      neither can enable or disable the other’s rules and that no glyph
+      can match rules from both.
+    * If they are contextual or ligature substitution lookups, they
+      have no flags. A flag could make a rule skip a glyph that the
+      other lookup substituted.
+
+    A merged lookup can be merged again with the next lookup under the
+    same conditions.
+
+    Args:
+        lookups_with_phases: A list of 2-tuples of each lookup along
+            with the phase that generated it, in order.
+        classes: The font’s global mapping to classes from their names.
+
+    Returns:
+        A list like `lookups_with_phases` but with some adjacent lookups
+        merged. The lookups in `lookups_with_phases` are not modified.
+    """
+    class_cache: dict[tuple[Phase, str], AbstractSet[schema.Schema]] = {}
+
+    def get_glyphs(phase: Phase, glyphs: Iterable[schema.Schema | str]) -> AbstractSet[schema.Schema]:
+        result: MutableSet[schema.Schema] = set()
+        for glyph in glyphs:
+            if isinstance(glyph, str):
+                if (class_glyphs := class_cache.get((phase, glyph))) is None:
+                    class_glyphs = class_cache[phase, glyph] = {s.canonical_schema for s in PrefixView(phase, classes)[glyph]}
+                result |= class_glyphs
+            else:
+                result.add(glyph.canonical_schema)
+        return result
+
+    merged_lookups_with_phases: MutableSequence[tuple[Lookup, Phase]] = []
+    group: MutableSequence[Lookup] = []
+    group_phase: Phase | None = None
+    group_kind: tuple[bool, bool, bool] | None = None
+    group_reads: MutableSet[schema.Schema] = set()
+    group_writes: MutableSet[schema.Schema] = set()
+
+    def flush_group() -> None:
+        if not group:
+            return
+        assert group_phase is not None
+        first_lookup = group[0]
+        if len(group) == 1:
+            merged_lookup = first_lookup
+        else:
+            assert first_lookup.feature is not None
+            merged_lookup = Lookup(
+                first_lookup.feature,
+                first_lookup.languages,
+                flags=first_lookup.flags & ~fontTools.otlLib.builder.LOOKUP_FLAG_USE_MARK_FILTERING_SET,
+                mark_filtering_set=first_lookup.mark_filtering_set,
+            )
+            for grouped_lookup in group:
+                merged_lookup.extend(grouped_lookup)
+        merged_lookups_with_phases.append((merged_lookup, group_phase))
+        group.clear()
+
+    for lookup, phase in lookups_with_phases:
+        kind = _get_merge_kind(lookup)
+        if kind is None:
+            flush_group()
+            merged_lookups_with_phases.append((lookup, phase))
+            continue
+        reads = get_glyphs(phase, itertools.chain.from_iterable(itertools.chain(r.contexts_in, r.inputs, r.contexts_out or ()) for r in lookup.rules))
+        writes = get_glyphs(phase, itertools.chain.from_iterable(itertools.chain(r.inputs, r.outputs or ()) for r in lookup.rules))
+        if not (
+            group
+            and group_phase is phase
+            and group_kind == kind
+            and group[0].feature == lookup.feature
+            and group[0].languages == lookup.languages
+            and group[0].flags == lookup.flags
+            and group[0].mark_filtering_set == lookup.mark_filtering_set
+            and (lookup.flags == 0 or not (kind[0] or kind[2]))
+            and group_reads.isdisjoint(writes)
+            and group_writes.isdisjoint(reads)
+        ):
+            flush_group()
+            group_phase = phase
+            group_kind = kind
+            group_reads = set()
+            group_writes = set()
+        group.append(lookup)
+        group_reads |= reads
+        group_writes |= writes
+    flush_group()
+    return merged_lookups_with_phases
+
+
 if TYPE_CHECKING:
     type AddRule = Callable[[Lookup, Rule], None]
 
@@ -1243,9 +1387,9 @@ if TYPE_CHECKING:
     type Phase = Callable[
         [
             Arg(Builder, 'builder'),
-            Arg(OrderedSet[schema.Schema], 'original_schemas'),
-            Arg(OrderedSet[schema.Schema], 'schemas'),
-            Arg(OrderedSet[schema.Schema], 'new_schemas'),
+            Arg(schema.SchemaSet, 'original_schemas'),
+            Arg(schema.SchemaSet, 'schemas'),
+            Arg(schema.SchemaSet, 'new_schemas'),
             Arg(PrefixView[FreezableList[schema.Schema]], 'classes'),
             Arg(PrefixView[Lookup], 'named_lookups'),
             Arg(AddRule, 'add_rule'),
@@ -1254,11 +1398,103 @@ if TYPE_CHECKING:
     ]
 
 
+#: A mapping from phases to the features of the lookups they return.
+_PHASE_FEATURES: Final[MutableMapping[Phase, AbstractSet[str]]] = {}
+
+
+def uses_features(*features: str) -> Callable[[Phase], Phase]:
+    """Returns a decorator to declare the features a phase uses.
+
+    Every phase must declare the features of the lookups it returns.
+    This lets `run_phases` skip phases that cannot contribute to an
+    unjoined font without running them.
+
+    A skipped phase has no side effects at all, so a phase whose
+    features are not in `SUBSET_FEATURES` must not add schemas to
+    global classes (``'global..*'``) that a later phase with features
+    in `SUBSET_FEATURES` uses. `check-skip-phases` in the makefile
+    checks that skipping phases does not change how an unjoined font
+    shapes.
+
+    Args:
+        features: The features of the lookups the phase returns. They
+            must be either all in `SUBSET_FEATURES` or all not in it. A
+            phase that returns no lookups declares no features.
+
+    Returns:
+        A decorator that registers the phase’s features and returns the
+        phase unchanged.
+    """
+    feature_set = frozenset(features)
+    assert feature_set <= SUBSET_FEATURES or feature_set.isdisjoint(SUBSET_FEATURES), f'Mix of subset and non-subset features: {features}'
+
+    def register(phase: Phase) -> Phase:
+        _PHASE_FEATURES[phase] = feature_set
+        return phase
+
+    return register
+
+
+class PhaseProgress:
+    """The state of `run_phases` between two phases.
+
+    This is enough to resume `run_phases` after the last phase that was
+    run.
+
+    Attributes:
+        phase_count: The number of phases that have been run.
+        previous_feature: The feature of the last lookup generated.
+        all_schemas: All the schemas input to or output from any phase.
+        all_input_schemas: The output schemas of the last phase.
+        all_lookups_with_phases: A list of 2-tuples of each lookup along
+            with the phase that generated it.
+        all_classes: The font’s global mapping to classes from their
+            names.
+        all_named_lookups_with_phases: A mapping from named lookups’
+            names to 2-tuples of named lookups and their generating
+            phases.
+    """
+
+    def __init__(
+        self,
+        phase_count: int,
+        previous_feature: str | None,
+        all_schemas: OrderedSet[schema.Schema],
+        all_input_schemas: schema.SchemaSet,
+        all_lookups_with_phases: MutableSequence[tuple[Lookup, Phase]],
+        all_classes: collections.defaultdict[str, FreezableList[schema.Schema]],
+        all_named_lookups_with_phases: dict[str, tuple[Lookup, Phase]],
+    ) -> None:
+        """Initializes this `PhaseProgress`.
+
+        Args:
+            phase_count: The ``phase_count`` attribute.
+            previous_feature: The ``previous_feature`` attribute.
+            all_schemas: The ``all_schemas`` attribute.
+            all_input_schemas: The ``all_input_schemas`` attribute.
+            all_lookups_with_phases: The ``all_lookups_with_phases``
+                attribute.
+            all_classes: The ``all_classes`` attribute.
+            all_named_lookups_with_phases: The
+                ``all_named_lookups_with_phases`` attribute.
+        """
+        self.phase_count: Final = phase_count
+        self.previous_feature: Final = previous_feature
+        self.all_schemas: Final = all_schemas
+        self.all_input_schemas: Final = all_input_schemas
+        self.all_lookups_with_phases: Final = all_lookups_with_phases
+        self.all_classes: Final = all_classes
+        self.all_named_lookups_with_phases: Final = all_named_lookups_with_phases
+
+
 def run_phases(
     builder: Builder,
     all_input_schemas: Iterable[schema.Schema],
-    phases: Iterable[Phase],
+    phases: Sequence[Phase],
     all_classes: collections.defaultdict[str, FreezableList[schema.Schema]] | None = None,
+    *,
+    progress: PhaseProgress | None = None,
+    on_phase_end: Callable[[Phase, PhaseProgress], None] | None = None,
 ) -> tuple[
     OrderedSet[schema.Schema],
     Iterable[schema.Schema],
@@ -1268,6 +1504,12 @@ def run_phases(
 ]:
     """Runs a sequence of phases.
 
+    When building an unjoined font, a phase is skipped if the features
+    it declares with `uses_features` are not in `SUBSET_FEATURES`,
+    since its lookups would be discarded anyway, unless the builder’s
+    ``skip_phases`` attribute is false. The phase index still advances
+    so that schemas’ phase indices are the same as in a joined font.
+
     Args:
         builder: The source of everything.
         all_input_schemas: The input schemas for the first iteration of
@@ -1275,6 +1517,12 @@ def run_phases(
         phases: The phases to run.
         all_classes: The font’s global mapping to classes from their
             names. If ``None``, this method starts with a new empty mapping.
+        progress: The state to resume from, or ``None`` to start from
+            the first phase. If it is not ``None``, `all_input_schemas`
+            and `all_classes` are ignored, and ``schema.CURRENT_PHASE_INDEX``
+            must already be the index of the last phase that was run.
+        on_phase_end: A function to call after each phase with the
+            phase and the state after it.
 
     Returns:
         A tuple of five elements.
@@ -1288,25 +1536,43 @@ def run_phases(
         5. A mapping from named lookups’ names to 2-tuples of named
            lookups and their generating phases.
     """
-    previous_feature: str | None = None
-    all_schemas = OrderedSet(all_input_schemas)
-    all_input_schemas = OrderedSet(all_input_schemas)
-    all_lookups_with_phases: MutableSequence[tuple[Lookup, Phase]] = []
-    if all_classes is None:
-        all_classes = collections.defaultdict(FreezableList)
-    all_named_lookups_with_phases: dict[str, tuple[Lookup, Phase]] = {}
-    for phase_index, phase in enumerate(phases, start=schema.CURRENT_PHASE_INDEX + 1):
+    previous_feature: str | None
+    all_lookups_with_phases: MutableSequence[tuple[Lookup, Phase]]
+    all_named_lookups_with_phases: dict[str, tuple[Lookup, Phase]]
+    if progress is None:
+        phase_count = 0
+        previous_feature = None
+        all_schemas = OrderedSet(all_input_schemas)
+        all_input_schemas = schema.SchemaSet(all_input_schemas)
+        all_lookups_with_phases = []
+        if all_classes is None:
+            all_classes = collections.defaultdict(FreezableList)
+        all_named_lookups_with_phases = {}
+    else:
+        phase_count = progress.phase_count
+        previous_feature = progress.previous_feature
+        all_schemas = progress.all_schemas
+        all_input_schemas = progress.all_input_schemas
+        all_lookups_with_phases = progress.all_lookups_with_phases
+        all_classes = progress.all_classes
+        all_named_lookups_with_phases = progress.all_named_lookups_with_phases
+    for phase_index, phase in enumerate(phases[phase_count:], start=schema.CURRENT_PHASE_INDEX + 1):
         schema.CURRENT_PHASE_INDEX = phase_index
-        all_output_schemas: OrderedSet[schema.Schema] = OrderedSet()
+        phase_count += 1
+        all_output_schemas = schema.SchemaSet()
         autochthonous_schemas: OrderedSet[schema.Schema] = OrderedSet()
-        original_input_schemas = OrderedSet(all_input_schemas)
-        new_input_schemas = OrderedSet(all_input_schemas)
+        original_input_schemas = schema.SchemaSet(all_input_schemas)
+        new_input_schemas = schema.SchemaSet(all_input_schemas)
         output_schemas = OrderedSet(all_input_schemas)
         local_output_schemas: MutableSet[schema.Schema] = set()
         classes = PrefixView(phase, all_classes)
-        named_lookups: PrefixView[Lookup] = PrefixView(phase, {})
+        phase_named_lookups: dict[str, Lookup] = {}
+        named_lookups = PrefixView(phase, phase_named_lookups)
         lookups: Sequence[Lookup] | None = None
-        while new_input_schemas:
+        assert phase in _PHASE_FEATURES, f'Phase {phase.__name__} does not declare its features'
+        phase_features = _PHASE_FEATURES[phase]
+        skip = builder.unjoined and builder.skip_phases and bool(phase_features) and phase_features.isdisjoint(SUBSET_FEATURES)
+        while new_input_schemas and not skip:
             output_lookups = phase(
                 # TODO: `builder` is only used to check which phase generated a schema,
                 # and only in a few phases. Refactor them so this doesn’t need to pass
@@ -1326,11 +1592,8 @@ def run_phases(
                     named_lookups,
                 ),
             )
-            if builder.unjoined and any(lookup.feature not in SUBSET_FEATURES for lookup in output_lookups):
-                assert all(lookup.feature not in SUBSET_FEATURES for lookup in output_lookups), (
-                    f'Mix of subset and non-subset features: {[lookup.feature for lookup in output_lookups]}')
-                output_lookups = []
-                break
+            assert all(lookup.feature in phase_features for lookup in output_lookups), (
+                f'Phase {phase.__name__} returned a lookup with an undeclared feature: {[lookup.feature for lookup in output_lookups]}')
             if lookups is None:
                 lookups = output_lookups
                 for lookup in lookups:
@@ -1362,7 +1625,7 @@ def run_phases(
             features: set[str] = {lookup.feature for lookup in lookups}  # type: ignore[misc]
             for output_schema in output_schemas:
                 all_output_schemas.add(output_schema)
-            new_input_schemas = OrderedSet()
+            new_input_schemas = schema.SchemaSet()
             if might_have_feedback:
                 for output_schema in output_schemas:
                     if output_schema not in all_input_schemas:
@@ -1374,12 +1637,21 @@ def run_phases(
                 for output_schema in output_schemas:
                     if output_schema not in all_input_schemas:
                         output_schema.features = features
-        if lookups is None:
-            continue
-        all_input_schemas = all_output_schemas
-        all_schemas |= all_input_schemas
-        all_lookups_with_phases.extend((lookup, phase) for lookup in lookups)
-        all_named_lookups_with_phases |= ((name, (lookup, phase)) for name, lookup in named_lookups.items())
+        if lookups is not None:
+            all_input_schemas = all_output_schemas
+            all_schemas |= all_input_schemas
+            all_lookups_with_phases.extend((lookup, phase) for lookup in lookups)
+            all_named_lookups_with_phases |= ((name, (lookup, phase)) for name, lookup in phase_named_lookups.items())
+        if on_phase_end is not None:
+            on_phase_end(phase, PhaseProgress(
+                phase_count,
+                previous_feature,
+                all_schemas,
+                all_input_schemas,
+                all_lookups_with_phases,
+                all_classes,
+                all_named_lookups_with_phases,
+            ))
     return (
         all_schemas,
         all_input_schemas,
@@ -25,6 +25,7 @@ import fontTools.otlLib.builder
 
 from . import Lookup
 from . import Rule
+from . import uses_features
 import anchors
 import phases
 from schema import Ignorability
@@ -80,10 +81,12 @@ if TYPE_CHECKING:
     from . import AddRule
     from . import FreezableList
     from duployan import Builder
+    from schema import SchemaSet
     from shapes import Shape
     from utils import PrefixView
 
 
+@uses_features('abvm')
 def dont_ignore_default_ignorables(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -102,17 +105,18 @@ def dont_ignore_default_ignorables(
     return [lookup_1, lookup_2]
 
 
+@uses_features('rlig')
 def reversed_circle_kludge(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
     add_rule: AddRule,
 ) -> Sequence[Lookup]:
     lookup = Lookup('rlig')
-    cgj = next((s for s in schemas if s.cmap == 0x034F), None)
+    cgj = next(iter(schemas.with_cmap(0x034F)), None)
     if cgj is None:
         return []
     for schema in new_schemas:
@@ -136,10 +140,11 @@ def reversed_circle_kludge(
     return [lookup]
 
 
+@uses_features('rlig')
 def validate_shading(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -151,7 +156,7 @@ def validate_shading(
         reverse=True,
     )
     if len(new_schemas) == len(schemas):
-        invalid_dtls = next(s for s in schemas if isinstance(s.path, InvalidDTLS))
+        invalid_dtls = next(iter(schemas.with_path_type(InvalidDTLS)))
         valid_dtls = invalid_dtls.clone(cmap=None, path=ValidDTLS())
         for schema in new_schemas:
             if schema.anchor:
@@ -163,6 +168,7 @@ def validate_shading(
     return [lookup]
 
 
+@uses_features('rlig')
 def validate_double_marks(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -193,6 +199,7 @@ def validate_double_marks(
     return [lookup]
 
 
+@uses_features('abvm')
 def decompose(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -209,10 +216,11 @@ def decompose(
     return [lookup]
 
 
+@uses_features('rclt')
 def expand_secants(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -224,7 +232,7 @@ def expand_secants(
     )
     if len(original_schemas) != len(schemas):
         return [lookup]
-    continuing_overlap = next(s for s in schemas if isinstance(s.path, InvalidOverlap) and s.path.continuing)
+    continuing_overlap = next(s for s in schemas.with_path_type(InvalidOverlap) if isinstance(s.path, InvalidOverlap) and s.path.continuing)
     named_lookups['non_initial_secant'] = Lookup()
     for schema in new_schemas:
         if schema.is_secant:
@@ -250,6 +258,7 @@ def expand_secants(
     return [lookup]
 
 
+@uses_features('rclt')
 def validate_overlap_controls(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -309,6 +318,7 @@ def validate_overlap_controls(
     return [lookup]
 
 
+@uses_features('blwm')
 def add_parent_edges(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -371,6 +381,7 @@ def _make_trees[E, N](
     return trees
 
 
+@uses_features('rclt')
 def invalidate_overlap_controls_for_restricted_classes(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -429,6 +440,7 @@ def invalidate_overlap_controls_for_restricted_classes(
     return [lookup]
 
 
+@uses_features('rclt')
 def invalidate_overlap_controls(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -505,10 +517,11 @@ def invalidate_overlap_controls(
     return [lookup]
 
 
+@uses_features('abvs')
 def add_secant_guidelines(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -517,12 +530,12 @@ def add_secant_guidelines(
     lookup = Lookup('abvs')
     if len(original_schemas) != len(schemas):
         return [lookup]
-    invalid_continuing_overlap = next(s for s in schemas if isinstance(s.path, InvalidOverlap) and s.path.continuing)
-    valid_continuing_overlap = next((s for s in schemas if isinstance(s.path, ContinuingOverlap) and s.cps), None)
+    invalid_continuing_overlap = next(s for s in schemas.with_path_type(InvalidOverlap) if isinstance(s.path, InvalidOverlap) and s.path.continuing)
+    valid_continuing_overlap = next((s for s in schemas.with_path_type(ContinuingOverlap) if s.cps), None)
     if valid_continuing_overlap is None:
         return []
-    dtls = next(s for s in schemas if isinstance(s.path, ValidDTLS))
-    initial_secant_marker = next(s for s in schemas if isinstance(s.path, InitialSecantMarker))
+    dtls = next(iter(schemas.with_path_type(ValidDTLS)))
+    initial_secant_marker = next(iter(schemas.with_path_type(InitialSecantMarker)))
     named_lookups['prepend_zwnj'] = Lookup()
     for schema in new_schemas:
         if (isinstance(schema.path, Line)
@@ -547,10 +560,11 @@ def add_secant_guidelines(
     return [lookup]
 
 
+@uses_features('blwm')
 def add_placeholders_for_missing_children(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -560,7 +574,7 @@ def add_placeholders_for_missing_children(
         'blwm',
         mark_filtering_set='valid_final_overlap',
     )
-    root_parent_edge = next((s for s in schemas if isinstance(s.path, ParentEdge)), None)
+    root_parent_edge = next(iter(schemas.with_path_type(ParentEdge)), None)
     if root_parent_edge is None:
         return []
     if len(original_schemas) != len(schemas):
@@ -598,10 +612,11 @@ def add_placeholders_for_missing_children(
     return [lookup]
 
 
+@uses_features('blwm')
 def categorize_edges(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -612,7 +627,7 @@ def categorize_edges(
         flags=fontTools.otlLib.builder.LOOKUP_FLAG_IGNORE_LIGATURES,
         mark_filtering_set='all',
     )
-    old_groups = [s.path.group() for s in classes['all']]
+    old_groups = {s.path.group() for s in classes['all']}
     child_edges: MutableMapping[Sequence[tuple[int, int]], Schema] = {}
     parent_edges: MutableMapping[Sequence[tuple[int, int]], Schema] = {}
 
@@ -634,17 +649,18 @@ def categorize_edges(
             parent_edges[lineage] = parent_edge
         return parent_edge
 
-    for schema in schemas:
-        if isinstance(schema.path, ChildEdge):
-            child_edges[tuple(schema.path.lineage)] = schema
-            if (len(schema.path.lineage) == 1
-                and schema.path.lineage[0][0] == 1
-            ):
-                default_child_edge = schema
-        elif isinstance(schema.path, ParentEdge):
-            parent_edges[tuple(schema.path.lineage)] = schema
-            if not schema.path.lineage:
-                default_parent_edge = schema
+    for schema in schemas.with_path_type(ChildEdge):
+        assert isinstance(schema.path, ChildEdge)
+        child_edges[tuple(schema.path.lineage)] = schema
+        if (len(schema.path.lineage) == 1
+            and schema.path.lineage[0][0] == 1
+        ):
+            default_child_edge = schema
+    for schema in schemas.with_path_type(ParentEdge):
+        assert isinstance(schema.path, ParentEdge)
+        parent_edges[tuple(schema.path.lineage)] = schema
+        if not schema.path.lineage:
+            default_parent_edge = schema
     for schema in new_schemas:
         if isinstance(schema.path, (ChildEdge, ParentEdge)):
             classes['all'].append(schema)
@@ -685,6 +701,7 @@ def categorize_edges(
     return [lookup]
 
 
+@uses_features('rclt')
 def promote_final_letter_overlap_to_continuing_overlap(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -748,6 +765,7 @@ def promote_final_letter_overlap_to_continuing_overlap(
     return [lookup]
 
 
+@uses_features('rclt')
 def reposition_chinook_jargon_overlap_points(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -840,6 +858,7 @@ def reposition_chinook_jargon_overlap_points(
     return [lookup]
 
 
+@uses_features('blwm')
 def make_mark_variants_of_children(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -868,10 +887,11 @@ def make_mark_variants_of_children(
     return [lookup]
 
 
+@uses_features('rclt')
 def interrupt_overlong_primary_curve_sequences(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -881,7 +901,7 @@ def interrupt_overlong_primary_curve_sequences(
         'rclt',
         flags=fontTools.otlLib.builder.LOOKUP_FLAG_IGNORE_MARKS,
     )
-    dotted_circle = next(s for s in schemas if s.cmap == 0x25CC)
+    dotted_circle = next(iter(schemas.with_cmap(0x25CC)))
     deltas_by_size: collections.defaultdict[float, OrderedSet[float]] = collections.defaultdict(OrderedSet)
     new_deltas_by_size = collections.defaultdict(set)
     for schema in schemas:
@@ -994,6 +1014,7 @@ def interrupt_overlong_primary_curve_sequences(
     return [lookup]
 
 
+@uses_features('rclt')
 def reposition_stenographic_period(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1019,6 +1040,7 @@ def reposition_stenographic_period(
     return [lookup]
 
 
+@uses_features('rclt')
 def disjoin_grammalogues(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1075,6 +1097,7 @@ def disjoin_grammalogues(
     return [lookup]
 
 
+@uses_features('rclt')
 def join_with_next_step(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1119,6 +1142,7 @@ def join_with_next_step(
     return [lookup]
 
 
+@uses_features('rclt')
 def separate_subantiparallel_lines(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1213,6 +1237,7 @@ def separate_subantiparallel_lines(
     return [lookup]
 
 
+@uses_features('rclt')
 def prepare_for_secondary_diphthong_ligature(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1244,6 +1269,7 @@ def prepare_for_secondary_diphthong_ligature(
     return [lookup]
 
 
+@uses_features('rclt')
 def replace_medial_romanian_u(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1270,6 +1296,7 @@ def replace_medial_romanian_u(
     return [lookup]
 
 
+@uses_features('rclt')
 def join_with_previous(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1317,6 +1344,7 @@ def join_with_previous(
     return [lookup_1, lookup_2]
 
 
+@uses_features('rclt')
 def unignore_last_orienting_glyph_in_initial_sequence(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1359,6 +1387,7 @@ def unignore_last_orienting_glyph_in_initial_sequence(
     return [lookup]
 
 
+@uses_features('rclt')
 def ignore_first_orienting_glyph_in_initial_sequence(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1415,6 +1444,7 @@ def ignore_first_orienting_glyph_in_initial_sequence(
     return [lookup]
 
 
+@uses_features('rclt')
 def tag_main_glyph_in_orienting_sequence(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1446,6 +1476,7 @@ def tag_main_glyph_in_orienting_sequence(
     return [lookup]
 
 
+@uses_features('rclt')
 def join_with_next(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1520,6 +1551,7 @@ def join_with_next(
     return [pre_lookup, lookup, post_lookup]
 
 
+@uses_features('rclt')
 def join_circle_with_adjacent_nonorienting_glyph(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1558,6 +1590,7 @@ def join_circle_with_adjacent_nonorienting_glyph(
     return [lookup]
 
 
+@uses_features('rclt')
 def ligate_diphthongs(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1621,6 +1654,7 @@ def ligate_diphthongs(
     return [lookup]
 
 
+@uses_features('rclt')
 def dont_exit_early_in_orienting_sequence(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1651,6 +1685,7 @@ def dont_exit_early_in_orienting_sequence(
     return [lookup]
 
 
+@uses_features('rclt')
 def unignore_noninitial_orienting_sequences(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1704,6 +1739,7 @@ def unignore_noninitial_orienting_sequences(
     return [lookup]
 
 
+@uses_features('rclt')
 def unignore_initial_orienting_sequences(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1758,6 +1794,7 @@ def unignore_initial_orienting_sequences(
     return [lookup]
 
 
+@uses_features('rlig')
 def join_double_marks(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1788,6 +1825,7 @@ def join_double_marks(
     return [lookup]
 
 
+@uses_features('rlig')
 def rotate_diacritics(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1826,6 +1864,7 @@ def rotate_diacritics(
     return [lookup]
 
 
+@uses_features('rclt')
 def avoid_abrupt_inflections(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1918,6 +1957,7 @@ def avoid_abrupt_inflections(
     return [lookup]
 
 
+@uses_features('rclt')
 def avoid_cochiral_overlaps(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -2005,10 +2045,11 @@ def avoid_cochiral_overlaps(
     return [lookup]
 
 
+@uses_features('rlig')
 def shade(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -2018,7 +2059,7 @@ def shade(
         'rlig',
         mark_filtering_set='independent_mark',
     )
-    dtls = next(s for s in schemas if isinstance(s.path, ValidDTLS))
+    dtls = next(iter(schemas.with_path_type(ValidDTLS)))
     classes['independent_mark'].append(dtls)
     for schema in new_schemas:
         if schema.anchor and not (isinstance(schema.path, Line) and schema.path.secant):
@@ -2037,6 +2078,7 @@ def shade(
     return [lookup]
 
 
+@uses_features('dnom', 'frac')
 def create_diagonal_fractions(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -2065,6 +2107,7 @@ def create_diagonal_fractions(
     return [lookup_dnom, lookup_frac]
 
 
+@uses_features('sups', 'subs')
 def create_superscripts_and_subscripts(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -2094,6 +2137,7 @@ def create_superscripts_and_subscripts(
     return [lookup_sups, lookup_subs]
 
 
+@uses_features('rlig')
 def make_widthless_variants_of_marks(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -2124,6 +2168,7 @@ def make_widthless_variants_of_marks(
     return [lookup]
 
 
+@uses_features()
 def classify_marks_for_trees(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -26,6 +26,7 @@ import fontTools.otlLib.builder
 
 from . import Lookup
 from . import Rule
+from . import uses_features
 import anchors
 import phases
 from schema import Schema
@@ -80,10 +81,12 @@ if TYPE_CHECKING:
     from . import AddRule
     from . import FreezableList
     from duployan import Builder
+    from schema import SchemaSet
     from shapes import Digit
     from utils import PrefixView
 
 
+@uses_features('dist')
 def add_shims_for_pseudo_cursive(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -232,6 +235,7 @@ def add_shims_for_pseudo_cursive(
     return [marker_lookup, deduplicate_marker_lookup, space_lookup]
 
 
+@uses_features('rlig', 'abvm')
 def shrink_wrap_enclosing_circle(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -302,6 +306,7 @@ def shrink_wrap_enclosing_circle(
     return [lookup, dist_lookup]
 
 
+@uses_features('rclt', 'afrc', 'dist')
 def create_vertical_fractions(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -434,10 +439,11 @@ def create_vertical_fractions(
     return [lookup_rom, lookup_dflt, dist_lookup]
 
 
+@uses_features('dist')
 def add_width_markers(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -458,7 +464,7 @@ def add_width_markers(
         LeftBoundDigit: left_bound_markers,
         RightBoundDigit: right_bound_markers,
     }
-    start = next((s for s in schemas if isinstance(s.path, Start)), None)
+    start = next(iter(schemas.with_path_type(Start)), None)
     if start is None:
         start = Schema(None, Start(), 0)
         classes[phases.CONTINUING_OVERLAP_OR_HUB_CLASS].append(start)
@@ -466,7 +472,7 @@ def add_width_markers(
     for hub_priority in HubPriority:
         if hub_priority == HubPriority.NEVER:
             continue
-        hub = next((s for s in schemas if isinstance(s.path, Hub) and s.path.priority == hub_priority), None)
+        hub = next((s for s in schemas.with_path_type(Hub) if isinstance(s.path, Hub) and s.path.priority == hub_priority), None)
         if hub is None:
             hub = Schema(None, Hub(hub_priority), 0, side_bearing=0)
             classes[phases.HUB_CLASS].append(hub)
@@ -745,17 +751,18 @@ def add_width_markers(
     ]
 
 
+@uses_features('dist')
 def add_end_markers_for_marks(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
     schemas: OrderedSet[Schema],
-    new_schemas: OrderedSet[Schema],
+    new_schemas: SchemaSet,
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
     add_rule: AddRule,
 ) -> Sequence[Lookup]:
     lookup = Lookup('dist')
-    end = next((s for s in new_schemas if isinstance(s.path, End)), None)
+    end = next(iter(new_schemas.with_path_type(End)), None)
     if end is None:
         return []
     for schema in new_schemas:
@@ -769,11 +776,12 @@ def add_end_markers_for_marks(
     return [lookup]
 
 
+@uses_features('dist')
 def remove_false_end_markers(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
     schemas: OrderedSet[Schema],
-    new_schemas: OrderedSet[Schema],
+    new_schemas: SchemaSet,
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
     add_rule: AddRule,
@@ -785,14 +793,15 @@ def remove_false_end_markers(
     )
     if len(original_schemas) != len(schemas):
         return [lookup]
-    dummy = next((s for s in new_schemas if isinstance(s.path, Dummy)), None)
-    end = next((s for s in new_schemas if isinstance(s.path, End)), None)
+    dummy = next(iter(new_schemas.with_path_type(Dummy)), None)
+    end = next(iter(new_schemas.with_path_type(End)), None)
     if dummy is None or end is None:
         return []
     add_rule(lookup, Rule([], [end], [end], [dummy]))
     return [lookup]
 
 
+@uses_features('dist')
 def clear_entry_width_markers(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -843,6 +852,7 @@ def clear_entry_width_markers(
     return [lookup]
 
 
+@uses_features('dist')
 def sum_width_markers(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1084,6 +1094,7 @@ def sum_width_markers(
     return [lookup]
 
 
+@uses_features('dist')
 def calculate_bound_extrema(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1157,11 +1168,12 @@ def calculate_bound_extrema(
     return [left_lookup, right_lookup]
 
 
+@uses_features('dist')
 def remove_false_start_markers(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
     schemas: OrderedSet[Schema],
-    new_schemas: OrderedSet[Schema],
+    new_schemas: SchemaSet,
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
     add_rule: AddRule,
@@ -1172,15 +1184,16 @@ def remove_false_start_markers(
         mark_filtering_set='all',
         reverse=True,
     )
-    dummy = next((s for s in new_schemas if isinstance(s.path, Dummy)), None)
+    dummy = next(iter(new_schemas.with_path_type(Dummy)), None)
     if dummy is None:
         return []
-    start = next(s for s in new_schemas if isinstance(s.path, Start))
+    start = next(iter(new_schemas.with_path_type(Start)))
     classes['all'].append(start)
     add_rule(lookup, Rule([start], [start], [], [dummy]))
     return [lookup]
 
 
+@uses_features('dist')
 def mark_hubs_after_initial_secants(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1216,6 +1229,7 @@ def mark_hubs_after_initial_secants(
     return [lookup]
 
 
+@uses_features('dist')
 def find_real_hub(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1268,17 +1282,18 @@ def find_real_hub(
     return [lookup, remove_steps_lookup]
 
 
+@uses_features('dist')
 def expand_start_markers(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
     schemas: OrderedSet[Schema],
-    new_schemas: OrderedSet[Schema],
+    new_schemas: SchemaSet,
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
     add_rule: AddRule,
 ) -> Sequence[Lookup]:
     lookup = Lookup('dist')
-    start = next((s for s in new_schemas if isinstance(s.path, Start)), None)
+    start = next(iter(new_schemas.with_path_type(Start)), None)
     if start is None:
         return []
     add_rule(lookup, Rule([start], [
@@ -1288,10 +1303,11 @@ def expand_start_markers(
     return [lookup]
 
 
+@uses_features('dist')
 def mark_maximum_bounds(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
-    schemas: OrderedSet[Schema],
+    schemas: SchemaSet,
     new_schemas: OrderedSet[Schema],
     classes: PrefixView[FreezableList[Schema]],
     named_lookups: PrefixView[Lookup],
@@ -1315,7 +1331,7 @@ def mark_maximum_bounds(
     new_left_bounds = []
     new_right_bounds = []
     new_anchor_widths = []
-    end = next((s for s in schemas if isinstance(s.path, End)), None)
+    end = next(iter(schemas.with_path_type(End)), None)
     if end is None:
         return []
     for schema in new_schemas:
@@ -1347,6 +1363,7 @@ def mark_maximum_bounds(
     return [left_lookup, right_lookup, anchor_lookup]
 
 
+@uses_features('dist')
 def copy_maximum_left_bound_to_start(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
@@ -1394,6 +1411,7 @@ def copy_maximum_left_bound_to_start(
     return [lookup]
 
 
+@uses_features('dist')
 def dist(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
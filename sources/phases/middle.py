@@ -19,6 +19,7 @@ from typing import TYPE_CHECKING
 
 from . import Lookup
 from . import Rule
+from . import uses_features
 from schema import Schema
 import sifting
 
@@ -33,6 +34,7 @@ if TYPE_CHECKING:
     from utils import PrefixView
 
 
+@uses_features('rlig')
 def merge_lookalikes(
     builder: Builder,
     original_schemas: OrderedSet[Schema],
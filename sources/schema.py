@@ -59,6 +59,7 @@ from utils import DEFAULT_SIDE_BEARING
 from utils import GlyphClass
 from utils import MAX_TREE_WIDTH
 from utils import NO_CONTEXT
+from utils import OrderedSet
 from utils import SUBSET_FEATURES
 from utils import Type
 from utils import WidthEffect
@@ -71,8 +72,6 @@ if TYPE_CHECKING:
     from collections.abc import Hashable
     from collections.abc import Iterable
     from collections.abc import Mapping
-    from collections.abc import MutableMapping
-    from collections.abc import MutableSequence
     from collections.abc import Sequence
 
     from _typeshed import SupportsRichComparison
@@ -583,6 +582,14 @@ class Schema:
                 [repr(m) for m in self.marks]
             }>'
 
+    @override
+    def __getstate__(self) -> dict[str, object]:
+        """Returns the state of this schema for pickling.
+
+        FontForge glyphs cannot be pickled, so `glyph` is omitted.
+        """
+        return {**self.__dict__, 'glyph': None}  # type: ignore[misc]
+
     @functools.cached_property
     def diacritic_angles(self) -> Mapping[str, float]:
         """The path’s diacritic angles.
@@ -828,6 +835,8 @@ class Schema:
         general, it prioritizes making the ``hb-shape`` debugging
         experience smoother. The one guarantee (besides AGL) is that
         `_RESERVED_GLYPH_NAME_PATTERN` does not match anywhere in it.
+        Both guarantees are checked in bulk by
+        `GlyphNameRegistry.check`.
         """
         cps = self.cps
         if cps:
@@ -879,20 +888,9 @@ class Schema:
                 name = f'_{name}'
         if (self.features is not None and SUBSET_FEATURES.isdisjoint(self.features)) != (name.startswith('_') or name.count('.') > 1):
             name = self._FIRST_COMPONENT_PATTERN.sub(r'\g<0>_', name)
-        if __debug__:
-            agl_string = fontTools.agl.toUnicode(name)
-            agl_cps = tuple(map(ord, agl_string))
-            assert cps == agl_cps, f'''The glyph name "{
-                    name
-                }" corresponds to <{
-                    ', '.join(f'U+{cp:04X}' for cp in agl_cps)
-                }> but its glyph corresponds to <{
-                    ', '.join(f'U+{cp:04X}' for cp in cps)
-                }>'''
-        assert not self._RESERVED_GLYPH_NAME_PATTERN.search(name), f'The glyph name "{name}" misleadingly appears to have a disambiguatory suffix'
         return name
 
-    def glyph_name(self, canonical_names: MutableMapping[str, MutableSequence[Schema]]) -> str:
+    def glyph_name(self, canonical_names: GlyphNameRegistry) -> str:
         """Returns this schema’s disambiguated glyph name.
 
         Every non-canonical schema has same glyph name as its canonical
@@ -900,32 +898,16 @@ class Schema:
         therefore not be called till canonical schemas have been
         assigned.
 
-        A glyph’s name may include a suffix to disambiguate it from
-        other glyphs that happen to otherwise share the same name. In a
-        group of homonymous glyphs, the first gets the plain name and
-        the rest get numeric suffixes, starting at 1 and incrementing by
-        1 for each subsequent glyph. The suffix is ``"._"`` followed by
-        the number in uppercase hexadecimal.
-
         Args:
-            canonical_names: A mapping from undisambiguated glyph names
-                to the schemas that share each name. The return value is
-                cached in this mapping.
+            canonical_names: The registry of the glyph names of
+                canonical schemas. The return value is cached both in
+                this schema and in the registry.
         """
         if self._glyph_name is None:
             if self is not (canonical := self._canonical_schema):
                 self._glyph_name = canonical.glyph_name(canonical_names)
             else:
-                name = str(self)
-                while len(name) > self._MAX_GLYPH_NAME_LENGTH:
-                    name = name.rsplit('.', 1)[0]
-                if name in canonical_names:
-                    if self not in canonical_names[name]:
-                        canonical_names[name].append(self)
-                        name += f'._{len(canonical_names[name]) - 1:X}'
-                else:
-                    canonical_names[name] = [self]
-                self._glyph_name = name
+                self._glyph_name = canonical_names.register(self)
         return self._glyph_name
 
     def can_be_child(self) -> bool:
@@ -1129,3 +1111,188 @@ class Schema:
         if self.glyph_class != GlyphClass.JOINER:
             return HubPriority.NEVER
         return self.path.hub_priority(self.size)
+
+
+def _get_path_type(schema: Schema) -> type[Shape]:
+    return type(schema.path)
+
+
+def _get_cmap(schema: Schema) -> int | None:
+    return schema.cmap
+
+
+class SchemaSet(OrderedSet[Schema]):
+    """An ordered set of schemas with indices for fast lookup.
+
+    Each index maps a property of a schema to the schemas in this set
+    with that property. An index is built the first time it is used and
+    then kept up to date by `add` and `remove`. Other ways of modifying
+    this set do not update the indices, so they must not be used.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[Schema] = (),
+        /,
+    ) -> None:
+        """Initializes this `SchemaSet`.
+
+        Args:
+            iterable: An optional iterable whose items are to be added
+                to this set in the iterable’s natural iteration order.
+        """
+        self._indices: Final[dict[Callable[[Schema], Hashable], dict[Hashable, OrderedSet[Schema]]]] = {}
+        super().__init__(iterable)
+
+    @override
+    def add(self, item: Schema, /) -> None:
+        if item not in self:
+            super().add(item)
+            for get_key, index in self._indices.items():
+                index.setdefault(get_key(item), OrderedSet()).add(item)
+
+    @override
+    def remove(self, item: Schema, /) -> None:
+        if item in self:
+            super().remove(item)
+            for get_key, index in self._indices.items():
+                index[get_key(item)].remove(item)
+
+    def _get_index(self, get_key: Callable[[Schema], Hashable]) -> Mapping[Hashable, OrderedSet[Schema]]:
+        """Returns an index, building it if necessary.
+
+        Args:
+            get_key: A module-level function returning the property of a
+                schema to index by. It must be module-level so that this
+                set can be pickled.
+        """
+        if (index := self._indices.get(get_key)) is None:
+            index = {}
+            for schema in self:
+                index.setdefault(get_key(schema), OrderedSet()).add(schema)
+            self._indices[get_key] = index
+        return index
+
+    def with_path_type(self, path_type: type[Shape]) -> Collection[Schema]:
+        """Returns the schemas in this set whose paths are instances of a
+        type.
+
+        Args:
+            path_type: A subclass of `Shape`.
+
+        Returns:
+            The schemas in this set whose paths are instances of
+            `path_type`, in this set’s order.
+        """
+        matches = [schemas for t, schemas in self._get_index(_get_path_type).items() if issubclass(t, path_type)]  # type: ignore[arg-type]
+        match matches:
+            case []:
+                return ()
+            case [schemas]:
+                return schemas
+            case _:
+                return [schema for schema in self if isinstance(schema.path, path_type)]
+
+    def with_cmap(self, cmap: int | None) -> Collection[Schema]:
+        """Returns the schemas in this set with a code point.
+
+        Args:
+            cmap: A code point, or ``None``.
+
+        Returns:
+            The schemas in this set whose ``cmap`` attributes are
+            `cmap`, in this set’s order.
+        """
+        return self._get_index(_get_cmap).get(cmap, ())
+
+
+class GlyphNameRegistry:
+    """A registry of the disambiguated glyph names of canonical schemas.
+
+    A glyph’s name may include a suffix to disambiguate it from other
+    glyphs that happen to otherwise share the same name. In a group of
+    homonymous glyphs, the first gets the plain name and the rest get
+    numeric suffixes, starting at 1 and incrementing by 1 for each
+    subsequent glyph. The suffix is ``"._"`` followed by the number in
+    uppercase hexadecimal.
+
+    Computing a schema’s undisambiguated glyph name is slow, so it is
+    only done once per schema, when the schema is registered.
+    """
+
+    def __init__(self) -> None:
+        """Initializes this `GlyphNameRegistry`.
+        """
+        self._indices: Final[dict[str, dict[Schema, int]]] = {}
+        self._names: Final[dict[Schema, str]] = {}
+
+    def register(self, schema: Schema) -> str:
+        """Registers a schema and returns its disambiguated glyph name.
+
+        Registering a schema that is already registered is a no-op.
+
+        Args:
+            schema: A canonical schema.
+
+        Returns:
+            The disambiguated glyph name of `schema`.
+        """
+        if (name := self._names.get(schema)) is None:
+            name = str(schema)
+            while len(name) > Schema._MAX_GLYPH_NAME_LENGTH:
+                name = name.rsplit('.', 1)[0]
+            homonyms = self._indices.setdefault(name, {})
+            if index := homonyms.setdefault(schema, len(homonyms)):
+                name += f'._{index:X}'
+            self._names[schema] = name
+        return name
+
+    def update(self, other: GlyphNameRegistry) -> None:
+        """Adds another registry’s registrations to this registry.
+
+        The two registries must not have any undisambiguated glyph
+        names in common.
+
+        Args:
+            other: Another registry.
+        """
+        assert self._indices.keys().isdisjoint(other._indices), 'The registries have undisambiguated glyph names in common'
+        self._indices.update((name, dict(homonyms)) for name, homonyms in other._indices.items())
+        self._names.update(other._names)
+
+    def check(self) -> None:
+        """Checks the glyph names of all the registered schemas.
+
+        Each undisambiguated glyph name must correspond, according to
+        the Adobe Glyph List Specification, to its schema’s ``cps``
+        attribute, and `Schema._RESERVED_GLYPH_NAME_PATTERN` must not
+        match anywhere in it. It suffices to check the truncated names:
+        truncation only removes whole components from the end, which
+        cannot introduce a match of the pattern, and the first
+        component, which alone determines the code points, is never
+        removed.
+
+        This is slow, so it should only be called once all the glyph
+        names have been registered, and only in debug mode.
+
+        Raises:
+            AssertionError: If any glyph name is invalid. The message
+                lists every invalid glyph name.
+        """
+        errors = []
+        for name, homonyms in self._indices.items():
+            if Schema._RESERVED_GLYPH_NAME_PATTERN.search(name):
+                errors.append(f'The glyph name "{name}" misleadingly appears to have a disambiguatory suffix')
+            agl_cps = tuple(map(ord, fontTools.agl.toUnicode(name)))
+            errors.extend(
+                f'''The glyph name "{
+                    name
+                }" corresponds to <{
+                    ', '.join(f'U+{cp:04X}' for cp in agl_cps)
+                }> but its glyph corresponds to <{
+                    ', '.join(f'U+{cp:04X}' for cp in cps)
+                }>'''
+                for cps in OrderedSet(schema.cps for schema in homonyms)
+                if cps != agl_cps
+            )
+        assert not errors, '\n'.join(errors)
@@ -0,0 +1,186 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Snapshots of partially built fonts.
+
+Building a font takes a long time, mostly in the phases and in drawing
+glyphs. A snapshot saves the state of a build to a file so that a later
+build can resume from it instead of starting over. A snapshot is only
+valid for the exact source code and build options that produced it.
+"""
+
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+import pickle  # ruff: ignore[suspicious-pickle-import]
+import sys
+from typing import Final
+from typing import TYPE_CHECKING
+
+import fontforge
+
+import schema
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+
+#: The names of the groups of phases, in the order they are run. A
+#: snapshot can be taken after any group, or after any phase.
+PHASE_GROUPS: Final[Sequence[str]] = ['main', 'middle', 'marker']
+
+
+def get_source_hash() -> str:
+    """Returns a hash of the source files used to build the font.
+
+    Returns:
+        A hexadecimal SHA-256 hash of the paths and contents of all the
+        Python and feature files in the sources directory.
+    """
+    sources = Path(__file__).parent
+    source_hash = hashlib.sha256()
+    for path in sorted(sources.rglob('*')):
+        if path.suffix in {'.fea', '.py'}:
+            source_hash.update(path.relative_to(sources).as_posix().encode('utf-8'))
+            source_hash.update(b'\0')
+            source_hash.update(path.read_bytes())
+            source_hash.update(b'\0')
+    return source_hash.hexdigest()
+
+
+class GlyphData:
+    """The parts of a FontForge glyph that the build depends on.
+
+    FontForge glyphs cannot be pickled, so a snapshot stores this
+    instead.
+
+    Attributes:
+        name: The glyph name.
+        unicode: The glyph’s code point, or -1 if it has none.
+        altuni: The glyph’s alternate code points.
+        glyph_class: The glyph class.
+        width: The advance width.
+        contours: The contours of the foreground layer. Each contour is
+            a tuple of whether it is closed and its points as tuples of
+            x, y, and whether the point is on the curve.
+        anchor_points: The anchor points.
+        temporary: The glyph’s ``temporary`` attribute.
+    """
+
+    def __init__(self, glyph: fontforge.glyph) -> None:
+        """Initializes this `GlyphData`.
+
+        Args:
+            glyph: The glyph to copy the data of.
+        """
+        self.name: Final = glyph.glyphname
+        self.unicode: Final = glyph.unicode
+        self.altuni: Final = glyph.altuni
+        self.glyph_class: Final = glyph.glyphclass
+        self.width: Final = glyph.width
+        self.contours: Final = [(contour.closed, [(point.x, point.y, point.on_curve) for point in contour]) for contour in glyph.foreground]
+        self.anchor_points: Final = [*glyph.anchorPoints]
+        self.temporary: Final = glyph.temporary
+
+    def restore(self, font: fontforge.font) -> fontforge.glyph:
+        """Adds a glyph with this data to a font.
+
+        Args:
+            font: The font to add the glyph to.
+
+        Returns:
+            The new glyph.
+        """
+        glyph = font.createChar(self.unicode, self.name)
+        glyph.unicode = self.unicode
+        glyph.altuni = self.altuni
+        glyph.glyphclass = self.glyph_class
+        layer = fontforge.layer()
+        for closed, points in self.contours:
+            contour = fontforge.contour()
+            for point in points:
+                contour += fontforge.point(*point)
+            contour.closed = closed
+            layer += contour
+        glyph.foreground = layer
+        for anchor_class_name, anchor_type, x, y, *_ in self.anchor_points:
+            glyph.addAnchorPoint(anchor_class_name, anchor_type, x, y)
+        glyph.width = self.width
+        glyph.temporary = self.temporary
+        return glyph
+
+
+def save(path: Path, options: Mapping[str, object], state: object) -> None:
+    """Saves a snapshot.
+
+    The snapshot has a header with a hash of the source files, the build
+    options, and the current phase index, followed by `state`.
+
+    Args:
+        path: The file to save the snapshot to.
+        options: The options of the build that affect the font, by
+            name. They must be picklable and comparable for equality.
+        state: The state of the build. It must be picklable.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, 100_000))
+    try:
+        with path.open('wb') as f:
+            pickle.dump((get_source_hash(), dict(options), schema.CURRENT_PHASE_INDEX), f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+
+def load(path: Path, options: Mapping[str, object]) -> object:
+    """Loads a snapshot.
+
+    This also restores the current phase index to what it was when the
+    snapshot was saved. The header is checked before the state is
+    loaded.
+
+    Args:
+        path: The file to load the snapshot from.
+        options: The options of the current build, as passed to `save`.
+
+    Returns:
+        The state of the build that was passed to `save`.
+
+    Raises:
+        ValueError: If the snapshot was saved from different source
+            files or by a build with different options.
+    """
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, 100_000))
+    try:
+        with path.open('rb') as f:
+            source_hash, snapshot_options, phase_index = pickle.load(f)  # type: ignore[misc]  # ruff: ignore[suspicious-pickle-usage]
+            assert isinstance(source_hash, str)  # type: ignore[misc]
+            assert isinstance(snapshot_options, dict)  # type: ignore[misc]
+            assert isinstance(phase_index, int)  # type: ignore[misc]
+            if source_hash != get_source_hash():
+                raise ValueError(f'The snapshot {path} is out of date with respect to the source files')
+            if snapshot_options != options:
+                different_options = sorted(name for name in snapshot_options.keys() | options.keys() if snapshot_options.get(name) != options.get(name))  # type: ignore[misc]
+                raise ValueError(f'The snapshot {path} is from a build with different options: {", ".join(different_options)}')
+            state = pickle.load(f)  # type: ignore[misc]  # ruff: ignore[suspicious-pickle-usage]
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    schema.CURRENT_PHASE_INDEX = phase_index
+    return state  # type: ignore[misc]
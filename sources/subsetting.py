@@ -0,0 +1,232 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Subsetting of a built font to the glyphs a text can reach.
+
+fontTools's subsetter computes the closure of a glyph set under GSUB by
+repeatedly applying every lookup, taking contexts into account, which
+takes seconds for this font. A `TextSubsetter` instead precomputes a
+graph with an edge from each glyph to each glyph that some substitution
+with that glyph among its inputs can output, ignoring contexts and
+ligatures' other components. The glyphs reachable from a code point's
+glyph in that graph are a superset of the glyphs any text containing
+that code point can reach. Reachability distributes over union, so the
+closure of a text is the union of the precomputed closures of its code
+points, and subsetting only has to prune the tables.
+
+HarfBuzz can also shape a text with glyphs for code points that are not
+in the text. It inserts U+25CC DOTTED CIRCLE before a mark with no base.
+It uses the glyph for U+0020 SPACE for some default ignorable and space
+characters. It also composes and decomposes characters canonically. A
+text's closure therefore also includes the closures of those code
+points.
+"""
+
+from __future__ import annotations
+
+import collections
+import io
+from pathlib import Path
+from typing import Final
+from typing import TYPE_CHECKING
+import unicodedata
+
+import fontTools.subset
+import fontTools.ttLib.tables.G_S_U_B_
+import fontTools.ttLib.tables.otBase
+import fontTools.ttLib.tables.otTables
+import fontTools.ttLib.ttFont
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Set as AbstractSet
+
+    from _typeshed import StrPath
+
+
+#: The code points whose glyphs HarfBuzz can use when shaping any text.
+_IMPLICIT_CODE_POINTS: Final[AbstractSet[int]] = frozenset({0x0020, 0x25CC})
+
+
+def _get_substitutions(subtable: fontTools.ttLib.tables.otBase.BaseTable) -> Iterable[tuple[str, str]]:
+    """Yields the substitutions of a GSUB subtable.
+
+    Contextual subtables have no substitutions of their own. Their
+    nested lookups are elsewhere in the lookup list.
+
+    Args:
+        subtable: A GSUB subtable.
+
+    Yields:
+        Pairs of an input glyph and a glyph that the subtable can output
+        when that glyph is among its inputs.
+    """
+    if isinstance(subtable, fontTools.ttLib.tables.otTables.ExtensionSubst):
+        yield from _get_substitutions(subtable.ExtSubTable)
+    elif isinstance(subtable, fontTools.ttLib.tables.otTables.SingleSubst):
+        yield from subtable.mapping.items()
+    elif isinstance(subtable, fontTools.ttLib.tables.otTables.MultipleSubst):
+        for input_glyph, output_glyphs in subtable.mapping.items():
+            for output_glyph in output_glyphs:
+                yield input_glyph, output_glyph
+    elif isinstance(subtable, fontTools.ttLib.tables.otTables.AlternateSubst):
+        for input_glyph, output_glyphs in subtable.alternates.items():
+            for output_glyph in output_glyphs:
+                yield input_glyph, output_glyph
+    elif isinstance(subtable, fontTools.ttLib.tables.otTables.LigatureSubst):
+        for first_glyph, ligatures in subtable.ligatures.items():
+            for ligature in ligatures:
+                yield first_glyph, ligature.LigGlyph
+                for component in ligature.Component:
+                    yield component, ligature.LigGlyph
+    elif isinstance(subtable, fontTools.ttLib.tables.otTables.ReverseChainSingleSubst):
+        yield from zip(subtable.Coverage.glyphs, subtable.Substitute, strict=True)
+
+
+def _get_substitution_graph(tt_font: fontTools.ttLib.ttFont.TTFont) -> Mapping[str, AbstractSet[str]]:
+    """Returns the graph of a font's GSUB substitutions.
+
+    Every lookup counts, whether or not any feature refers to it.
+
+    Args:
+        tt_font: A font.
+
+    Returns:
+        A map from each glyph to the glyphs that some GSUB substitution
+        with it among its inputs can output.
+    """
+    graph: collections.defaultdict[str, set[str]] = collections.defaultdict(set)
+    if 'GSUB' in tt_font:
+        gsub = tt_font['GSUB']
+        assert isinstance(gsub, fontTools.ttLib.tables.G_S_U_B_.table_G_S_U_B_)
+        for lookup in gsub.table.LookupList.Lookup:
+            for subtable in lookup.SubTable:
+                for input_glyph, output_glyph in _get_substitutions(subtable):
+                    graph[input_glyph].add(output_glyph)
+    return graph
+
+
+def _get_reachable_glyphs(graph: Mapping[str, AbstractSet[str]], glyph: str) -> frozenset[str]:
+    """Returns the glyphs reachable from a glyph in a graph.
+
+    Args:
+        graph: A map from glyphs to their successors.
+        glyph: The glyph to start from.
+
+    Returns:
+        `glyph` and every glyph reachable from it.
+    """
+    reachable_glyphs = {glyph}
+    stack = [glyph]
+    while stack:
+        for successor in graph.get(stack.pop(), ()):
+            if successor not in reachable_glyphs:
+                reachable_glyphs.add(successor)
+                stack.append(successor)
+    return frozenset(reachable_glyphs)
+
+
+class TextSubsetter:
+    """A subsetter of one font to the glyphs that texts can reach.
+
+    The font is loaded, and the closures of all its code points are
+    computed, once. Each subset font is then computed from the cached
+    closures of a text's code points.
+    """
+
+    def __init__(self, path: StrPath) -> None:
+        """Initializes this `TextSubsetter`.
+
+        Args:
+            path: The path of the font to subset.
+        """
+        self._data = Path(path).read_bytes()
+        tt_font = fontTools.ttLib.ttFont.TTFont(io.BytesIO(self._data))
+        graph = _get_substitution_graph(tt_font)
+        cmap = tt_font.getBestCmap() or {}
+        self._closures: Mapping[int, frozenset[str]] = {code_point: _get_reachable_glyphs(graph, glyph) for code_point, glyph in cmap.items()}
+        compositions: collections.defaultdict[int, set[int]] = collections.defaultdict(set)
+        for code_point in cmap:
+            for component in unicodedata.normalize('NFD', chr(code_point)):
+                if ord(component) != code_point:
+                    compositions[ord(component)].add(code_point)
+        self._compositions: Mapping[int, AbstractSet[int]] = compositions
+        self._options = fontTools.subset.Options(
+            layout_closure=False,
+            layout_features=['*'],
+            name_IDs=['*'],
+            name_languages=['*'],
+            notdef_outline=True,
+            passthrough_tables=True,
+        )
+
+    def get_code_points(self, text: str) -> AbstractSet[int]:
+        """Returns the code points whose glyphs shaping a text can use.
+
+        Args:
+            text: A text.
+
+        Returns:
+            The code points of `text`, their canonical decompositions,
+            the code points the font maps that canonically decompose to
+            sequences including any of those, and the code points that
+            HarfBuzz can use with any text.
+        """
+        code_points = {*_IMPLICIT_CODE_POINTS}
+        for code_point in {ord(c) for c in text}:
+            code_points.add(code_point)
+            code_points.update(map(ord, unicodedata.normalize('NFD', chr(code_point))))
+        for code_point in [*code_points]:
+            code_points |= self._compositions.get(code_point, set())
+        return code_points
+
+    def get_glyphs(self, text: str) -> AbstractSet[str]:
+        """Returns the glyphs that a text can reach.
+
+        Args:
+            text: A text. Code points that the font does not map are
+                ignored.
+
+        Returns:
+            A superset of the glyphs that shaping any text with the same
+            code points as `text` can produce, not including
+            ``.notdef``.
+        """
+        glyphs: set[str] = set()
+        for code_point in self.get_code_points(text):
+            glyphs |= self._closures.get(code_point, frozenset())
+        return glyphs
+
+    def subset(self, text: str) -> bytes:
+        """Returns a subset of the font for a text.
+
+        Args:
+            text: A text.
+
+        Returns:
+            The binary data of a font with only the glyphs that `text`
+            can reach and the mappings of the code points in
+            `get_code_points`. It shapes `text` the same way the full
+            font does; ``tests/check-subsetting.py`` checks this for
+            random texts, well-formed or not.
+        """
+        tt_font = fontTools.ttLib.ttFont.TTFont(io.BytesIO(self._data), cfg={'fontTools.ttLib.tables.otBase:USE_HARFBUZZ_REPACKER': False})
+        subsetter = fontTools.subset.Subsetter(self._options)
+        subsetter.populate(glyphs=self.get_glyphs(text), unicodes=self.get_code_points(text))
+        subsetter.subset(tt_font)
+        output = io.BytesIO()
+        tt_font.save(output)
+        return output.getvalue()
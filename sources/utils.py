@@ -30,15 +30,15 @@ from typing import overload
 from typing import override
 
 import fontTools.subset
+import fontTools.ttLib.tables._p_o_s_t
+import fontTools.ttLib.ttFont
 import uharfbuzz
 
 
 if TYPE_CHECKING:
     from collections.abc import Callable
-    from collections.abc import ItemsView
     from collections.abc import Iterable
     from collections.abc import Iterator
-    from collections.abc import KeysView
     from collections.abc import Mapping
     from collections.abc import Sequence
     from collections.abc import Set as AbstractSet
@@ -356,6 +356,37 @@ SUBSET_FEATURES: AbstractSet[str] = (frozenset(fontTools.subset.Options().layout
 )
 
 
+#: The suffix to append to the path of a font built with
+#: ``--strip-glyph-names`` to get the path of the file listing its
+#: original glyph names, one per line in glyph ID order.
+GLYPH_NAMES_SUFFIX: Final = '.glyph-names.txt'
+
+
+def has_stripped_glyph_names(tt_font: fontTools.ttLib.ttFont.TTFont) -> bool:
+    """Returns whether a font was built with ``--strip-glyph-names``.
+
+    This checks the font itself, not whether there is a file of glyph
+    names next to it, since such a file might be left over from an
+    earlier build.
+
+    Args:
+        tt_font: A font.
+
+    Returns:
+        Whether the font has ``g`` followed by the glyph ID as the
+        names of all its glyphs but the first, if it has a 'CFF ' table,
+        or a format 3 'post' table, if not.
+    """
+    if 'CFF ' in tt_font:
+        glyph_order = tt_font.getGlyphOrder()
+        return glyph_order[1:] == [f'g{glyph_id}' for glyph_id in range(1, len(glyph_order))]
+    if 'post' not in tt_font:
+        return False
+    post_table = tt_font['post']
+    assert isinstance(post_table, fontTools.ttLib.tables._p_o_s_t.table__p_o_s_t)
+    return post_table.formatType == 3
+
+
 @functools.cache  # type: ignore[misc]
 def cps_to_scripts(cps: Sequence[int]) -> set[str]:
     """Converts a code point sequence to its set of script tags.
@@ -753,6 +784,13 @@ class OrderedSet[T](dict[T, None]):
         return sorted(self.keys(), key=key, reverse=reverse)  # type: ignore[arg-type, type-var]
 
 
+#: A cache of prefixed keys. It maps each `PrefixView` prefix to a
+#: mapping from unprefixed keys to the keys that views with that prefix
+#: pass to their underlying mappings. It is shared between views because
+#: the build creates many short-lived views with the same prefix.
+_PREFIXED_KEYS: Final[dict[str, dict[str, str]]] = {}
+
+
 class PrefixView[T](MutableMapping[str, T]):
     """A mutable view of a string-keyed mapping with a prefix applied to
     all keys.
@@ -772,7 +810,15 @@ class PrefixView[T](MutableMapping[str, T]):
     automatically added by this view. If a key has the global prefix,
     the view passes it through to the underlying mapping unchanged;
     otherwise, a key passed to a method of a view must not contain
-    ``".."``.
+    ``".."``. Keys are only validated the first time any view with the
+    same prefix sees them.
+
+    Iterating over this view only yields the unprefixed keys of this
+    view’s own namespace, not global keys or other views’ keys. The
+    namespace is indexed the first time this view is iterated over and
+    then kept up to date by this view’s own methods, so keys in this
+    view’s namespace must not be added to or removed from the underlying
+    mapping any other way while this view is in use.
     """
 
     def __init__(
@@ -788,6 +834,8 @@ class PrefixView[T](MutableMapping[str, T]):
         """
         self._prefix: Final = f'{source.__module__}.{source.__qualname__}..'
         self._delegate: Final = delegate
+        self._prefixed_keys: Final = _PREFIXED_KEYS.setdefault(self._prefix, {})
+        self._namespace: OrderedSet[str] | None = None
 
     def _prefixed(self, key: str) -> str:
         """Returns a key with the prefix prepended to it if necessary.
@@ -798,18 +846,36 @@ class PrefixView[T](MutableMapping[str, T]):
         Args:
             key: The key to which to prepend the prefix.
         """
-        is_global = key.startswith('global..')
-        assert len(key.split('..')) == 1 + is_global, f'Invalid key: {key!r}'
-        return key if is_global else self._prefix + key
+        if (prefixed_key := self._prefixed_keys.get(key)) is None:
+            is_global = key.startswith('global..')
+            assert len(key.split('..')) == 1 + is_global, f'Invalid key: {key!r}'
+            prefixed_key = self._prefixed_keys[key] = key if is_global else self._prefix + key
+        return prefixed_key
+
+    def _get_namespace(self) -> OrderedSet[str]:
+        """Returns the unprefixed keys of this view’s namespace, indexing
+        them if necessary.
+        """
+        if self._namespace is None:
+            self._namespace = OrderedSet(key.removeprefix(self._prefix) for key in self._delegate if key.startswith(self._prefix))
+        return self._namespace
 
     @override
     def __getitem__(self, key: str, /) -> T:
         """Returns the item associated with a prefixed key.
 
+        If the underlying mapping inserts missing keys, like a
+        `collections.defaultdict`, this counts as an insertion into this
+        view.
+
         Args:
             key: The key to which to prepend the prefix.
         """
-        return self._delegate[self._prefixed(key)]
+        prefixed_key = self._prefixed(key)
+        value = self._delegate[prefixed_key]
+        if self._namespace is not None and prefixed_key != key:
+            self._namespace.add(key)
+        return value
 
     @override
     def __setitem__(self, key: str, value: T, /) -> None:
@@ -819,7 +885,10 @@ class PrefixView[T](MutableMapping[str, T]):
             key: The key to which to prepend the prefix.
             value: An item.
         """
-        self._delegate[self._prefixed(key)] = value
+        prefixed_key = self._prefixed(key)
+        self._delegate[prefixed_key] = value
+        if self._namespace is not None and prefixed_key != key:
+            self._namespace.add(key)
 
     @override
     def __delitem__(self, key: str, /) -> None:
@@ -831,7 +900,10 @@ class PrefixView[T](MutableMapping[str, T]):
         Raises:
             KeyError: If the prefixed key is not mapped to anything.
         """
-        del self._delegate[self._prefixed(key)]
+        prefixed_key = self._prefixed(key)
+        del self._delegate[prefixed_key]
+        if self._namespace is not None and prefixed_key != key:
+            self._namespace.remove(key)
 
     @override
     def __contains__(self, item: object, /) -> bool:
@@ -844,16 +916,8 @@ class PrefixView[T](MutableMapping[str, T]):
 
     @override
     def __iter__(self, /) -> Iterator[str]:
-        return iter(self._delegate)
+        return iter(self._get_namespace())
 
     @override
     def __len__(self, /) -> int:
-        return len(self._delegate)
-
-    @override
-    def keys(self) -> KeysView[str]:
-        return self._delegate.keys()
-
-    @override
-    def items(self) -> ItemsView[str, T]:
-        return self._delegate.items()
+        return len(self._get_namespace())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to measure how many subset fonts per second a font can serve.
+
+Each request subsets the font to a random well-formed text, first with
+a `subsetting.TextSubsetter` and then, for comparison, with fontTools's
+subsetter computing the layout closure from scratch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+from pathlib import Path
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import fontTools.subset
+import fontTools.ttLib.ttFont
+
+import stress
+from subsetting import TextSubsetter
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+
+
+def _measure(name: str, texts: Sequence[str], subset: Callable[[str], bytes]) -> float:
+    """Measures and prints how fast a subsetting function is.
+
+    Args:
+        name: The name of the subsetting function.
+        texts: The texts to subset the font to.
+        subset: A function from a text to the binary data of a font.
+
+    Returns:
+        The number of requests per second.
+    """
+    start = time.perf_counter()
+    sizes = [len(subset(text)) for text in texts]
+    elapsed = time.perf_counter() - start
+    requests_per_second = len(texts) / elapsed
+    print(f'{name}: {requests_per_second:.2f} requests/s over {len(texts)} requests, mean size {statistics.fmean(sizes):.0f} bytes')
+    return requests_per_second
+
+
+def _subset_from_scratch(path: Path, text: str) -> bytes:
+    """Subsets a font with fontTools's layout closure.
+
+    Args:
+        path: The path of the font.
+        text: The text to subset the font to.
+
+    Returns:
+        The binary data of the subset font.
+    """
+    tt_font = fontTools.ttLib.ttFont.TTFont(path, cfg={'fontTools.ttLib.tables.otBase:USE_HARFBUZZ_REPACKER': False})
+    subsetter = fontTools.subset.Subsetter(fontTools.subset.Options(
+        layout_features=['*'],
+        name_IDs=['*'],
+        name_languages=['*'],
+        notdef_outline=True,
+        passthrough_tables=True,
+    ))
+    subsetter.populate(text=text)
+    subsetter.subset(tt_font)
+    output = io.BytesIO()
+    tt_font.save(output)
+    return output.getvalue()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure how many subset fonts per second a font can serve.')
+    parser.add_argument(
+        '--baseline-count', default=5, type=int,
+        help="The number of random texts to subset the font to with fontTools's layout closure (default: %(default)s).",
+    )
+    parser.add_argument('--count', default=100, type=int, help='The number of random texts to subset the font to (default: %(default)s).')
+    parser.add_argument('--length', default=200, type=int, help='The minimum number of code points per text (default: %(default)s).')
+    parser.add_argument('--seed', default=0, type=int, help='The seed of the random number generator (default: %(default)s).')
+    parser.add_argument('font', type=Path, help='The path to the font.')
+    args = parser.parse_args()
+    assert isinstance(args.baseline_count, int)  # type: ignore[misc]
+    assert isinstance(args.count, int)  # type: ignore[misc]
+    assert isinstance(args.length, int)  # type: ignore[misc]
+    assert isinstance(args.seed, int)  # type: ignore[misc]
+    assert isinstance(args.font, Path)  # type: ignore[misc]
+    generator = stress.TextGenerator(fontTools.ttLib.ttFont.TTFont(args.font).getBestCmap() or {}, args.seed)
+    texts = [''.join(map(chr, generator.generate(args.length))) for _ in range(max(args.count, args.baseline_count))]
+    start = time.perf_counter()
+    subsetter = TextSubsetter(args.font)
+    print(f'Precomputed closures in {time.perf_counter() - start:.2f} s')
+    cached_requests_per_second = _measure('cached closures', texts[:args.count], subsetter.subset)
+    path = args.font
+    baseline_requests_per_second = _measure('layout closure', texts[:args.baseline_count], lambda text: _subset_from_scratch(path, text))
+    print(f'Cached closures are {cached_requests_per_second / baseline_requests_per_second:.1f}x as fast')
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to run micro-benchmarks of the build’s data structures.
+
+Each benchmark compares a straightforward way of doing something with
+the way the build does it, on data at the scale of the testing
+character set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import functools
+import timeit
+from typing import ClassVar
+from typing import Final
+from typing import TYPE_CHECKING
+from typing import override
+
+import fontforge
+
+import charsets
+import charsets.data
+import duployan
+import phases
+from phases import FreezableList
+import phases.main
+import phases.marker
+import phases.middle
+from schema import SchemaSet
+from shapes import End
+from shapes import InvalidOverlap
+from shapes import Space
+from utils import MINIMUM_STROKE_GAP
+from utils import PrefixView
+from utils import REGULAR_LIGHT_LINE
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Collection
+    from collections.abc import Mapping
+    from collections.abc import MutableMapping
+
+    from schema import Schema
+    from shapes import Shape
+
+
+def _report(name: str, baseline: Callable[[], object], optimized: Callable[[], object], number: int) -> None:
+    """Times and prints two ways of doing the same thing.
+
+    Args:
+        name: The name of the benchmark.
+        baseline: The straightforward way.
+        optimized: The way the build does it.
+        number: How many times to run each function.
+    """
+    baseline_time = min(timeit.repeat(baseline, number=number, repeat=5))
+    optimized_time = min(timeit.repeat(optimized, number=number, repeat=5))
+    print(
+        f'{name}: {baseline_time / number * 1e6:.2f} μs → {optimized_time / number * 1e6:.2f} μs'
+        f' ({baseline_time / optimized_time:.1f}x faster)',
+    )
+
+
+def _get_testing_schemas() -> Collection[Schema]:
+    """Returns the initial schemas of the testing character set.
+    """
+    return charsets.data.initialize_schemas(charsets.Charset.TESTING, REGULAR_LIGHT_LINE, max(MINIMUM_STROKE_GAP, REGULAR_LIGHT_LINE))
+
+
+def benchmark_schema_index(number: int) -> None:
+    """Benchmarks `SchemaSet` against linear scans.
+
+    Args:
+        number: How many times to run each operation.
+    """
+    schemas = _get_testing_schemas()
+    schema_set = SchemaSet(schemas)
+    print(f'{len(schema_set)} schemas')
+
+    def scan_for_path_type(path_type: type[Shape]) -> Schema | None:
+        return next((s for s in schemas if isinstance(s.path, path_type)), None)
+
+    def look_up_path_type(path_type: type[Shape]) -> Schema | None:
+        return next(iter(schema_set.with_path_type(path_type)), None)
+
+    for path_type in [InvalidOverlap, Space, End]:
+        _report(
+            f'first schema with a {path_type.__name__} path',
+            functools.partial(scan_for_path_type, path_type),
+            functools.partial(look_up_path_type, path_type),
+            number,
+        )
+    _report(
+        'schema with a code point',
+        lambda: next((s for s in schemas if s.cmap == 0x25CC), None),
+        lambda: next(iter(schema_set.with_cmap(0x25CC)), None),
+        number,
+    )
+    all_phases = [*phases.main.PHASE_LIST, *phases.middle.PHASE_LIST, *phases.marker.PHASE_LIST]
+    phase_indices: Mapping[object, int] = {phase: i for i, phase in enumerate(all_phases)}
+    phase = phases.main.join_circle_with_adjacent_nonorienting_glyph
+    _report(
+        'phase index',
+        lambda: [*phases.main.PHASE_LIST, *phases.middle.PHASE_LIST, *phases.marker.PHASE_LIST].index(phase),
+        lambda: phase_indices[phase],
+        number,
+    )
+
+
+class _UncachedPrefixView[T](PrefixView[T]):
+    """A `PrefixView` that prefixes and validates a key on every access,
+    as `PrefixView` used to.
+    """
+
+    @override
+    def _prefixed(self, key: str) -> str:
+        is_global = key.startswith('global..')
+        assert len(key.split('..')) == 1 + is_global, f'Invalid key: {key!r}'
+        return key if is_global else self._prefix + key
+
+
+class _RecordingPrefixView[T](PrefixView[T]):
+    """A `PrefixView` that records how it is used.
+
+    Each event is appended to `EVENTS` as a tuple of an operation, the
+    index of the view in `VIEWS`, and a key. The operation is
+    ``"view"`` for the creation of a view, in which case the key is
+    empty, or the name of the special method that used the key.
+    """
+
+    #: The source and the index of the underlying mapping of each view,
+    #: in the order they were created.
+    VIEWS: ClassVar[list[tuple[function, int]]] = []  # ruff: ignore[undefined-name]
+
+    #: The indices of the underlying mappings in `VIEWS`, by their IDs,
+    #: along with the mappings themselves so that their IDs are not
+    #: reused.
+    DELEGATES: ClassVar[dict[int, tuple[int, object]]] = {}
+
+    #: The events recorded so far.
+    EVENTS: ClassVar[list[tuple[str, int, str]]] = []
+
+    def __init__(
+        self,
+        source: function,  # ruff: ignore[undefined-name]
+        delegate: MutableMapping[str, T],
+    ) -> None:
+        super().__init__(source, delegate)
+        delegate_index, _ = self.DELEGATES.setdefault(id(delegate), (len(self.DELEGATES), delegate))
+        self._view_index: Final = len(self.VIEWS)
+        self.VIEWS.append((source, delegate_index))
+        self.EVENTS.append(('view', self._view_index, ''))
+
+    @override
+    def __getitem__(self, key: str, /) -> T:
+        value = super().__getitem__(key)
+        self.EVENTS.append(('__getitem__', self._view_index, key))
+        return value
+
+    @override
+    def __setitem__(self, key: str, value: T, /) -> None:
+        super().__setitem__(key, value)
+        self.EVENTS.append(('__setitem__', self._view_index, key))
+
+    @override
+    def __contains__(self, item: object, /) -> bool:
+        if isinstance(item, str):
+            self.EVENTS.append(('__contains__', self._view_index, item))
+        return super().__contains__(item)
+
+
+def _record_prefix_view_events() -> None:
+    """Builds a font with the testing character set, recording how the
+    build uses `PrefixView` in `_RecordingPrefixView`.
+    """
+    font = fontforge.font()
+    font.encoding = 'UnicodeFull'
+    builder = duployan.Builder(font, bold=False, charset=charsets.Charset.TESTING, unjoined=False)
+    phases.PrefixView = duployan.PrefixView = _RecordingPrefixView  # type: ignore[attr-defined]
+    try:
+        builder.build(fast=True)
+    finally:
+        phases.PrefixView = duployan.PrefixView = PrefixView  # type: ignore[attr-defined]
+
+
+def benchmark_prefix_view(_number: int) -> None:
+    """Benchmarks `PrefixView` against prefixing every key.
+
+    This first builds a font with the testing character set, recording
+    every view the build creates and every key it passes to them, and
+    then replays those events on empty mappings that insert missing
+    keys.
+
+    Args:
+        _number: Ignored. One replay covers the whole build, which is
+            long enough to time on its own.
+    """
+    _record_prefix_view_events()
+    views = _RecordingPrefixView.VIEWS
+    events = _RecordingPrefixView.EVENTS
+    print(f'{len(views)} views, {len(events) - len(views)} keys used')
+
+    def replay(view_type: type[PrefixView[FreezableList[Schema]]]) -> None:
+        delegate_mappings: list[collections.defaultdict[str, FreezableList[Schema]]] = [
+            collections.defaultdict(FreezableList) for _ in _RecordingPrefixView.DELEGATES
+        ]
+        replayed_views: list[PrefixView[FreezableList[Schema]]] = []
+        for operation, view_index, key in events:
+            match operation:
+                case 'view':
+                    source, delegate_index = views[view_index]
+                    replayed_views.append(view_type(source, delegate_mappings[delegate_index]))
+                case '__getitem__':
+                    replayed_views[view_index][key]
+                case '__setitem__':
+                    replayed_views[view_index][key] = FreezableList()
+                case '__contains__':
+                    _ = key in replayed_views[view_index]
+
+    _report('view operations in a build', functools.partial(replay, _UncachedPrefixView), functools.partial(replay, PrefixView), 1)
+
+
+BENCHMARKS: Mapping[str, Callable[[int], None]] = {
+    'prefix-view': benchmark_prefix_view,
+    'schema-index': benchmark_schema_index,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks of the build's data structures.")
+    parser.add_argument('--number', default=1000, type=int, help='How many times to run each operation (default: %(default)s).')
+    parser.add_argument(
+        'benchmarks', choices=BENCHMARKS.keys(), metavar='BENCHMARK', nargs='*',
+        help=f'The benchmarks to run, from {{{", ".join(BENCHMARKS)}}} (default: all of them).',
+    )
+    args = parser.parse_args()
+    assert isinstance(args.number, int)  # type: ignore[misc]
+    benchmarks: list[str] = args.benchmarks or [*BENCHMARKS]  # type: ignore[misc]
+    for benchmark in benchmarks:
+        BENCHMARKS[benchmark](args.number)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to check `impact.FontDiff` against small known changes.
+
+Each case builds an old and a new font from feature code and checks
+whether the diff between them says that everything is affected and
+which glyphs it says are affected. It exits with a failure status if
+any case fails.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+from typing import TYPE_CHECKING
+
+import fontTools.feaLib.builder
+import fontTools.fontBuilder
+import fontTools.pens.t2CharStringPen
+import fontTools.ttLib.ttFont
+
+import impact
+
+
+if TYPE_CHECKING:
+    from collections.abc import Set as AbstractSet
+
+
+#: The glyphs in every font built by `_build_font`, other than
+#: ``.notdef``. Each is mapped from the code point of its name.
+GLYPH_NAMES = ['a', 'b', 'c', 'd']
+
+
+#: The cases to check. Each case is a tuple of the feature code of the
+#: old font, the feature code of the new font, whether the diff should
+#: affect everything, and the glyphs the diff should affect if not.
+CASES: list[tuple[str, str, bool, AbstractSet[str]]] = [
+    (
+        'feature liga { sub a by b; } liga;',
+        'feature liga { sub a by b; } liga;',
+        False,
+        set(),
+    ),
+    (
+        'feature liga { sub a by b; } liga;',
+        'feature liga { sub a by c; } liga;',
+        False,
+        {'a', 'b', 'c'},
+    ),
+    (
+        'lookup l1 { sub a by b; } l1; lookup l2 { sub c by d; } l2; feature liga { lookup l1; lookup l2; } liga;',
+        'lookup l1 { sub a by b; } l1; lookup l2 { sub c by a; } l2; feature liga { lookup l1; lookup l2; } liga;',
+        False,
+        {'a', 'c', 'd'},
+    ),
+    (
+        "lookup l1 { sub a by b; } l1; feature calt { sub d a' lookup l1; } calt;",
+        "lookup l1 { sub a by c; } l1; feature calt { sub d a' lookup l1; } calt;",
+        False,
+        {'a', 'b', 'c'},
+    ),
+    (
+        'feature liga { sub a by b; } liga;',
+        'feature liga { sub a by b; } liga; feature calt { sub c by d; } calt;',
+        True,
+        set(),
+    ),
+]
+
+
+def _build_font(fea: str) -> fontTools.ttLib.ttFont.TTFont:
+    """Builds a minimal font.
+
+    Args:
+        fea: The feature code to compile into the font.
+
+    Returns:
+        A font with the glyphs in `GLYPH_NAMES`, which are all empty.
+    """
+    glyph_order = ['.notdef', *GLYPH_NAMES]
+    builder = fontTools.fontBuilder.FontBuilder(1000, isTTF=False)
+    builder.setupGlyphOrder(glyph_order)
+    builder.setupCharacterMap({ord(glyph_name): glyph_name for glyph_name in GLYPH_NAMES})
+    char_string = fontTools.pens.t2CharStringPen.T2CharStringPen(500, None).getCharString()
+    builder.setupCFF('Test', {}, dict.fromkeys(glyph_order, char_string), {})
+    builder.setupHorizontalMetrics(dict.fromkeys(glyph_order, (500, 0)))
+    builder.setupHorizontalHeader()
+    builder.setupMaxp()
+    fontTools.feaLib.builder.addOpenTypeFeatures(builder.font, io.StringIO(fea))
+    return builder.font
+
+
+if __name__ == '__main__':
+    passed_all = True
+    for old_fea, new_fea, expected_everything, expected_glyphs in CASES:
+        diff = impact.FontDiff(_build_font(old_fea), _build_font(new_fea))
+        if diff.everything != expected_everything or not diff.everything and diff.glyphs != expected_glyphs:
+            print(
+                f'Old: {old_fea}\nNew: {new_fea}\n'
+                f'Expected: everything={expected_everything}, glyphs={sorted(expected_glyphs)}\n'
+                f'Actual: everything={diff.everything}, glyphs={sorted(diff.glyphs)}\n',
+                file=sys.stderr,
+            )
+            passed_all = False
+    if not passed_all:
+        sys.exit(1)
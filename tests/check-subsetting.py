@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to check that subset fonts shape their texts like the full font.
+
+Each random text is shaped with the full font and with a
+`subsetting.TextSubsetter` subset of it for that text, and the glyph
+names, clusters, and positions are compared. Half the texts are
+well-formed and half are random sequences of any code points the font
+maps, which exercise HarfBuzz’s dotted circles, default ignorables, and
+normalization. It exits with a failure status if any text shapes
+differently. The font must have its glyph names.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+from pathlib import Path
+import sys
+from typing import TYPE_CHECKING
+
+import fontTools.ttLib.ttFont
+import uharfbuzz
+
+import stress
+from subsetting import TextSubsetter
+import tracing
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+type ShapedGlyph = tuple[str, int, int, int, int, int]
+
+
+def _shape(font: uharfbuzz.Font, glyph_order: Sequence[str], code_points: Sequence[int]) -> list[ShapedGlyph]:
+    """Shapes some code points.
+
+    Args:
+        font: The font to shape with.
+        glyph_order: The glyph names of `font`, in glyph ID order.
+        code_points: The code points to shape.
+
+    Returns:
+        The name, cluster, advances, and offsets of each output glyph.
+    """
+    buffer = tracing.trace(font, code_points, '')
+    assert buffer is not None
+    assert buffer.glyph_positions is not None
+    return [
+        (glyph_order[info.codepoint], info.cluster, position.x_advance, position.y_advance, position.x_offset, position.y_offset)
+        for info, position in zip(buffer.glyph_infos, buffer.glyph_positions, strict=True)
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check that subset fonts shape their texts like the full font.')
+    parser.add_argument('--count', default=50, type=int, help='The number of well-formed texts and of malformed texts to check (default: %(default)s).')
+    parser.add_argument('--length', default=32, type=int, help='The minimum number of code points per text (default: %(default)s).')
+    parser.add_argument('--seed', default=0, type=int, help='The seed of the random number generator (default: %(default)s).')
+    parser.add_argument('font', type=Path, help='The path to the font.')
+    args = parser.parse_args()
+    assert isinstance(args.count, int)  # type: ignore[misc]
+    assert isinstance(args.length, int)  # type: ignore[misc]
+    assert isinstance(args.seed, int)  # type: ignore[misc]
+    assert isinstance(args.font, Path)  # type: ignore[misc]
+    tt_font = fontTools.ttLib.ttFont.TTFont(args.font)
+    glyph_order = tt_font.getGlyphOrder()
+    generator = stress.TextGenerator(tt_font.getBestCmap() or {}, args.seed)
+    texts = [
+        *(generator.generate(args.length) for _ in range(args.count)),
+        *(generator.generate_malformed(args.length) for _ in range(args.count)),
+    ]
+    full_font = tracing.open_font(str(args.font))
+    subsetter = TextSubsetter(args.font)
+    mismatch_count = 0
+    for text in texts:
+        subset_data = subsetter.subset(''.join(map(chr, text)))
+        subset_glyph_order = fontTools.ttLib.ttFont.TTFont(io.BytesIO(subset_data)).getGlyphOrder()
+        subset_font = uharfbuzz.Font(uharfbuzz.Face(subset_data))
+        expected = _shape(full_font, glyph_order, text)
+        actual = _shape(subset_font, subset_glyph_order, text)
+        if actual != expected:
+            mismatch_count += 1
+            print(f'{" ".join(f"{cp:04X}" for cp in text)}\n  full:   {expected}\n  subset: {actual}', file=sys.stderr)
+    if mismatch_count:
+        print(f'{mismatch_count} of {len(texts)} texts shaped differently with subset fonts', file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,276 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Selection of the shaping tests that a change to a font can affect.
+
+A `FontDiff` compares two versions of a font glyph by glyph and lookup
+by lookup to find which glyphs are affected by the change. A
+`TestSelector` shapes each test with the old font, records which glyphs
+appeared at any point during shaping, and selects the tests that saw an
+affected glyph. Glyphs are compared by name, since glyph names are
+stable across builds.
+"""
+
+from __future__ import annotations
+
+import collections
+import io
+import re
+from typing import TYPE_CHECKING
+
+import fontTools.pens.recordingPen
+import fontTools.ttLib.ttFont
+
+import tracing
+
+
+if TYPE_CHECKING:
+    from collections.abc import Set as AbstractSet
+    from pathlib import Path
+
+    import uharfbuzz
+
+
+COMMENT_PATTERN = re.compile(r'<!--.*?-->')
+
+
+CLASS_DEF_PATTERN = re.compile(r'<ClassDef glyph="([^"]*)" class="([0-9]+)"/>')
+
+
+GLYPH_CLASS_DEF_PATTERN = re.compile(r'<GlyphClassDef>.*?</GlyphClassDef>', re.DOTALL)
+
+
+LOOKUP_PATTERN = re.compile(r'^\s*<Lookup index="([0-9]+)">$(.*?)^\s*</Lookup>$', re.DOTALL | re.MULTILINE)
+
+
+MARK_GLYPH_SET_PATTERN = re.compile(r'<Coverage index="([0-9]+)"[^>]*>(.*?)</Coverage>', re.DOTALL)
+
+
+MARK_GLYPH_SETS_DEF_PATTERN = re.compile(r'<MarkGlyphSetsDef>.*?</MarkGlyphSetsDef>', re.DOTALL)
+
+
+QUOTED_VALUE_PATTERN = re.compile(r'"([^"]*)"')
+
+
+def _dump_table(font: fontTools.ttLib.ttFont.TTFont, tag: str) -> str:
+    """Returns a table as TTX without comments.
+
+    Args:
+        font: A font.
+        tag: The tag of a table.
+
+    Returns:
+        The TTX dump of the table, or ``''`` if the font has no such
+        table.
+    """
+    if tag not in font:
+        return ''
+    xml = io.StringIO()
+    font.saveXML(xml, tables=[tag])
+    return COMMENT_PATTERN.sub('', xml.getvalue())
+
+
+def _get_mentioned_glyphs(text: str, glyph_names: AbstractSet[str]) -> set[str]:
+    """Returns the glyph names that appear in attribute values in TTX.
+
+    Args:
+        text: Some TTX.
+        glyph_names: The names of all the glyphs in the font.
+    """
+    mentioned_glyphs: set[str] = set()
+    for match in QUOTED_VALUE_PATTERN.finditer(text):
+        value: str = match[1]
+        mentioned_glyphs.update(glyph_name for glyph_name in value.split(',') if glyph_name in glyph_names)
+    return mentioned_glyphs
+
+
+def _get_glyph_classes(gdef: str) -> dict[str, str]:
+    """Returns the glyph classes from the TTX of a GDEF table.
+
+    Args:
+        gdef: The TTX of a GDEF table.
+
+    Returns:
+        A mapping from glyph names to glyph classes.
+    """
+    glyph_classes: dict[str, str] = {}
+    for glyph_class_def in GLYPH_CLASS_DEF_PATTERN.finditer(gdef):
+        for match in CLASS_DEF_PATTERN.finditer(glyph_class_def[0]):
+            glyph_name: str = match[1]
+            glyph_class: str = match[2]
+            glyph_classes[glyph_name] = glyph_class
+    return glyph_classes
+
+
+def _get_mark_glyph_sets(gdef: str, glyph_names: AbstractSet[str]) -> collections.defaultdict[str, set[str]]:
+    """Returns the mark glyph sets from the TTX of a GDEF table.
+
+    Args:
+        gdef: The TTX of a GDEF table.
+        glyph_names: The names of all the glyphs in the font.
+
+    Returns:
+        A mapping from mark glyph set indices to the names of the
+        glyphs in the sets.
+    """
+    mark_glyph_sets: collections.defaultdict[str, set[str]] = collections.defaultdict(set)
+    for mark_glyph_sets_def in MARK_GLYPH_SETS_DEF_PATTERN.finditer(gdef):
+        for match in MARK_GLYPH_SET_PATTERN.finditer(mark_glyph_sets_def[0]):
+            index: str = match[1]
+            coverage: str = match[2]
+            mark_glyph_sets[index] |= _get_mentioned_glyphs(coverage, glyph_names)
+    return mark_glyph_sets
+
+
+def _split_layout_table(xml: str) -> tuple[str, list[str]]:
+    """Splits the TTX of a GSUB or GPOS table into its lookups and
+    everything else.
+
+    References to lookups, in the feature list and in contextual
+    lookups, are left as indices.
+
+    Args:
+        xml: The TTX of a GSUB or GPOS table.
+
+    Returns:
+        A tuple of two elements.
+
+        1. The table without its lookups.
+        2. The lookups, in order.
+    """
+    lookups: list[str] = []
+    for match in LOOKUP_PATTERN.finditer(xml):
+        lookup: str = match[2]
+        lookups.append(lookup)
+    return LOOKUP_PATTERN.sub('', xml), lookups
+
+
+class FontDiff:
+    """The differences between two versions of a font that can affect
+    shaping.
+
+    Attributes:
+        everything: Whether the change could affect any test, e.g.
+            because of a change to the script or feature list or to the
+            number of lookups.
+        glyphs: The names of the glyphs affected by the change.
+        code_points: The code points whose 'cmap' mappings changed.
+    """
+
+    def __init__(self, old_font: fontTools.ttLib.ttFont.TTFont, new_font: fontTools.ttLib.ttFont.TTFont) -> None:
+        """Initializes this `FontDiff`.
+
+        Args:
+            old_font: The old version of the font.
+            new_font: The new version of the font.
+        """
+        self.everything = False
+        old_glyph_names = {*old_font.getGlyphOrder()}
+        new_glyph_names = {*new_font.getGlyphOrder()}
+        all_glyph_names = old_glyph_names | new_glyph_names
+        self.glyphs = old_glyph_names ^ new_glyph_names
+        old_glyph_set = old_font.getGlyphSet()
+        new_glyph_set = new_font.getGlyphSet()
+        for glyph_name in old_glyph_names & new_glyph_names:
+            old_glyph = old_glyph_set[glyph_name]
+            new_glyph = new_glyph_set[glyph_name]
+            if old_glyph.width != new_glyph.width:
+                self.glyphs.add(glyph_name)
+                continue
+            old_pen = fontTools.pens.recordingPen.RecordingPen()
+            old_glyph.draw(old_pen)
+            new_pen = fontTools.pens.recordingPen.RecordingPen()
+            new_glyph.draw(new_pen)
+            if old_pen.value != new_pen.value:
+                self.glyphs.add(glyph_name)
+        old_cmap = old_font.getBestCmap() or {}
+        new_cmap = new_font.getBestCmap() or {}
+        self.code_points = {cp for cp in old_cmap.keys() | new_cmap.keys() if old_cmap.get(cp) != new_cmap.get(cp)}
+        old_gdef = _dump_table(old_font, 'GDEF')
+        new_gdef = _dump_table(new_font, 'GDEF')
+        old_glyph_classes = _get_glyph_classes(old_gdef)
+        new_glyph_classes = _get_glyph_classes(new_gdef)
+        self.glyphs |= {g for g in old_glyph_classes.keys() | new_glyph_classes.keys() if old_glyph_classes.get(g) != new_glyph_classes.get(g)}
+        old_mark_glyph_sets = _get_mark_glyph_sets(old_gdef, all_glyph_names)
+        new_mark_glyph_sets = _get_mark_glyph_sets(new_gdef, all_glyph_names)
+        for index in old_mark_glyph_sets.keys() | new_mark_glyph_sets.keys():
+            self.glyphs |= old_mark_glyph_sets[index] ^ new_mark_glyph_sets[index]
+        for tag in ['GSUB', 'GPOS']:
+            old_rest, old_lookups = _split_layout_table(_dump_table(old_font, tag))
+            new_rest, new_lookups = _split_layout_table(_dump_table(new_font, tag))
+            if old_rest != new_rest or len(old_lookups) != len(new_lookups):
+                self.everything = True
+                return
+            for old_lookup, new_lookup in zip(old_lookups, new_lookups, strict=True):
+                if old_lookup != new_lookup:
+                    self.glyphs |= _get_mentioned_glyphs(old_lookup, all_glyph_names)
+                    self.glyphs |= _get_mentioned_glyphs(new_lookup, all_glyph_names)
+
+
+class TestSelector:
+    """A selector of the tests that a change to a font can affect.
+
+    `is_affected` may be called from multiple threads at once.
+    """
+
+    def __init__(self, old_font_path: Path, new_font_path: Path) -> None:
+        """Initializes this `TestSelector`.
+
+        Args:
+            old_font_path: The path of the old version of the font.
+            new_font_path: The path of the new version of the font.
+        """
+        old_font = fontTools.ttLib.ttFont.TTFont(old_font_path)
+        self._diff = FontDiff(old_font, fontTools.ttLib.ttFont.TTFont(new_font_path))
+        self._glyph_order = old_font.getGlyphOrder()
+        self._hb_font = tracing.open_font(str(old_font_path))
+
+    def _get_seen_glyphs(self, code_points: list[int], options: str) -> set[str] | None:
+        """Returns the glyphs that appear at any point while shaping a
+        string with the old font.
+
+        Args:
+            code_points: The code points to shape.
+            options: The hb-shape options to shape with.
+
+        Returns:
+            The names of the glyphs in the buffer at any point during
+            shaping, or ``None`` if the options are not supported.
+        """
+        seen_glyph_ids: set[int] = set()
+
+        def record_glyphs(_message: str, buffer: uharfbuzz.Buffer) -> None:
+            seen_glyph_ids.update(info.codepoint for info in buffer.glyph_infos)
+
+        buffer = tracing.trace(self._hb_font, code_points, options, record_glyphs)
+        if buffer is None:
+            return None
+        record_glyphs('', buffer)
+        return {self._glyph_order[glyph_id] for glyph_id in seen_glyph_ids if glyph_id < len(self._glyph_order)}
+
+    def is_affected(self, line: str) -> bool:
+        """Returns whether a test might have a different result with the
+        new font than with the old font.
+
+        Args:
+            line: A test line from a test file.
+        """
+        if self._diff.everything:
+            return True
+        code_points_string, options, _ = line.split(':')
+        code_points = [int(cp, 16) for cp in code_points_string.split()]
+        if not self._diff.code_points.isdisjoint(code_points):
+            return True
+        seen_glyphs = self._get_seen_glyphs(code_points, options)
+        return seen_glyphs is None or not self._diff.glyphs.isdisjoint(seen_glyphs)
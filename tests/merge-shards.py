@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to merge the JSON Lines reports of sharded shaping test runs.
+
+For each test file with a failure in any shard, this writes the actual
+outputs from all the shards to ``failed/<font>/<test file>`` next to
+this script, just like an unsharded run of ``run-tests.py``. It exits
+with a failure status if any test failed or any shard is missing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+from pathlib import Path
+import sys
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Merge the JSON Lines reports of sharded shaping test runs.')
+    parser.add_argument('reports', metavar='REPORT', nargs='+', type=Path, help='The JSON Lines reports of all the shards.')
+    args = parser.parse_args()
+    assert isinstance(args.reports, list)  # type: ignore[misc]
+    shards: set[str] = set()
+    passed_all = True
+    actual_lines: collections.defaultdict[tuple[str, str], dict[int, str]] = collections.defaultdict(dict)
+    failed_files: set[tuple[str, str]] = set()
+    for report in args.reports:
+        assert isinstance(report, Path)
+        with report.open(encoding='utf-8') as f:
+            for record_line in f:
+                record = json.loads(record_line)  # type: ignore[misc]
+                assert isinstance(record, dict)  # type: ignore[misc]
+                if record['type'] == 'summary':  # type: ignore[misc]
+                    shard = record['shard']
+                    assert shard is None or isinstance(shard, str)
+                    if shard is None:
+                        parser.error(f'{report} is not from a sharded run')
+                    if shard in shards:
+                        parser.error(f'more than one report for shard {shard}')
+                    shards.add(shard)
+                    continue
+                if record['type'] != 'test':  # type: ignore[misc]
+                    continue
+                font = record['font']
+                file = record['file']
+                line_number = record['line_number']
+                test_input = record['test_input']
+                actual_output = record['actual_output']
+                passed = record['passed']
+                assert isinstance(font, str)
+                assert isinstance(file, str)
+                assert isinstance(line_number, int)
+                assert isinstance(test_input, str)
+                assert isinstance(actual_output, str)
+                assert isinstance(passed, bool)
+                actual_lines[font, file][line_number] = f'{test_input}:{actual_output}'
+                if not passed:
+                    failed_files.add((font, file))
+                    passed_all = False
+    counts = {int(shard.partition('/')[2]) for shard in shards}
+    if len(counts) != 1:
+        parser.error('the reports are from runs with different numbers of shards')
+    count = counts.pop()
+    if missing_shards := {f'{i}/{count}' for i in range(1, count + 1)} - shards:
+        print(f'Missing shards: {", ".join(sorted(missing_shards))}', file=sys.stderr)
+        passed_all = False
+    for font, file in sorted(failed_files):
+        failed_dir = Path(sys.argv[0]).parent / 'failed' / Path(font).name
+        failed_dir.mkdir(parents=True, exist_ok=True)
+        lines = actual_lines[font, file]
+        with Path(file).open(encoding='utf-8') as f, (failed_dir / Path(file).name).open('w', encoding='utf-8') as failed_file:
+            failed_file.writelines(f'{lines.get(line_number, line.rstrip())}\n' for line_number, line in enumerate(f, start=1))
+    if not passed_all:
+        sys.exit(1)
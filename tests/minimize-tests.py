@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to choose a small subset of the shaping tests with the same
+lookup coverage as the whole suite.
+
+Each test is shaped with HarfBuzz’s message callback, which reports the
+start and end of each lookup and each change a lookup makes to the
+buffer. A test covers a lookup if the lookup changed the buffer or was
+recursed to, and it covers each kind of change reported within a lookup,
+e.g. a ligature substitution or a mark attachment. HarfBuzz does not
+report which subtable or rule applied, so the kinds of change stand in
+for them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+from pathlib import Path
+import re
+import sys
+from typing import Final
+from typing import TYPE_CHECKING
+
+import uharfbuzz
+
+import tracing
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+#: A coverage item: a font, a table tag, a lookup index, and the kind of
+#: change the lookup made, or ``''`` for the lookup as a whole.
+type Item = tuple[str, str, int, str]
+
+
+#: A test: a test file name and the input part of a test line.
+type Test = tuple[str, str]
+
+
+END_LOOKUP_PATTERN: Final = re.compile(r'end lookup ([0-9]+)')
+
+
+NUMBERS_PATTERN: Final = re.compile(r'[0-9]+(?:,[0-9]+)*')
+
+
+RECURSE_PATTERN: Final = re.compile(r'recursing to lookup ([0-9]+)')
+
+
+START_LOOKUP_PATTERN: Final = re.compile(r'start lookup ([0-9]+)')
+
+
+START_TABLE_PATTERN: Final = re.compile(r'start table ([A-Z]{4})')
+
+
+def _get_state(buffer: uharfbuzz.Buffer) -> tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int, int, int], ...]]:
+    """Returns a snapshot of a buffer’s contents.
+
+    Args:
+        buffer: A buffer.
+
+    Returns:
+        The glyphs and clusters, and the positions if any.
+    """
+    return (
+        tuple((info.codepoint, info.cluster) for info in buffer.glyph_infos),
+        tuple((p.x_advance, p.y_advance, p.x_offset, p.y_offset) for p in buffer.glyph_positions or []),
+    )
+
+
+def get_coverage(font_path: str, font: uharfbuzz.Font, code_points: Sequence[int], options: str) -> set[Item] | None:
+    """Returns the coverage items a test covers.
+
+    Args:
+        font_path: The path of the font, to identify it in the coverage
+            items.
+        font: The font to shape with.
+        code_points: The code points to shape.
+        options: The hb-shape options to shape with.
+
+    Returns:
+        The coverage items, or ``None`` if the options are not supported
+        so the coverage is unknown.
+    """
+    items: set[Item] = set()
+    table = ''
+    lookup_stack: list[tuple[int, tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int, int, int], ...]]]] = []
+
+    def record(message: str, buffer: uharfbuzz.Buffer) -> None:
+        nonlocal table
+        if match := START_TABLE_PATTERN.match(message):
+            table = match[1]
+        elif match := START_LOOKUP_PATTERN.match(message):
+            lookup_stack.append((int(match[1]), _get_state(buffer)))
+        elif match := END_LOOKUP_PATTERN.match(message):
+            lookup_index, state = lookup_stack.pop()
+            if state != _get_state(buffer):
+                items.add((font_path, table, lookup_index, ''))
+        elif match := RECURSE_PATTERN.match(message):
+            items.add((font_path, table, int(match[1]), ''))
+        elif lookup_stack and not message.startswith(('end ', 'start ')):
+            items.add((font_path, table, lookup_stack[-1][0], NUMBERS_PATTERN.sub('#', message)))
+
+    if tracing.trace(font, code_points, options, record) is None:
+        return None
+    return items
+
+
+def minimize(coverages: Sequence[set[Item]]) -> list[int]:
+    """Chooses a small subset of tests with the same coverage as all of
+    them.
+
+    This uses the greedy approximation to the set cover problem.
+
+    Args:
+        coverages: The coverage items of each test.
+
+    Returns:
+        The indices of the chosen tests, in descending order of how many
+        coverage items each test added when it was chosen. Ties are
+        broken in favor of earlier tests.
+    """
+    uncovered = set[Item]().union(*coverages)
+    heap = [(-len(coverage), i) for i, coverage in enumerate(coverages) if coverage]
+    heapq.heapify(heap)
+    chosen = []
+    while heap and uncovered:
+        negative_gain, i = heapq.heappop(heap)
+        gain = len(coverages[i] & uncovered)
+        if gain == -negative_gain:
+            chosen.append(i)
+            uncovered -= coverages[i]
+        elif gain:
+            heapq.heappush(heap, (-gain, i))
+    return chosen
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Choose a small subset of the shaping tests with the same lookup coverage as the whole suite.')
+    parser.add_argument('--output', metavar='FILE', required=True, type=Path, help='The JSON file to write the quick test list to.')
+    parser.add_argument(
+        'paths',
+        metavar='PATH',
+        nargs='+',
+        type=Path,
+        help='The paths to one or more fonts followed by the paths to test files.',
+    )
+    args = parser.parse_args()
+    assert isinstance(args.paths, list)  # type: ignore[misc]
+    assert isinstance(args.output, Path)  # type: ignore[misc]
+    fonts: list[str] = []
+    test_paths: list[Path] = []
+    for path in args.paths:
+        assert isinstance(path, Path)
+        if path.suffix in {'.otf', '.ttf'}:
+            fonts.append(str(path))
+        else:
+            test_paths.append(path)
+    tests: list[Test] = []
+    for test_path in test_paths:
+        for line in test_path.read_text(encoding='utf-8').splitlines():
+            if line.strip() and not line.startswith('#'):
+                code_points, options, _ = line.rstrip().split(':')
+                tests.append((test_path.name, f'{code_points}:{options}'))
+    hb_fonts = [(font, tracing.open_font(font)) for font in fonts]
+    coverages = []
+    untraceable = []
+    for i, (_, test_input) in enumerate(tests):
+        code_points, options = test_input.split(':')
+        coverage: set[Item] = set()
+        for font, hb_font in hb_fonts:
+            font_coverage = get_coverage(font, hb_font, [int(cp, 16) for cp in code_points.split()], options)
+            if font_coverage is None:
+                untraceable.append(i)
+                coverage = set()
+                break
+            coverage |= font_coverage
+        coverages.append(coverage)
+    chosen = [*untraceable, *minimize(coverages)]
+    quick_tests: dict[str, list[str]] = {test_path.name: [] for test_path in test_paths}
+    for i in chosen:
+        test_file_name, test_input = tests[i]
+        quick_tests[test_file_name].append(test_input)
+    with args.output.open('w', encoding='utf-8') as f:
+        json.dump(quick_tests, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f'Chose {len(chosen)} of {len(tests)} tests')
+    covered = {(font, table, lookup_index) for coverage in coverages for font, table, lookup_index, _ in coverage}
+    uncovered_count = 0
+    for font, hb_font in hb_fonts:
+        face = hb_font.face
+        for table in ['GSUB', 'GPOS']:
+            for lookup_index in range(uharfbuzz.ot_layout_table_get_lookup_count(face, table)):
+                if (font, table, lookup_index) not in covered:
+                    print(f'{font}: {table} lookup {lookup_index} is not covered by any test')
+                    uncovered_count += 1
+    print(f'{uncovered_count} uncovered lookups', file=sys.stderr)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to find how long a stenogram can be before HarfBuzz gives up
+shaping it.
+
+HarfBuzz limits how many operations it performs on a buffer and how long
+the buffer can grow. When shaping exceeds either limit, HarfBuzz stops
+applying lookups and the text is rendered as a jumble of unjoined
+glyphs. Each construction below is repeated to make longer and longer
+strings. The output is degraded if the glyphs of the first repetition
+differ from those in a short string, since the lookups that HarfBuzz
+skips would have affected them too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Final
+from typing import TYPE_CHECKING
+
+import tracing
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    import uharfbuzz
+
+
+#: The constructions to probe, as the code points of one repetition.
+CONSTRUCTIONS: Final[Mapping[str, Sequence[int]]] = {
+    'orienting-sequences': [0x1BC46, 0x1BC06],
+    'overlaps': [0x1BC02, 0x1BCA1],
+    'trees': [0x1BC02, 0x1BCA0, 0x1BC03],
+    'width-markers': [0x1BC02, 0x1BC03],
+}
+
+
+#: The number of repetitions in the short string that longer strings are
+#: compared against.
+REFERENCE_REPETITIONS: Final = 3
+
+
+#: The maximum number of repetitions to try.
+MAX_REPETITIONS: Final = 1 << 14
+
+
+type GlyphData = list[tuple[int, int, int, int, int]]
+
+
+def format_limit(limit: int | None) -> str:
+    """Formats a limit returned by `find_limit`.
+
+    Args:
+        limit: A limit.
+
+    Returns:
+        The limit as a phrase to show to the user.
+    """
+    return f'more than {MAX_REPETITIONS}' if limit is None else str(limit)
+
+
+def get_first_repetition(font: uharfbuzz.Font, construction: Sequence[int], repetitions: int) -> GlyphData:
+    """Shapes a repeated construction and returns the glyphs of the
+    first repetition.
+
+    Args:
+        font: The font to shape with.
+        construction: The code points of one repetition.
+        repetitions: The number of repetitions to shape.
+
+    Returns:
+        The glyph ID, cluster, and position of each glyph in the first
+        repetition.
+    """
+    buffer = tracing.trace(font, [*construction] * repetitions, '')
+    assert buffer is not None
+    return [
+        (info.codepoint, info.cluster, position.x_advance, position.x_offset, position.y_offset)
+        for info, position in zip(buffer.glyph_infos, buffer.glyph_positions or [], strict=True)
+        if info.cluster < len(construction)
+    ]
+
+
+def find_limit(font: uharfbuzz.Font, construction: Sequence[int]) -> int | None:
+    """Finds the fewest repetitions of a construction that HarfBuzz
+    cannot shape correctly.
+
+    This assumes that if HarfBuzz cannot shape a number of repetitions,
+    it cannot shape any more repetitions either.
+
+    Args:
+        font: The font to shape with.
+        construction: The code points of one repetition.
+
+    Returns:
+        The fewest repetitions whose output is degraded, or ``None`` if
+        there are none up to `MAX_REPETITIONS`.
+    """
+    reference = get_first_repetition(font, construction, REFERENCE_REPETITIONS)
+
+    def is_degraded(repetitions: int) -> bool:
+        return get_first_repetition(font, construction, repetitions) != reference
+
+    good = REFERENCE_REPETITIONS
+    bad = good * 2
+    while not is_degraded(bad):
+        good = bad
+        bad *= 2
+        if bad > MAX_REPETITIONS:
+            return None
+    while bad - good > 1:
+        middle = (good + bad) // 2
+        if is_degraded(middle):
+            bad = middle
+        else:
+            good = middle
+    return bad
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Find how long a stenogram can be before HarfBuzz gives up shaping it.')
+    parser.add_argument('--baseline', metavar='FILE', required=True, type=Path, help='The JSON file of the limits to compare against.')
+    parser.add_argument('--update', action='store_true', help='Overwrite the baseline with the current limits instead of comparing against it.')
+    parser.add_argument('fonts', metavar='FONT', nargs='+', type=Path, help='The paths to the fonts to probe.')
+    args = parser.parse_args()
+    assert isinstance(args.baseline, Path)  # type: ignore[misc]
+    assert isinstance(args.update, bool)  # type: ignore[misc]
+    assert isinstance(args.fonts, list)  # type: ignore[misc]
+    baseline: dict[str, dict[str, int | None]] = {}
+    if args.baseline.exists():
+        with args.baseline.open(encoding='utf-8') as f:
+            baseline = json.load(f)
+    elif not args.update:
+        parser.error(f'{args.baseline} does not exist; run with --update before the change to record the baseline')
+    regressed = False
+    for font_path in args.fonts:
+        assert isinstance(font_path, Path)
+        font = tracing.open_font(str(font_path))
+        limits = {name: find_limit(font, construction) for name, construction in CONSTRUCTIONS.items()}
+        old_limits = baseline.get(font_path.name, {})
+        for name, limit in limits.items():
+            print(f'{font_path.name}: {name}: {format_limit(limit)} repetitions')
+            old_limit = old_limits.get(name, limit)
+            if limit is not None and (old_limit is None or limit < old_limit):
+                print(f'{font_path.name}: {name}: the limit fell from {format_limit(old_limit)} to {limit}', file=sys.stderr)
+                regressed = True
+        baseline[font_path.name] = limits
+    if args.update:
+        with args.baseline.open('w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+    elif regressed:
+        sys.exit(1)
@@ -0,0 +1,89 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process rendering of test lines to SVG.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+from typing import TYPE_CHECKING
+
+import fontTools.pens.svgPathPen
+
+import tracing
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import uharfbuzz
+
+
+#: The code point of the private use character that surrounds the input,
+#: so that the rendering shows how the input interacts with neighboring
+#: characters.
+BOUNDARY: Final = 0xE000
+
+
+#: The horizontal margin around the rendered text, in font units.
+MARGIN: Final = 800
+
+
+def render_svg(font: uharfbuzz.Font, code_points: str, options: str, path: Path) -> bool:
+    """Renders a test input to an SVG file.
+
+    Args:
+        font: The font to render with.
+        code_points: The space-separated code points of the input.
+        options: The hb-shape options of the input.
+        path: The path of the SVG file to write.
+
+    Returns:
+        Whether the input could be rendered. It cannot be rendered if
+        the options are not supported.
+    """
+    buffer = tracing.trace(font, [BOUNDARY, *(int(cp, 16) for cp in code_points.split()), BOUNDARY], options, remove_default_ignorables=True)
+    if buffer is None:
+        return False
+    paths = []
+    x = 0
+    x_min = 0
+    x_max = 0
+    y_min = 0
+    y_max = 0
+    for info, position in zip(buffer.glyph_infos, buffer.glyph_positions or [], strict=True):
+        glyph_x = x + position.x_offset
+        glyph_y = position.y_offset
+        pen = fontTools.pens.svgPathPen.SVGPathPen(None)
+        font.draw_glyph_with_pen(info.codepoint, pen)
+        if commands := pen.getCommands():
+            paths.append(f'<path transform="translate({glyph_x} {glyph_y})" d="{commands}"/>')
+        if extents := font.get_glyph_extents(info.codepoint):
+            x_min = min(x_min, glyph_x + extents.x_bearing)
+            x_max = max(x_max, glyph_x + extents.x_bearing + extents.width)
+            y_min = min(y_min, glyph_y + extents.y_bearing + extents.height)
+            y_max = max(y_max, glyph_y + extents.y_bearing)
+        x += position.x_advance
+    x_min -= MARGIN
+    x_max = max(x_max, x) + MARGIN
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w', encoding='utf-8') as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x_min} {-y_max} {x_max - x_min} {y_max - y_min}">'
+            f'<rect x="{x_min}" y="{-y_max}" width="{x_max - x_min}" height="{y_max - y_min}" fill="white"/>'
+            f'<g transform="scale(1 -1)">{"".join(paths)}</g>'
+            '</svg>\n',
+        )
+    return True
@@ -0,0 +1,184 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Machine-readable reports of shaping test results.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from typing import NamedTuple
+from typing import TYPE_CHECKING
+import xml.etree.ElementTree as ET  # ruff: ignore[suspicious-xml-etree-import]
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+    from pathlib import Path
+    from typing import IO
+
+
+class TestResult(NamedTuple):
+    """The result of one shaping test.
+
+    Attributes:
+        font: The path of the font.
+        file: The path of the test file.
+        line_number: The line number of the test in the test file.
+        test_input: The test line without the expected output.
+        passed: Whether the test passed.
+        actual_output: The actual output.
+        expected_output: The expected output.
+        seconds: How long shaping took, or ``None`` if it was not
+            timed.
+    """
+
+    font: str
+    file: str
+    line_number: int
+    test_input: str
+    passed: bool
+    actual_output: str
+    expected_output: str
+    seconds: float | None
+
+
+def get_slowest(results: Iterable[TestResult], count: int) -> list[TestResult]:
+    """Returns the slowest tests.
+
+    Args:
+        results: Some test results.
+        count: The maximum number of results to return.
+
+    Returns:
+        The timed results with the longest times, slowest first.
+    """
+    def get_sort_key(result: TestResult) -> float:
+        return -(result.seconds or 0)
+
+    return sorted((r for r in results if r.seconds is not None), key=get_sort_key)[:count]
+
+
+class JsonLinesReport:
+    """A JSON Lines report written as test results are added.
+
+    Each test gets a line with ``"type": "test"`` as soon as it is
+    added. If the tests are timed afterwards, each timed test then gets
+    a line with ``"type": "timing"``, which has the font, file, line
+    number, and time of the test. Closing the report adds a line with
+    ``"type": "summary"``, which has the counts of passed and failed
+    tests, the slowest tests, and the shard, if any.
+    """
+
+    def __init__(self, path: Path, slowest_count: int, shard: str | None = None) -> None:
+        """Initializes this `JsonLinesReport`.
+
+        Args:
+            path: The path of the file to write.
+            slowest_count: The number of slowest tests to list in the
+                summary.
+            shard: The shard of the tests that this report covers, in
+                the form ``i/n``, or ``None`` if it covers all of them.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] = path.open('w', encoding='utf-8')
+        self._slowest_count = slowest_count
+        self._shard = shard
+        self._results: list[TestResult] = []
+
+    def add(self, result: TestResult) -> None:
+        """Adds a test result to the report.
+
+        Args:
+            result: The result.
+        """
+        self._results.append(result)
+        print(json.dumps({'type': 'test', **result._asdict()}, ensure_ascii=False), file=self._file, flush=True)  # type: ignore[misc]
+
+    def add_times(self, results: Iterable[TestResult]) -> None:
+        """Adds the times of test results that have already been added.
+
+        Args:
+            results: The results that have been added, in the same
+                order, with their times.
+        """
+        self._results = [*results]
+        for result in self._results:
+            if result.seconds is not None:
+                print(
+                    json.dumps({  # type: ignore[misc]
+                        'type': 'timing',
+                        'font': result.font,
+                        'file': result.file,
+                        'line_number': result.line_number,
+                        'seconds': result.seconds,
+                    }),
+                    file=self._file,
+                )
+        self._file.flush()
+
+    def close(self) -> None:
+        """Writes the summary and closes the file.
+        """
+        passed = sum(r.passed for r in self._results)
+        print(
+            json.dumps(
+                {
+                    'type': 'summary',
+                    'passed': passed,
+                    'failed': len(self._results) - passed,
+                    'slowest': [r._asdict() for r in get_slowest(self._results, self._slowest_count)],  # type: ignore[misc]
+                    'shard': self._shard,
+                },
+                ensure_ascii=False,
+            ),
+            file=self._file,
+        )
+        self._file.close()
+
+
+def write_junit(path: Path, results: Sequence[TestResult]) -> None:
+    """Writes a JUnit XML report.
+
+    There is one test suite per font and test file.
+
+    Args:
+        path: The path of the file to write.
+        results: The test results, grouped by font and test file.
+    """
+    def get_suite(result: TestResult) -> tuple[str, str]:
+        return result.font, result.file
+
+    testsuites = ET.Element('testsuites', tests=str(len(results)), failures=str(sum(not r.passed for r in results)))
+    for (font, file), group in itertools.groupby(results, get_suite):
+        suite_results = [*group]
+        testsuite = ET.SubElement(
+            testsuites,
+            'testsuite',
+            name=f'{font}: {file}',
+            tests=str(len(suite_results)),
+            failures=str(sum(not r.passed for r in suite_results)),
+            time=f'{sum(r.seconds or 0 for r in suite_results):.6f}',
+        )
+        for result in suite_results:
+            testcase = ET.SubElement(testsuite, 'testcase', classname=file, name=f'{result.line_number}: {result.test_input}')
+            if result.seconds is not None:
+                testcase.set('time', f'{result.seconds:.6f}')
+            if not result.passed:
+                failure = ET.SubElement(testcase, 'failure', message='Unexpected shaping output')
+                failure.text = f'Expected: {result.expected_output}\nActual:   {result.actual_output}'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(testsuites).write(path, encoding='utf-8', xml_declaration=True)
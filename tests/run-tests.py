@@ -24,6 +24,8 @@ import argparse
 from concurrent.futures import ThreadPoolExecutor
 import difflib
 import enum
+import functools
+import hashlib
 from io import IOBase
 import json
 import os
@@ -31,22 +33,42 @@ from pathlib import Path
 import re
 import subprocess
 import sys
+import threading
 from typing import TYPE_CHECKING
 from typing import TypedDict
 from typing import assert_never
 import unicodedata
 
+import fontTools.ttLib.ttFont
+
+import impact
+import rendering
+import reports
+import sharding
+import timing
+import tracing
+from utils import GLYPH_NAMES_SUFFIX
+from utils import has_stripped_glyph_names
+
 
 if TYPE_CHECKING:
     from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
     from collections.abc import Set as AbstractSet
     from concurrent.futures import Future
-    from typing import IO
+
+    import uharfbuzz
 
 
 CI = os.getenv('CI') == 'true'
 
 
+#: The default maximum size of the shaping cache, in bytes.
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
 DEFAULT_IGNORABLE_CODE_POINTS_IN_HARFBUZZ: AbstractSet[int] = {
     0x00AD, 0x034F, 0x061C, 0x17B4, 0x17B5, *range(0x180B, 0x180F + 1), *range(0x200B, 0x200F + 1), *range(0x202A, 0x202E + 1), *range(0x2060, 0x206F + 1),
     *range(0xFE00, 0xFE0F + 1), 0xFEFF, *range(0xFFF0, 0xFFF8 + 1), *range(0x1D173, 0x1D17A + 1), *range(0xE0000, 0xE0FFF + 1),
@@ -65,6 +87,13 @@ NOTDEF_PATTERN = re.compile(r'[\[|]\.notdef@')
 NAME_PREFIX = r'(?:(?:dupl|u(?:ni(?:[0-9A-F]{4})+|[0-9A-F]{4,6})(?:_[^.]*)?)\.)'
 
 
+#: The tags of the tables whose contents can affect shaping results.
+SHAPING_TABLES = ['GDEF', 'GPOS', 'GSUB', 'cmap', 'hhea', 'hmtx']
+
+
+TEST_SUFFIXES: AbstractSet[str] = {'.subset-test', '.test'}
+
+
 UNSTABLE_NAME_COMPONENT_PATTERN = re.compile(fr'(?<=[\[|])(?:{NAME_PREFIX}[0-9A-Za-z_]+|(?!{NAME_PREFIX})[0-9A-Za-z_]+)(\.su[bp]s)?')
 
 
@@ -104,7 +133,8 @@ class Glyph(TypedDict):
     """A glyph JSON object from hb-shape.
 
     Attributes:
-        g: The glyph name.
+        g: The glyph name, or the glyph ID if hb-shape was run with
+            ``--no-glyph-names``.
         cl: The cluster value.
         dx: The x offset.
         dy: The y offset.
@@ -112,7 +142,7 @@ class Glyph(TypedDict):
         ay: The y advance.
     """
 
-    g: str
+    g: str | int
     cl: int
     dx: int
     dy: int
@@ -120,9 +150,14 @@ class Glyph(TypedDict):
     ay: int
 
 
-def parse_json(s: str) -> Generator[str]:
+def parse_json(s: str, glyph_names: Sequence[str] | None) -> Generator[str]:
     """Converts HarfBuzz’s JSON output to the test storage format.
 
+    Args:
+        s: The JSON output of hb-shape.
+        glyph_names: The glyph names to use for the glyph IDs in `s`,
+            or ``None`` if `s` contains glyph names.
+
     Yields:
         One test string per visible glyph in the JSON, representing its
         name and absolute position, plus one final test string
@@ -132,7 +167,9 @@ def parse_json(s: str) -> Generator[str]:
     y = 0
     glyph: Glyph
     for glyph in json.loads(s):  # type: ignore[misc]
-        if not (name := glyph['g']).startswith('_'):
+        name = glyph['g'] if glyph_names is None else glyph_names[int(glyph['g'])]
+        assert isinstance(name, str)
+        if not name.startswith('_'):
             yield f'''{
                 DISAMBIGUATION_SUFFIX_PATTERN.sub('', name)
             }@{
@@ -234,29 +271,231 @@ def print_diff(
     print('Expected: ' + expected_output)
 
 
+@functools.cache  # type: ignore[misc]
+def get_glyph_names(font: str) -> Sequence[str] | None:
+    """Returns the original glyph names of a font built with
+    ``--strip-glyph-names``.
+
+    Args:
+        font: The path of a font.
+
+    Returns:
+        The glyph names listed in the file next to the font, in glyph ID
+        order, or ``None`` if the font was not built with
+        ``--strip-glyph-names``, meaning its own glyph names are the
+        original ones.
+    """
+    if not has_stripped_glyph_names(fontTools.ttLib.ttFont.TTFont(font, lazy=True)):
+        return None
+    return Path(f'{font}{GLYPH_NAMES_SUFFIX}').read_text(encoding='utf-8').splitlines()
+
+
+def shape(font: str, code_points: str, options: str) -> str:
+    """Shapes a string with HarfBuzz.
+
+    Args:
+        font: The path of the font to shape with.
+        code_points: The space-separated code points of the input.
+        options: The HarfBuzz options of the input.
+
+    Returns:
+        The shaping output in the test storage format.
+    """
+    p = subprocess.Popen(
+        [
+            'hb-shape',
+            font,
+            '-u',
+            code_points,
+            '-O',
+            'json',
+            '--remove-default-ignorables',
+            *(['--no-glyph-names'] if (glyph_names := get_glyph_names(font)) is not None else []),
+            *options.split(),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env={**os.environ, 'HB_SHAPER_LIST': ''},
+    )
+    stdout_data, stderr_data = p.communicate()
+    print(stderr_data.decode('utf-8'), end='', file=sys.stderr)
+    return f'[{"|".join(parse_json(stdout_data.decode("utf-8"), glyph_names))}]'
+
+
+def read_test_file(path: Path) -> list[tuple[int, str]]:
+    """Reads a test file.
+
+    Args:
+        path: The path of the test file.
+
+    Returns:
+        A list of 2-tuples of the line number and contents of each line
+        in the file, without trailing whitespace.
+    """
+    with path.open(encoding='utf-8') as f:
+        return [(line_number, line.rstrip()) for line_number, line in enumerate(f, start=1)]
+
+
+class ShapingCache:
+    """An on-disk cache of shaping results.
+
+    The results for a font are stored in one JSON file per font,
+    named after a hash of everything in the font that can affect
+    shaping: the contents of the tables in `SHAPING_TABLES`, the glyph
+    names, the original glyph names of a font built with
+    ``--strip-glyph-names``, and the version of hb-shape. Other changes, like changes to
+    the 'name' or 'OS/2' table, do not invalidate the cache.
+
+    When the cache is saved, the least recently used files are deleted
+    until the cache fits within its maximum size.
+    """
+
+    def __init__(self, directory: Path | None, max_size: int) -> None:
+        """Initializes this `ShapingCache`.
+
+        Args:
+            directory: The directory to store the cache in, or ``None``
+                to disable the cache.
+            max_size: The maximum total size of the files in the cache,
+                in bytes.
+        """
+        self._directory = directory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._hb_version: str | None = None
+        self._paths: dict[str, Path] = {}
+        self._results: dict[str, dict[str, str]] = {}
+        self._dirty: set[str] = set()
+
+    def _get_path(self, font: str) -> Path:
+        """Returns the path of the cache file for a font.
+
+        This must be called with the lock held.
+
+        Args:
+            font: The path of a font.
+        """
+        assert self._directory is not None
+        if (path := self._paths.get(font)) is None:
+            if self._hb_version is None:
+                self._hb_version = subprocess.run(['hb-shape', '--version'], capture_output=True, check=True, encoding='utf-8').stdout
+            font_hash = hashlib.sha256(self._hb_version.encode('utf-8'))
+            tt_font = fontTools.ttLib.ttFont.TTFont(font, lazy=True)
+            for tag in SHAPING_TABLES:
+                if tag in tt_font:
+                    font_hash.update(tag.encode('ascii'))
+                    font_hash.update(tt_font.getTableData(tag))
+            font_hash.update('\0'.join(tt_font.getGlyphOrder()).encode('utf-8'))
+            if (glyph_names := get_glyph_names(font)) is not None:
+                font_hash.update(b'\0\0')
+                font_hash.update('\0'.join(glyph_names).encode('utf-8'))
+            path = self._directory / f'{font_hash.hexdigest()}.json'
+            self._paths[font] = path
+            try:
+                with path.open(encoding='utf-8') as f:
+                    self._results[font] = json.load(f)  # type: ignore[misc]
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._results[font] = {}
+        return path
+
+    def shape(self, font: str, code_points: str, options: str) -> str:
+        """Shapes a string with HarfBuzz, using the cached result if
+        there is one.
+
+        Args:
+            font: The path of the font to shape with.
+            code_points: The space-separated code points of the input.
+            options: The HarfBuzz options of the input.
+
+        Returns:
+            The shaping output in the test storage format.
+        """
+        if self._directory is None:
+            return shape(font, code_points, options)
+        key = f'{code_points}:{options}'
+        with self._lock:
+            self._get_path(font)
+            result = self._results[font].get(key)
+        if result is None:
+            result = shape(font, code_points, options)
+            with self._lock:
+                self._results[font][key] = result
+                self._dirty.add(font)
+        return result
+
+    def save(self) -> None:
+        """Saves the new results to disk and evicts old results.
+        """
+        def get_mtime(cache_file: Path) -> float:
+            return cache_file.stat().st_mtime
+
+        if self._directory is None:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            for font, path in self._paths.items():
+                if font in self._dirty:
+                    with path.open('w', encoding='utf-8') as f:
+                        json.dump(self._results[font], f, separators=(',', ':'), sort_keys=True)
+                elif path.exists():
+                    path.touch()
+            self._dirty.clear()
+            cache_files = sorted(self._directory.glob('*.json'), key=get_mtime, reverse=True)
+            total_size = 0
+            for path in cache_files:
+                total_size += path.stat().st_size
+                if total_size > self._max_size and path not in self._paths.values():
+                    path.unlink()
+
+
+def is_selected(line: str, quick_test_inputs: AbstractSet[str] | None) -> bool:
+    """Returns whether to run a test.
+
+    This does not consider which tests a change to the font can affect,
+    which is much slower to check; `run_test` checks that.
+
+    Args:
+        line: A line from a test file.
+        quick_test_inputs: The inputs of the tests in the test file to
+            run, where an input is a test line without the expected
+            output, or ``None`` to run all of them.
+
+    Returns:
+        Whether `line` is a test line that should be run.
+    """
+    return (bool(line)
+        and line[0] != '#'
+        and (quick_test_inputs is None or line.rsplit(':', 1)[0] in quick_test_inputs)
+    )
+
+
 def run_test(
     font: str,
     line: str,
-    png_path_prefix: Path,
     incomplete: bool,
-    view_all: bool,
-) -> tuple[bool, str, tuple[str, str, str, str] | None]:
+    reference: str | None,
+    cache: ShapingCache,
+    selector: impact.TestSelector | None,
+) -> tuple[bool, str, tuple[str, str, str, str] | None] | None:
     """Runs one test from a test file.
 
     Args:
         font: The path of the font to test.
         line: A test line from a test file.
-        png_path_prefix: The path of the generated PNG file, to which
-            are appended a hyphen-separated code point sequence and
-            ``'.png'``. By default, only failed tests get PNGs.
         incomplete: Whether the font uses a subset of the available
             glyphs such that glyph names cannot be tested and must be
             ignored, and whether some test failures are acceptable.
-        view_all: Whether to generate a PNG regardless of the test
-            result.
+        reference: The path of a font whose actual output to use as
+            the expected output instead of the expected output in
+            `line`, or ``None`` to use the expected output in `line`.
+        cache: The cache of shaping results.
+        selector: The selector of the tests affected by a change to the
+            font, or ``None`` to run tests regardless of the change.
 
     Returns:
-        A tuple of three elements.
+        ``None`` if `selector` says the change cannot affect the test,
+        in which case the test is not run, or else a tuple of three
+        elements.
 
         1. Whether the test passed.
         2. A test line corresponding to the actual output. If the test
@@ -266,67 +505,63 @@ def run_test(
         3. A tuple of the first four arguments to pass to `print_diff`,
            or ``None`` if there is no diff to print.
     """
+    if selector is not None and not selector.is_affected(line):
+        return None
     code_points, options, expected_output = line.split(':')
-    p = subprocess.Popen(
-        [
-            'hb-shape',
-            font,
-            '-u',
-            code_points,
-            '-O',
-            'json',
-            '--remove-default-ignorables',
-            *options.split(),
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env={**os.environ, 'HB_SHAPER_LIST': ''},
-    )
-    stdout_data, stderr_data = p.communicate()
-    print(stderr_data.decode('utf-8'), end='', file=sys.stderr)
-    actual_output = f'[{"|".join(parse_json(stdout_data.decode("utf-8")))}]'
+    actual_output = cache.shape(font, code_points, options)
+    if reference is not None:
+        expected_output = cache.shape(reference, code_points, options)
     regular = font.endswith('-Regular.otf')
     passed = (munge(actual_output, regular, incomplete) == munge(expected_output, regular, incomplete)
         or incomplete and may_fail(code_points, actual_output)
     )
-    diff: tuple[str, str, str, str] | None = None
-    if not passed or view_all:
-        if not passed:
-            diff = (code_points, options, actual_output, expected_output)
-        if not CI:
-            png_path_prefix.parent.mkdir(parents=True, exist_ok=True)
-            p = subprocess.Popen(
-                [
-                    'hb-view',
-                    '--font-file',
-                    font,
-                    '--font-size',
-                    'upem',
-                    '-u',
-                    f'E000 {code_points} E000',
-                    '--remove-default-ignorables',
-                    '-o',
-                    f'{png_path_prefix}-{code_points.replace(" ", "-")}.png',
-                    '-O',
-                    'png',
-                    '--margin',
-                    '800 0',
-                    *options.split(),
-                ],
-                stderr=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                env={**os.environ, 'HB_SHAPER_LIST': ''},
-                encoding='utf-8',
-            )
-            p.wait()
-            stderr: IO[str] | None = p.stderr
-            assert stderr is not None
-            print(stderr.read(), end='', file=sys.stderr)
+    diff = None if passed else (code_points, options, actual_output, expected_output)
     return passed, f'{code_points}:{options}:{actual_output}', diff
 
 
+def time_tests(results: Iterable[reports.TestResult], hb_fonts: Mapping[str, uharfbuzz.Font], repetitions: int) -> list[reports.TestResult]:
+    """Times the shaping of tests that have already been run.
+
+    The tests are timed one at a time, so that they do not compete with
+    each other or with the correctness run for the CPU.
+
+    Args:
+        results: The results of the tests to time.
+        hb_fonts: The fonts to time shaping with in process, by path.
+        repetitions: How many times to shape each test’s input.
+
+    Returns:
+        `results`, with the median time shaping took in seconds for each
+        result, not counting the time to parse the options or prepare
+        the buffer.
+    """
+    timed_results = []
+    for result in results:
+        code_points, options = result.test_input.split(':')
+        seconds = tracing.time_shaping(hb_fonts[result.font], [int(cp, 16) for cp in code_points.split()], options, repetitions)
+        timed_results.append(result._replace(seconds=seconds))
+    return timed_results
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Run shaping tests.')
+    parser.add_argument(
+        '--cache-size',
+        default=DEFAULT_CACHE_SIZE,
+        metavar='BYTES',
+        type=int,
+        help='The maximum size of the shaping cache. The least recently used results are evicted first. (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--changed-since',
+        metavar='PATH',
+        type=Path,
+        help=(
+            'The path to an old version of the font, or to a directory containing old versions of the fonts'
+            ' at the same paths relative to it as the fonts have relative to the current directory.'
+            ' Only run the tests whose results the changes since then can affect. (default: run all the tests)'
+        ),
+    )
     parser.add_argument(
         '--color',
         default=Color.AUTO,
@@ -341,53 +576,255 @@ if __name__ == '__main__':
             ' Ignore the parts of glyph names that indicate code points.'
         ),
     )
+    parser.add_argument(
+        '--reference',
+        metavar='FONT',
+        help=(
+            'The path to a reference font. Instead of comparing against the expected outputs in the test files,'
+            ' compare against the reference font’s actual outputs.'  # ruff: ignore[ambiguous-unicode-character-string]
+        ),
+    )
+    parser.add_argument(
+        '--jsonl',
+        metavar='FILE',
+        type=Path,
+        help='Write the results to a JSON Lines file as the tests finish, followed by the shaping times if the tests are timed.',
+    )
+    parser.add_argument('--junit', metavar='FILE', type=Path, help='Write the results, and the shaping times if the tests are timed, to a JUnit XML file.')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the shaping cache.')
+    parser.add_argument(
+        '--quick',
+        metavar='FILE',
+        type=Path,
+        help=(
+            'The path to a quick test list generated by `minimize-tests.py`. Only run the tests in the list,'
+            ' except in test files the list does not mention. (default: run all the tests)'
+        ),
+    )
+    parser.add_argument(
+        '--render-failures',
+        action=argparse.BooleanOptionalAction,
+        default=not CI,
+        help='Render the failed test cases to SVG files. (default: render them unless running in CI)',
+    )
+    parser.add_argument(
+        '--shard',
+        type=sharding.parse_shard,
+        help=(
+            'Only run shard i of n, where the argument is of the form i/n. The shards are balanced using the times in'
+            ' `--shard-weights`, if any. Use with `--jsonl` and merge the reports of all the shards with `merge-shards.py`.'
+        ),
+    )
+    parser.add_argument(
+        '--shard-weights',
+        metavar='FILE',
+        type=Path,
+        help=(
+            'The path to a timing baseline, as for `--timing-baseline`, whose times to balance the shards with.'
+            ' Unlike `--timing-baseline`, this does not time the tests or check them against the baseline.'
+            ' (default: balance the shards by test count)'
+        ),
+    )
+    parser.add_argument(
+        '--slowest',
+        default=10,
+        metavar='N',
+        type=int,
+        help='The number of the slowest tests to list in the JSON Lines summary (default: %(default)s).',
+    )
+    parser.add_argument(
+        '--timing',
+        action='store_true',
+        help='After running the tests, time them one at a time for the reports. (default: only time them for --timing-baseline)',
+    )
+    parser.add_argument(
+        '--timing-baseline',
+        metavar='FILE',
+        type=Path,
+        help='The path to a JSON file of shaping times. Fail if any test takes much longer to shape than it did in the baseline.',
+    )
+    parser.add_argument(
+        '--timing-repetitions',
+        default=5,
+        metavar='N',
+        type=int,
+        help='The number of times to shape each test when timing it. The median time is used. (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--timing-tolerance',
+        default=0.5,
+        metavar='FRACTION',
+        type=float,
+        help='How much longer than in the timing baseline shaping may take, as a fraction of the baseline time (default: %(default)s).',
+    )
+    parser.add_argument(
+        '--timing-warn-only',
+        action='store_true',
+        help='Do not fail if shaping is slower than in the timing baseline; just print a warning.',
+    )
+    parser.add_argument(
+        '--update-timing-baseline',
+        action='store_true',
+        help='Record the current shaping times in the timing baseline instead of comparing against it.',
+    )
     parser.add_argument('--view', action='store_true', help='Render all test cases, not just the failures.')
-    parser.add_argument('font', help='The path to a font.')
-    parser.add_argument('tests', nargs='*', type=Path, help='The paths to test files.')
+    parser.add_argument(
+        'paths',
+        metavar='PATH',
+        nargs='+',
+        type=Path,
+        help=f'The paths to one or more fonts followed by the paths to test files, whose names must end with one of {{{", ".join(sorted(TEST_SUFFIXES))}}}.',
+    )
     args = parser.parse_args()
     assert isinstance(args.color, Color)  # type: ignore[misc]
     color = parse_color(args.color)
     passed_all = True
-    assert isinstance(args.font, str)  # type: ignore[misc]
-    failed_dir = Path(sys.argv[0]).parent / 'failed' / Path(args.font).name
-    failed_dir.mkdir(parents=True, exist_ok=True)
-    assert isinstance(args.tests, list)  # type: ignore[misc]
+    assert isinstance(args.paths, list)  # type: ignore[misc]
+    fonts: list[Path] = []
+    test_paths: list[Path] = []
+    for path in args.paths:
+        assert isinstance(path, Path)
+        if path.suffix in TEST_SUFFIXES:
+            test_paths.append(path)
+        elif test_paths:
+            parser.error(f'{path} is not a test file but follows a test file')
+        else:
+            fonts.append(path)
+    if not fonts:
+        parser.error('at least one font is required')
     assert isinstance(args.incomplete, bool)  # type: ignore[misc]
+    assert isinstance(args.render_failures, bool)  # type: ignore[misc]
     assert isinstance(args.view, bool)  # type: ignore[misc]
-    for fn in args.tests:
-        assert isinstance(fn, Path)
-        lines: list[tuple[int, str]] = []
-        with fn.open(encoding='utf-8') as f:
-            for line_number, line in enumerate(f, start=1):
-                lines.append((line_number, line.rstrip()))
-        futures: list[Future[tuple[bool, str, tuple[str, str, str, str] | None]] | None] = []
-        with ThreadPoolExecutor() as executor:
-            for line_number, line in lines:
-                if line and line[0] != '#':
-                    futures.append(executor.submit(
+    assert args.reference is None or isinstance(args.reference, str)  # type: ignore[misc]
+    test_files = [(fn, read_test_file(fn)) for fn in test_paths]
+    assert isinstance(args.no_cache, bool)  # type: ignore[misc]
+    assert isinstance(args.cache_size, int)  # type: ignore[misc]
+    cache = ShapingCache(None if args.no_cache else Path(sys.argv[0]).parent / 'cache', args.cache_size)
+    assert args.changed_since is None or isinstance(args.changed_since, Path)  # type: ignore[misc]
+    assert args.quick is None or isinstance(args.quick, Path)  # type: ignore[misc]
+    quick_tests: dict[str, set[str]] | None = None
+    if args.quick is not None:
+        with args.quick.open(encoding='utf-8') as f:
+            quick_tests = {file_name: {*test_inputs} for file_name, test_inputs in json.load(f).items()}  # type: ignore[misc]
+    selectors: dict[Path, impact.TestSelector | None] = {}
+    for font in fonts:
+        if args.changed_since is None:
+            selectors[font] = None
+        elif args.changed_since.is_dir():
+            old_font = args.changed_since / os.path.relpath(font)
+            selectors[font] = impact.TestSelector(old_font, font) if old_font.is_file() else None
+        elif len(fonts) == 1:
+            selectors[font] = impact.TestSelector(args.changed_since, font)
+        else:
+            parser.error('--changed-since must be a directory when there are multiple fonts')
+    assert args.jsonl is None or isinstance(args.jsonl, Path)  # type: ignore[misc]
+    assert args.junit is None or isinstance(args.junit, Path)  # type: ignore[misc]
+    assert isinstance(args.slowest, int)  # type: ignore[misc]
+    assert isinstance(args.timing, bool)  # type: ignore[misc]
+    assert args.timing_baseline is None or isinstance(args.timing_baseline, Path)  # type: ignore[misc]
+    assert isinstance(args.timing_repetitions, int)  # type: ignore[misc]
+    assert isinstance(args.timing_tolerance, float)  # type: ignore[misc]
+    assert isinstance(args.timing_warn_only, bool)  # type: ignore[misc]
+    assert isinstance(args.update_timing_baseline, bool)  # type: ignore[misc]
+    if args.update_timing_baseline and args.timing_baseline is None:
+        parser.error('--update-timing-baseline requires --timing-baseline')
+    assert args.shard is None or isinstance(args.shard, sharding.Shard)  # type: ignore[misc]
+    assert args.shard_weights is None or isinstance(args.shard_weights, Path)  # type: ignore[misc]
+    if args.shard_weights is not None and args.shard is None:
+        parser.error('--shard-weights requires --shard')
+    shard_tests: AbstractSet[tuple[str, int]] | None = None
+    if args.shard is not None:
+        timing_baseline = {} if args.shard_weights is None else timing.load_baseline(args.shard_weights)
+        weights = {
+            (str(fn), line_number): sum(timing_baseline.get(font.name, {}).get(fn.name, {}).get(line.rsplit(':', 1)[0], 0) for font in fonts)
+            for fn, lines in test_files
+            for line_number, line in lines
+            if is_selected(line, None)
+        }
+        shard_tests = sharding.assign([*weights], {test: weight for test, weight in weights.items() if weight}, args.shard)
+    timed = args.timing or args.timing_baseline is not None
+    jsonl_report = None if args.jsonl is None else reports.JsonLinesReport(args.jsonl, args.slowest, None if args.shard is None else str(args.shard))
+    results: list[reports.TestResult] = []
+    hb_fonts = {font: tracing.open_font(str(font)) for font in fonts} if timed or args.render_failures or args.view else {}
+    render_futures: list[tuple[Path, Future[bool]]] = []
+    with ThreadPoolExecutor() as executor, ThreadPoolExecutor() as render_executor:
+        futures: list[tuple[Path, Path, Path, list[tuple[int, str]], list[Future[tuple[bool, str, tuple[str, str, str, str] | None] | None] | None]]] = []
+        for font in fonts:
+            failed_dir = Path(sys.argv[0]).parent / 'failed' / font.name
+            failed_dir.mkdir(parents=True, exist_ok=True)
+            selector = selectors[font]
+            for fn, lines in test_files:
+                futures.append((font, failed_dir, fn, lines, [
+                    executor.submit(
                         run_test,
-                        args.font,
+                        str(font),
                         line,
-                        failed_dir / 'png' / fn.name / f'{line_number:03}',
                         args.incomplete,
-                        args.view,
-                    ))
+                        args.reference,
+                        cache,
+                        selector,
+                    ) if (is_selected(line, None if quick_tests is None else quick_tests.get(fn.name))
+                        and (shard_tests is None or (str(fn), line_number) in shard_tests)
+                    ) else None
+                    for line_number, line in lines
+                ]))
+        for font, failed_dir, fn, lines, file_futures in futures:
+            result_lines = []
+            passed_file = True
+            printed_heading = len(fonts) == 1
+            for (line_number, line), future in zip(lines, file_futures, strict=True):
+                if future is not None and (test_result := future.result()) is not None:
+                    passed_line, result_line, diff = test_result
+                    code_points, options, actual_output = result_line.split(':')
+                    result = reports.TestResult(
+                        str(font),
+                        str(fn),
+                        line_number,
+                        f'{code_points}:{options}',
+                        passed_line,
+                        actual_output,
+                        actual_output if diff is None else diff[3],
+                        None,
+                    )
+                    results.append(result)
+                    if jsonl_report is not None:
+                        jsonl_report.add(result)
+                    if args.view or args.render_failures and not passed_line:
+                        svg_path = failed_dir / 'svg' / fn.name / f'{line_number:03}-{code_points.replace(" ", "-")}.svg'
+                        render_futures.append((svg_path, render_executor.submit(rendering.render_svg, hb_fonts[font], code_points, options, svg_path)))
+                    if diff is not None:
+                        if not printed_heading:
+                            print(f'\n{font}: {fn}')
+                            printed_heading = True
+                        print_diff(*diff, color)
+                        sys.stdout.flush()
+                    passed_file = passed_file and passed_line
+                    result_lines.append(result_line + '\n')
                 else:
-                    futures.append(None)
-        result_lines = []
-        passed_file = True
-        for (_, line), future in zip(lines, futures, strict=True):
-            if future is not None:
-                passed_line, result_line, diff = future.result()
-                if diff is not None:
-                    print_diff(*diff, color)
-                passed_file = passed_file and passed_line
-                result_lines.append(result_line + '\n')
-            else:
-                result_lines.append(line + '\n')
-        if not passed_file:
-            with (failed_dir / fn.name).open('w', encoding='utf-8') as f:
-                f.writelines(result_lines)
-        passed_all = passed_all and passed_file
+                    result_lines.append(line + '\n')
+            if not passed_file:
+                with (failed_dir / fn.name).open('w', encoding='utf-8') as f:
+                    f.writelines(result_lines)
+            passed_all = passed_all and passed_file
+    for svg_path, render_future in render_futures:
+        if (exception := render_future.exception()) is not None:
+            print(f'Failed to render {svg_path}: {exception!r}', file=sys.stderr)
+            passed_all = False
+        elif not render_future.result():
+            print(f'Could not render {svg_path}: unsupported options', file=sys.stderr)
+    cache.save()
+    if timed:
+        results = time_tests(results, {str(font): hb_font for font, hb_font in hb_fonts.items()}, args.timing_repetitions)
+    if jsonl_report is not None:
+        if timed:
+            jsonl_report.add_times(results)
+        jsonl_report.close()
+    if args.junit is not None:
+        reports.write_junit(args.junit, results)
+    if args.timing_baseline is not None:
+        if args.update_timing_baseline:
+            timing.update_baseline(args.timing_baseline, results)
+        elif not timing.check_baseline(args.timing_baseline, results, args.timing_tolerance) and not args.timing_warn_only:
+            passed_all = False
     if not passed_all:
         sys.exit(1)
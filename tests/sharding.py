@@ -0,0 +1,103 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deterministic splitting of shaping tests into shards.
+
+Every shard computes the same assignment of tests to shards from the
+same inputs, so shards can run on different machines without
+coordinating. Tests are assigned greedily, longest first, to the shard
+with the least total time so far. The times come from a timing baseline
+if there is one; otherwise every test counts the same.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+from typing import NamedTuple
+from typing import TYPE_CHECKING
+from typing import override
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+    from collections.abc import Set as AbstractSet
+
+
+class Shard(NamedTuple):
+    """A shard of the tests.
+
+    Attributes:
+        number: The 1-based number of this shard.
+        total: The total number of shards.
+    """
+
+    number: int
+    total: int
+
+    @override
+    def __str__(self) -> str:
+        """Returns this shard in the form ``i/n``.
+        """
+        return f'{self.number}/{self.total}'
+
+
+def parse_shard(string: str) -> Shard:
+    """Parses a shard specification of the form ``i/n``.
+
+    Args:
+        string: The shard specification.
+
+    Returns:
+        The shard.
+
+    Raises:
+        argparse.ArgumentTypeError: If `string` is not a valid shard
+            specification.
+    """
+    number_string, _, total_string = string.partition('/')
+    try:
+        shard = Shard(int(number_string), int(total_string))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid shard: {string!r}; must be of the form i/n') from None
+    if not 1 <= shard.number <= shard.total:
+        raise argparse.ArgumentTypeError(f'invalid shard: {string!r}; i must be between 1 and n')
+    return shard
+
+
+def assign(tests: Sequence[tuple[str, int]], weights: Mapping[tuple[str, int], float], shard: Shard) -> AbstractSet[tuple[str, int]]:
+    """Returns the tests assigned to a shard.
+
+    Args:
+        tests: The tests, as pairs of test file names and line numbers.
+        weights: The expected times of some of the tests. The others
+            are assumed to take the mean of these times.
+        shard: The shard.
+
+    Returns:
+        The tests in `tests` assigned to `shard`.
+    """
+    def get_sort_key(test: tuple[str, int]) -> tuple[float, tuple[str, int]]:
+        return -weights.get(test, default_weight), test
+
+    default_weight = sum(weights.values()) / len(weights) if weights else 1
+    loads = [(0.0, i) for i in range(1, shard.total + 1)]
+    assigned = set()
+    for test in sorted(tests, key=get_sort_key):
+        load, number = heapq.heappop(loads)
+        if number == shard.number:
+            assigned.add(test)
+        heapq.heappush(loads, (load + weights.get(test, default_weight), number))
+    return assigned
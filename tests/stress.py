@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A CLI to measure how long a font takes to shape random text.
+
+The text is random but well-formed: words of letters, optionally joined
+by overlap and step controls and followed by marks or DTLS, separated by
+spaces and punctuation. The characters come from the schemas of the
+testing character set that the font maps.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+from pathlib import Path
+import random
+import statistics
+from typing import Final
+from typing import TYPE_CHECKING
+
+import fontTools.ttLib.ttFont
+
+import charsets
+import charsets.data
+import tracing
+from utils import MINIMUM_STROKE_GAP
+from utils import REGULAR_LIGHT_LINE
+from utils import Type
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Sequence
+
+
+#: The controls that can go between two letters in a word.
+JOINING_CONTROLS: Final[Sequence[int]] = [0x1BCA0, 0x1BCA1, 0x1BCA2, 0x1BCA3]
+
+
+#: DUPLOYAN THICK LETTER SELECTOR.
+DTLS: Final = 0x1BC9D
+
+
+#: The characters that a generator does not treat as separators even
+#: though they do not join.
+NON_SEPARATORS: Final[Collection[int]] = {*JOINING_CONTROLS, DTLS, 0x034F, 0x200C}
+
+
+class TextGenerator:
+    """A generator of random well-formed Duployan text.
+    """
+
+    def __init__(self, code_points: Collection[int], seed: int) -> None:
+        """Initializes this `TextGenerator`.
+
+        Args:
+            code_points: The code points the font maps. The generator
+                only uses these.
+            seed: The seed of the random number generator.
+        """
+        schemas = [
+            s
+            for s in charsets.data.initialize_schemas(charsets.Charset.TESTING, REGULAR_LIGHT_LINE, max(MINIMUM_STROKE_GAP, REGULAR_LIGHT_LINE))
+            if s.cmap is not None and s.cmap in code_points
+        ]
+        self._letters: Final = sorted({s.cmap for s in schemas if s.cmap is not None and s.joining_type != Type.NON_JOINING and s.anchor is None})
+        self._marks: Final = sorted({s.cmap for s in schemas if s.cmap is not None and s.anchor is not None})
+        self._separators: Final = sorted({
+            s.cmap
+            for s in schemas
+            if s.cmap is not None and s.joining_type == Type.NON_JOINING and s.anchor is None and s.cmap not in NON_SEPARATORS
+        })
+        self._joining_controls: Final = [cp for cp in JOINING_CONTROLS if cp in code_points]
+        self._code_points: Final = sorted(code_points)
+        self._has_dtls: Final = DTLS in code_points
+        self._random: Final = random.Random(seed)  # ruff: ignore[suspicious-non-cryptographic-random-usage]
+
+    def _generate_word(self) -> list[int]:
+        """Returns a random word.
+        """
+        word: list[int] = []
+        for i in range(self._random.randint(1, 6)):
+            if i and self._joining_controls and self._random.random() < 0.3:
+                word.append(self._random.choice(self._joining_controls))
+            word.append(self._random.choice(self._letters))
+            if self._has_dtls and self._random.random() < 0.05:
+                word.append(DTLS)
+            while self._marks and self._random.random() < 0.2:
+                word.append(self._random.choice(self._marks))
+        return word
+
+    def generate(self, length: int) -> list[int]:
+        """Returns a random string of words.
+
+        If the font maps no separators, the words run together.
+
+        Args:
+            length: The minimum number of code points to return.
+        """
+        text = self._generate_word()
+        while len(text) < length:
+            if self._separators:
+                text.append(self._random.choice(self._separators))
+            text += self._generate_word()
+        return text
+
+    def generate_malformed(self, length: int) -> list[int]:
+        """Returns a random string of any code points the font maps.
+
+        Unlike `generate`, this can return marks with no base, controls
+        with nothing to join, and other sequences that HarfBuzz treats
+        specially.
+
+        Args:
+            length: The number of code points to return.
+        """
+        return [self._random.choice(self._code_points) for _ in range(length)]
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Returns a percentile of some values by the nearest-rank method.
+
+    Args:
+        sorted_values: The values, sorted in ascending order.
+        fraction: The percentile as a fraction between 0 and 1.
+    """
+    return sorted_values[max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure how long a font takes to shape random text.')
+    parser.add_argument(
+        '--compare', metavar='FONT', type=Path,
+        help='Another font to shape the same strings with, such as the same font built with --no-merge-lookups, to compare their times.',
+    )
+    parser.add_argument('--count', default=1000, type=int, help='The number of random strings to shape (default: %(default)s).')
+    parser.add_argument('--length', default=32, type=int, help='The minimum number of code points per string (default: %(default)s).')
+    parser.add_argument('--output', metavar='FILE', type=Path, help='The test file to write the slowest strings to, with empty expected outputs.')
+    parser.add_argument(
+        '--repetitions', default=5, type=int,
+        help='How many times to shape each string; its time is the median (default: %(default)s).',
+    )
+    parser.add_argument('--seed', default=0, type=int, help='The seed of the random number generator (default: %(default)s).')
+    parser.add_argument('--slowest', default=10, type=int, help='The number of the slowest strings to write to the output (default: %(default)s).')
+    parser.add_argument('font', type=Path, help='The path to the font.')
+    args = parser.parse_args()
+    assert args.compare is None or isinstance(args.compare, Path)  # type: ignore[misc]
+    assert isinstance(args.count, int)  # type: ignore[misc]
+    assert isinstance(args.length, int)  # type: ignore[misc]
+    assert args.output is None or isinstance(args.output, Path)  # type: ignore[misc]
+    assert isinstance(args.repetitions, int)  # type: ignore[misc]
+    assert isinstance(args.seed, int)  # type: ignore[misc]
+    assert isinstance(args.slowest, int)  # type: ignore[misc]
+    assert isinstance(args.font, Path)  # type: ignore[misc]
+    generator = TextGenerator(fontTools.ttLib.ttFont.TTFont(args.font).getBestCmap() or {}, args.seed)
+    fonts = {args.font: tracing.open_font(str(args.font))}
+    if args.compare is not None:
+        fonts[args.compare] = tracing.open_font(str(args.compare))
+    mean_times_per_cluster: dict[Path, list[float]] = {path: [] for path in fonts}
+    slowest: list[tuple[float, list[int]]] = []
+    for _ in range(args.count):
+        text = generator.generate(args.length)
+        for path, font in fonts.items():
+            buffer = tracing.trace(font, text, '')
+            assert buffer is not None
+            seconds = tracing.time_shaping(font, text, '', args.repetitions)
+            assert seconds is not None
+            mean_time_per_cluster = seconds / len({info.cluster for info in buffer.glyph_infos})
+            mean_times_per_cluster[path].append(mean_time_per_cluster)
+            if path == args.font:
+                heapq.heappush(slowest, (mean_time_per_cluster, text))
+                if len(slowest) > args.slowest:
+                    heapq.heappop(slowest)
+    for path, times in mean_times_per_cluster.items():
+        times.sort()
+        print(f'Mean shaping time per cluster of each string in {path} over {args.count} strings (seed {args.seed}):')
+        print(f'  p50: {percentile(times, 0.5) * 1e6:.1f} μs')
+        print(f'  p99: {percentile(times, 0.99) * 1e6:.1f} μs')
+        print(f'  max: {times[-1] * 1e6:.1f} μs')
+        print(f'  mean: {statistics.fmean(times) * 1e6:.1f} μs')
+    if args.compare is not None:
+        speedup = statistics.fmean(mean_times_per_cluster[args.compare]) / statistics.fmean(mean_times_per_cluster[args.font])
+        print(f'{args.font} is {speedup:.2f}x as fast as {args.compare}')
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open('w', encoding='utf-8') as f:
+            f.write(f'# The slowest random strings with seed {args.seed}\n')
+            f.writelines(f'{" ".join(f"{cp:04X}" for cp in text)}::\n' for _, text in sorted(slowest, reverse=True))
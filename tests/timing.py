@@ -0,0 +1,120 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Baselines of shaping times.
+
+A baseline is a JSON object mapping font file names to objects mapping
+test file names to objects mapping test inputs to shaping times in
+seconds. Fonts and test files are identified by name rather than path
+so that a baseline applies wherever the fonts are built.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+from typing import Final
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from reports import TestResult
+
+
+type Baseline = dict[str, dict[str, dict[str, float]]]
+
+
+#: The minimum amount by which a test must be slower than in the
+#: baseline to count as a regression, in seconds. Shorter times are too
+#: noisy to compare.
+MINIMUM_REGRESSION: Final = 50e-6
+
+
+#: The maximum number of regressions to print.
+MAX_REPORTED_REGRESSIONS: Final = 20
+
+
+def load_baseline(path: Path) -> Baseline:
+    """Loads a baseline.
+
+    Args:
+        path: The path of the baseline.
+
+    Returns:
+        The baseline, or an empty baseline if the file does not exist.
+    """
+    try:
+        with path.open(encoding='utf-8') as f:
+            baseline: Baseline = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return baseline
+
+
+def update_baseline(path: Path, results: Iterable[TestResult]) -> None:
+    """Records shaping times in a baseline.
+
+    Times for fonts and test files not in `results` are kept.
+
+    Args:
+        path: The path of the baseline.
+        results: The results of some timed tests.
+    """
+    baseline = load_baseline(path)
+    for result in results:
+        if result.seconds is not None:
+            baseline.setdefault(Path(result.font).name, {}).setdefault(Path(result.file).name, {})[result.test_input] = result.seconds
+    with path.open('w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def check_baseline(path: Path, results: Iterable[TestResult], tolerance: float) -> bool:
+    """Compares shaping times against a baseline.
+
+    The worst regressions are printed to stderr.
+
+    Args:
+        path: The path of the baseline.
+        results: The results of some timed tests.
+        tolerance: How much longer shaping may take than in the
+            baseline, as a fraction of the baseline time.
+
+    Returns:
+        Whether no test regressed.
+    """
+    def get_sort_key(regression: tuple[float, float, TestResult]) -> float:
+        return -regression[0]
+
+    baseline = load_baseline(path)
+    regressions = []
+    for result in results:
+        if result.seconds is None:
+            continue
+        old_seconds = baseline.get(Path(result.font).name, {}).get(Path(result.file).name, {}).get(result.test_input)
+        if old_seconds is not None and result.seconds > old_seconds * (1 + tolerance) and result.seconds - old_seconds >= MINIMUM_REGRESSION:
+            regressions.append((result.seconds / old_seconds, old_seconds, result))
+    if regressions:
+        regressions.sort(key=get_sort_key)
+        print(f'\n{len(regressions)} tests shaped more slowly than in {path}:', file=sys.stderr)
+        for ratio, old_seconds, result in regressions[:MAX_REPORTED_REGRESSIONS]:
+            print(
+                f'  {Path(result.font).name}: {Path(result.file).name}:{result.line_number}:'
+                f' {old_seconds * 1e6:.1f} μs → {(result.seconds or 0) * 1e6:.1f} μs ({ratio:.1f}x)',
+                file=sys.stderr,
+            )
+    return not regressions
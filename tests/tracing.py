@@ -0,0 +1,175 @@
+# Copyright 2026 David Corbett
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process shaping of test lines with HarfBuzz’s message callback.
+
+HarfBuzz calls the message callback at the start and end of each table
+and lookup, and before and after most changes it makes to the buffer.
+This module shapes the inputs of test lines with uharfbuzz and lets the
+caller inspect the buffer at each of those points.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import uharfbuzz
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+
+
+_OPTION_PARSER = argparse.ArgumentParser(add_help=False)
+_OPTION_PARSER.add_argument('--features', default='')
+_OPTION_PARSER.add_argument('--language')
+
+
+type Features = dict[str, int | Sequence[tuple[int, int, int]]]
+
+
+def parse_options(options: str) -> tuple[Features, str | None] | None:
+    """Parses the hb-shape options of a test line.
+
+    Args:
+        options: The options field of a test line.
+
+    Returns:
+        A tuple of the features to pass to `uharfbuzz.shape` and the
+        language, or ``None`` if the options include any that this
+        module does not support.
+    """
+    parsed_options, unknown_options = _OPTION_PARSER.parse_known_args(options.split())
+    if unknown_options:
+        return None
+    features: Features = {}
+    assert isinstance(parsed_options.features, str)  # type: ignore[misc]
+    for feature in filter(None, parsed_options.features.split(',')):
+        if feature.startswith('-'):
+            features[feature[1:]] = 0
+        elif '=' in feature:
+            tag, value = feature.split('=', 1)
+            features[tag] = int(value)
+        else:
+            features[feature] = 1
+    assert parsed_options.language is None or isinstance(parsed_options.language, str)  # type: ignore[misc]
+    return features, parsed_options.language
+
+
+def open_font(path: str) -> uharfbuzz.Font:
+    """Opens a font for shaping with uharfbuzz.
+
+    Args:
+        path: The path of the font.
+
+    Returns:
+        The font.
+    """
+    return uharfbuzz.Font(uharfbuzz.Face(uharfbuzz.Blob.from_file_path(path)))
+
+
+def _make_buffer(code_points: Sequence[int], language: str | None) -> uharfbuzz.Buffer:
+    """Makes a buffer ready to shape.
+
+    Args:
+        code_points: The code points to put in the buffer.
+        language: The language of the buffer, or ``None`` to leave it
+            unset.
+
+    Returns:
+        A buffer with `code_points`, `language`, and guessed segment
+        properties.
+    """
+    buffer = uharfbuzz.Buffer()
+    buffer.add_codepoints([*code_points])
+    if language is not None:
+        buffer.language = language
+    buffer.guess_segment_properties()
+    return buffer
+
+
+def trace(
+    font: uharfbuzz.Font,
+    code_points: Sequence[int],
+    options: str,
+    callback: Callable[[str, uharfbuzz.Buffer], object] | None = None,
+    *,
+    remove_default_ignorables: bool = False,
+) -> uharfbuzz.Buffer | None:
+    """Shapes some code points, calling a callback on each message.
+
+    Args:
+        font: The font to shape with.
+        code_points: The code points to shape.
+        options: The hb-shape options to shape with.
+        callback: A function to call with each message from HarfBuzz
+            and the buffer being shaped, or ``None`` to shape without
+            messages, which is faster.
+        remove_default_ignorables: Whether to remove default ignorable
+            glyphs from the output, like hb-shape’s
+            ``--remove-default-ignorables``.
+
+    Returns:
+        The shaped buffer, or ``None`` if the options are not
+        supported.
+    """
+    parsed_options = parse_options(options)
+    if parsed_options is None:
+        return None
+    features, language = parsed_options
+    buffer = _make_buffer(code_points, language)
+    if remove_default_ignorables:
+        buffer.flags = uharfbuzz.BufferFlags.REMOVE_DEFAULT_IGNORABLES
+    if callback is not None:
+
+        def handle_message(message: str) -> bool:
+            callback(message, buffer)
+            return True
+
+        buffer.set_message_func(handle_message)
+    uharfbuzz.shape(font, buffer, features)
+    return buffer
+
+
+def time_shaping(font: uharfbuzz.Font, code_points: Sequence[int], options: str, repetitions: int = 1) -> float | None:
+    """Measures how long it takes to shape some code points.
+
+    Only `uharfbuzz.shape` is timed. The options are parsed and the
+    buffers are prepared beforehand.
+
+    Args:
+        font: The font to shape with.
+        code_points: The code points to shape.
+        options: The hb-shape options to shape with.
+        repetitions: How many times to shape the code points.
+
+    Returns:
+        The median time in seconds, or ``None`` if the options are not
+        supported.
+    """
+    parsed_options = parse_options(options)
+    if parsed_options is None:
+        return None
+    features, language = parsed_options
+    buffers = [_make_buffer(code_points, language) for _ in range(repetitions)]
+    times = []
+    for buffer in buffers:
+        start = time.perf_counter()
+        uharfbuzz.shape(font, buffer, features)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
@@ -24,6 +24,8 @@
 from typing import Literal
 from typing import SupportsIndex
 
+from fontTools.misc.psCharStrings import T2CharString
+
 class CFFFontSet:
     fontNames: list[str]
 
@@ -37,7 +39,10 @@ class VarStoreData: ...
 
 class FDSelect: ...
 
-class CharStrings: ...
+class CharStrings:
+    charStrings: dict[str, object]
+
+    def __setitem__(self, name: str, charString: T2CharString) -> None: ...
 
 class BaseDict:
     rawDict: dict[str, object]
@@ -82,4 +87,5 @@ class TopDict(BaseDict):
 
     def decompileAllCharStrings(self) -> None: ...
 
-class PrivateDict(BaseDict): ...
+class PrivateDict(BaseDict):
+    nominalWidthX: float
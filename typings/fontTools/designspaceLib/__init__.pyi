@@ -0,0 +1,60 @@
+# MIT License
+#
+# Copyright (c) 2017 Just van Rossum
+# Copyright (c) 2026 David Corbett
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from fontTools.ttLib.ttFont import TTFont
+
+class AxisDescriptor:
+    def __init__(
+        self,
+        *,
+        tag: str | None = ...,
+        name: str | None = ...,
+        minimum: float | None = ...,
+        default: float | None = ...,
+        maximum: float | None = ...,
+    ) -> None: ...
+
+class SourceDescriptor:
+    def __init__(
+        self,
+        *,
+        font: TTFont | None = ...,
+        location: dict[str, float] | None = ...,
+    ) -> None: ...
+
+class InstanceDescriptor:
+    def __init__(
+        self,
+        *,
+        location: dict[str, float] | None = ...,
+        styleName: str | None = ...,
+    ) -> None: ...
+
+class DesignSpaceDocument:
+    def __init__(self) -> None: ...
+
+    def addAxis(self, axisDescriptor: AxisDescriptor) -> None: ...
+
+    def addSource(self, sourceDescriptor: SourceDescriptor) -> None: ...
+
+    def addInstance(self, instanceDescriptor: InstanceDescriptor) -> None: ...
@@ -0,0 +1,57 @@
+# MIT License
+#
+# Copyright (c) 2017 Just van Rossum
+# Copyright (c) 2026 David Corbett
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+from fontTools.misc.psCharStrings import T2CharString
+from fontTools.ttLib.ttFont import TTFont
+
+class FontBuilder:
+    font: TTFont
+
+    def __init__(
+        self,
+        unitsPerEm: int | None = ...,
+        font: TTFont | None = ...,
+        isTTF: bool = ...,
+        glyphDataFormat: int = ...,
+    ) -> None: ...
+
+    def setupGlyphOrder(self, glyphOrder: Sequence[str]) -> None: ...
+
+    def setupCharacterMap(self, cmapping: Mapping[int, str], uvs: None = ..., allowFallback: bool = ...) -> None: ...
+
+    def setupCFF(
+        self,
+        psName: str,
+        fontInfo: Mapping[str, str],
+        charStringsDict: Mapping[str, T2CharString],
+        privateDict: Mapping[str, int],
+    ) -> None: ...
+
+    def setupHorizontalMetrics(self, metrics: Mapping[str, tuple[int, int]]) -> None: ...
+
+    def setupHorizontalHeader(self) -> None: ...
+
+    def setupMaxp(self) -> None: ...
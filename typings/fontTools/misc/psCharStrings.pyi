@@ -21,6 +21,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+class T2CharString: ...
+
 def encodeIntCFF(value: int) -> bytes: ...
 
 def encodeFloat(f: float) -> bytes: ...
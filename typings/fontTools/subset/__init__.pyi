@@ -1,7 +1,7 @@
 # MIT License
 #
-# Copyright 2013 Google, Inc. All Rights Reserved.
-# Copyright (c) 2025 David Corbett
+# Copyright (c) 2017 Just van Rossum
+# Copyright (c) 2026 David Corbett
 #
 # Permission is hereby granted, free of charge, to any person obtaining a copy
 # of this software and associated documentation files (the "Software"), to deal
@@ -21,7 +21,34 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from collections.abc import Iterable
+
+from fontTools.ttLib.ttFont import TTFont
+
 class Options:
     layout_features: list[str]
 
-    def __init__(self, **kwargs: object) -> None: ...
+    def __init__(
+        self,
+        *,
+        glyph_names: bool = ...,
+        layout_closure: bool = ...,
+        layout_features: list[str] = ...,
+        name_IDs: list[int] | list[str] = ...,
+        name_languages: list[str] = ...,
+        notdef_outline: bool = ...,
+        passthrough_tables: bool = ...,
+    ) -> None: ...
+
+class Subsetter:
+    def __init__(self, options: Options | None = ...) -> None: ...
+
+    def populate(
+        self,
+        glyphs: Iterable[str] = ...,
+        gids: Iterable[int] = ...,
+        unicodes: Iterable[int] = ...,
+        text: str = ...,
+    ) -> None: ...
+
+    def subset(self, font: TTFont) -> None: ...
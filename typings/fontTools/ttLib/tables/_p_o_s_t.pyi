@@ -24,5 +24,6 @@
 from fontTools.ttLib.tables.DefaultTable import DefaultTable
 
 class table__p_o_s_t(DefaultTable):
+    formatType: float
     underlinePosition: int
     underlineThickness: int
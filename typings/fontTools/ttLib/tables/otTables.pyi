@@ -0,0 +1,175 @@
+# MIT License
+#
+# Copyright (c) 2017 Just van Rossum
+# Copyright (c) 2026 David Corbett
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from fontTools.ttLib.tables.otBase import BaseTable
+from fontTools.ttLib.tables.otBase import FormatSwitchingBaseTable
+
+class Coverage(FormatSwitchingBaseTable):
+    glyphs: list[str]
+
+class ClassDef(FormatSwitchingBaseTable):
+    classDefs: dict[str, int]
+
+class SubstLookupRecord(BaseTable):
+    SequenceIndex: int
+    LookupListIndex: int
+
+type _Coverage = Coverage
+type _SubstLookupRecord = SubstLookupRecord
+
+class ChainSubClassRule(BaseTable):
+    BacktrackGlyphCount: int
+    Backtrack: list[int]
+    InputGlyphCount: int
+    Input: list[int]
+    LookAheadGlyphCount: int
+    LookAhead: list[int]
+    SubstCount: int
+    SubstLookupRecord: list[_SubstLookupRecord]
+
+type _ChainSubClassRule = ChainSubClassRule
+
+class ChainSubClassSet(BaseTable):
+    ChainSubClassRuleCount: int
+    ChainSubClassRule: list[_ChainSubClassRule]
+
+type _ChainSubClassSet = ChainSubClassSet
+
+class ChainContextSubst(FormatSwitchingBaseTable):
+    BacktrackGlyphCount: int
+    BacktrackCoverage: list[_Coverage]
+    InputGlyphCount: int
+    InputCoverage: list[_Coverage]
+    LookAheadGlyphCount: int
+    LookAheadCoverage: list[_Coverage]
+    SubstCount: int
+    SubstLookupRecord: list[_SubstLookupRecord]
+    Coverage: _Coverage
+    BacktrackClassDef: ClassDef
+    InputClassDef: ClassDef
+    LookAheadClassDef: ClassDef
+    ChainSubClassSetCount: int
+    ChainSubClassSet: list[_ChainSubClassSet | None]
+
+class SingleSubst(FormatSwitchingBaseTable):
+    mapping: dict[str, str]
+
+class MultipleSubst(FormatSwitchingBaseTable):
+    mapping: dict[str, list[str]]
+
+class AlternateSubst(FormatSwitchingBaseTable):
+    alternates: dict[str, list[str]]
+
+class Ligature(BaseTable):
+    LigGlyph: str
+    CompCount: int
+    Component: list[str]
+
+type _Ligature = Ligature
+
+class LigatureSubst(FormatSwitchingBaseTable):
+    ligatures: dict[str, list[_Ligature]]
+
+class ReverseChainSingleSubst(FormatSwitchingBaseTable):
+    Coverage: _Coverage
+    GlyphCount: int
+    Substitute: list[str]
+
+class ExtensionSubst(FormatSwitchingBaseTable):
+    ExtensionLookupType: int
+    ExtSubTable: BaseTable
+
+class Lookup(BaseTable):
+    LookupType: int
+    LookupFlag: int
+    SubTableCount: int
+    SubTable: list[BaseTable]
+
+type _Lookup = Lookup
+
+class LookupList(BaseTable):
+    LookupCount: int
+    Lookup: list[_Lookup]
+
+type _LookupList = LookupList
+
+class LangSys(BaseTable):
+    LookupOrder: None
+    ReqFeatureIndex: int
+    FeatureCount: int
+    FeatureIndex: list[int]
+
+type _LangSys = LangSys
+
+class LangSysRecord(BaseTable):
+    LangSysTag: str
+    LangSys: _LangSys
+
+type _LangSysRecord = LangSysRecord
+
+class Script(BaseTable):
+    DefaultLangSys: LangSys | None
+    LangSysCount: int
+    LangSysRecord: list[_LangSysRecord]
+
+type _Script = Script
+
+class ScriptRecord(BaseTable):
+    ScriptTag: str
+    Script: _Script
+
+type _ScriptRecord = ScriptRecord
+
+class ScriptList(BaseTable):
+    ScriptCount: int
+    ScriptRecord: list[_ScriptRecord]
+
+class Feature(BaseTable):
+    FeatureParams: BaseTable | None
+    LookupCount: int
+    LookupListIndex: list[int]
+
+type _Feature = Feature
+
+class FeatureRecord(BaseTable):
+    FeatureTag: str
+    Feature: _Feature
+
+type _FeatureRecord = FeatureRecord
+
+class FeatureList(BaseTable):
+    FeatureCount: int
+    FeatureRecord: list[_FeatureRecord]
+
+type _ScriptList = ScriptList
+type _FeatureList = FeatureList
+
+class GPOS(BaseTable):
+    ScriptList: _ScriptList
+    FeatureList: _FeatureList
+    LookupList: _LookupList
+
+class GSUB(BaseTable):
+    ScriptList: _ScriptList
+    FeatureList: _FeatureList
+    LookupList: _LookupList
@@ -24,15 +24,21 @@
 from io import IOBase
 from types import NotImplementedType
 from types import TracebackType
+from typing import IO
 from typing import Literal
 from typing import Self
 
 from _typeshed import FileDescriptorOrPath
 from fontTools.misc.configTools import AbstractConfig
 from fontTools.misc.configTools import Option
+from fontTools.ttLib.sfnt import WOFFFlavorData
 from fontTools.ttLib.tables.DefaultTable import DefaultTable
+from fontTools.ttLib.ttGlyphSet import _TTGlyphSet
 
 class TTFont:
+    flavor: Literal['woff', 'woff2'] | None
+    flavorData: WOFFFlavorData | None
+
     def __init__(
         self,
         file: FileDescriptorOrPath | IOBase | None = ...,
@@ -67,6 +73,26 @@ class TTFont:
         reorderTables: bool | None = ...,
     ) -> None: ...
 
+    def saveXML(
+        self,
+        fileOrPath: str | IO[str],
+        newlinestr: str = ...,
+        *,
+        tables: list[str] | None = ...,
+    ) -> None: ...
+
+    def getBestCmap(self) -> dict[int, str] | None: ...
+
+    def getGlyphID(self, glyphName: str) -> int: ...
+
+    def getGlyphOrder(self) -> list[str]: ...
+
+    def getGlyphSet(self) -> _TTGlyphSet: ...
+
+    def setGlyphOrder(self, glyphOrder: list[str]) -> None: ...
+
+    def getTableData(self, tag: str) -> bytes: ...
+
     def __contains__(self, tag: str) -> bool: ...
 
     def __getitem__(self, tag: str) -> DefaultTable: ...
@@ -33,6 +33,7 @@ from typing import overload
 class point:
     x: float
     y: float
+    on_curve: bool
 
     @overload
     def __init__(
@@ -12,16 +12,38 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import Callable
 from collections.abc import Sequence
+import enum
 from typing import NamedTuple
 
 from _typeshed import StrOrBytesPath
+from fontTools.pens.basePen import AbstractPen
+
+class BufferFlags(enum.IntFlag):
+    DEFAULT = 0x00000000
+    BOT = 0x00000001
+    EOT = 0x00000002
+    PRESERVE_DEFAULT_IGNORABLES = 0x00000004
+    REMOVE_DEFAULT_IGNORABLES = 0x00000008
 
 class GlyphInfo:
     @property
     def codepoint(self) -> int: ...
 
+    @property
+    def cluster(self) -> int: ...
+
 class GlyphPosition:
+    @property
+    def x_advance(self) -> int: ...
+
+    @property
+    def y_advance(self) -> int: ...
+
+    @property
+    def x_offset(self) -> int: ...
+
     @property
     def y_offset(self) -> int: ...
 
@@ -39,6 +61,18 @@ class Buffer:
     @property
     def glyph_positions(self) -> list[GlyphPosition] | None: ...
 
+    @property
+    def flags(self) -> BufferFlags: ...
+
+    @flags.setter
+    def flags(self, value: BufferFlags) -> None: ...
+
+    @property
+    def language(self) -> str | None: ...
+
+    @language.setter
+    def language(self, value: str) -> None: ...
+
     @property
     def script(self) -> str | None: ...
 
@@ -51,6 +85,8 @@ class Buffer:
 
     def guess_segment_properties(self) -> None: ...
 
+    def set_message_func(self, callback: Callable[[str], bool]) -> None: ...
+
 class Blob:
     @classmethod
     def from_file_path(cls, filename: StrOrBytesPath) -> Blob: ...
@@ -67,8 +103,15 @@ class GlyphExtents(NamedTuple):
 class Font:
     def __init__(self, face_or_font: Face | Font | None = ...) -> None: ...
 
+    @property
+    def face(self) -> Face: ...
+
     def get_glyph_extents(self, gid: int) -> GlyphExtents | None: ...
 
+    def draw_glyph_with_pen(self, gid: int, pen: AbstractPen) -> None: ...
+
+def ot_layout_table_get_lookup_count(face: Face, tag: str) -> int: ...
+
 def shape(
     font: Font,
     buffer: Buffer,